@@ -0,0 +1,344 @@
+"""AgentSession load benchmark.
+
+Runs --sessions concurrent AgentSessions on a ProcPool with the thread and the process job
+executors, entirely offline: every job runs one session with the fake VAD, STT, LLM and TTS
+following a scripted timeline of --turns user turns, and its audio input receives 20ms frames of
+silence in real time. For each number of sessions, reports:
+
+- the latency from the end of each user speech to the first frame of the agent's audio (~1.0s
+  without load at --speed 1: the VAD and endpointing delays, the LLM ttft and the TTS ttfb)
+- the lag of the event loops of the jobs (sampled every 50ms)
+- the CPU (% of a core) and RSS used per session, by the bench process with the thread executor
+  (RSS above the one before the jobs) and by the job processes with the process executor
+
+The knee is the first number of sessions where the p95 latency exceeds --knee-factor times the
+p95 of the smallest run, or the p95 loop lag exceeds --max-loop-lag ms.
+
+    python -m benchmarks.agent_sessions [--executor thread process] [--sessions 1 4 8 16]
+        [--turns 3] [--speed 1.0] [--json results.json]
+
+(run from the root of the repository, the fake providers are imported from the tests package)
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import multiprocessing as mp
+import os
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+import psutil
+
+from livekit import rtc
+from livekit.agents import Agent, JobContext, JobExecutorType, JobProcess, ipc, job, utils
+from livekit.agents.voice.transcription.synchronizer import _SyncedAudioOutput
+from livekit.protocol import agent
+from tests.fake_io import FakeAudioInput, FakeAudioOutput, FakeTextOutput
+from tests.fake_session import FakeActions, create_session
+from tests.fake_stt import FakeSTT
+
+_LOOP_LAG_INTERVAL = 0.05
+_AUDIO_FRAME_DURATION = 0.02
+
+
+class _TimedAudioOutput(FakeAudioOutput):
+    def __init__(self) -> None:
+        super().__init__()
+        self.first_frame_times: list[float] = []
+
+    async def capture_frame(self, frame: rtc.AudioFrame) -> None:
+        if not self._pushed_duration:
+            self.first_frame_times.append(time.time())
+        await super().capture_frame(frame)
+
+
+class _QuietTextOutput(FakeTextOutput):
+    def flush(self) -> None:
+        self._pushed_text = ""
+
+
+def _timeline(turns: int) -> tuple[FakeActions, list[float]]:
+    # user speaks for 2s, the agent answers with 2s of audio ~1s after the end of the speech
+    actions = FakeActions()
+    speech_ends: list[float] = []
+    start = 0.5
+    for i in range(turns):
+        actions.add_user_speech(start, start + 2.0, f"user turn {i}", stt_delay=0.2)
+        actions.add_llm(f"agent turn {i}", ttft=0.1, duration=0.3)
+        actions.add_tts(2.0, ttfb=0.2, duration=0.3)
+        speech_ends.append(start + 2.0)
+        start += 6.0
+
+    return actions, speech_ends
+
+
+async def _loop_lag_task(samples: list[float]) -> None:
+    while True:
+        start = time.perf_counter()
+        await asyncio.sleep(_LOOP_LAG_INTERVAL)
+        samples.append(time.perf_counter() - start - _LOOP_LAG_INTERVAL)
+
+
+async def _audio_task(audio_input: FakeAudioInput) -> None:
+    start = time.perf_counter()
+    pushed = 0
+    while True:
+        audio_input.push(_AUDIO_FRAME_DURATION)
+        pushed += 1
+        await asyncio.sleep(max(0.0, start + pushed * _AUDIO_FRAME_DURATION - time.perf_counter()))
+
+
+def _prewarm(proc: JobProcess) -> None:
+    pass
+
+
+async def _entrypoint(job_ctx: JobContext) -> None:
+    opts = json.loads(job_ctx.job.metadata)
+    speed = opts["speed"]
+    actions, speech_ends = _timeline(opts["turns"])
+
+    audio_output = _TimedAudioOutput()
+    session = create_session(
+        actions,
+        speed_factor=speed,
+        # the fake audio output can't pause
+        extra_kwargs={"resume_false_interruption": False},
+        audio_output=audio_output,
+        transcription_output=_QuietTextOutput(),
+    )
+    audio_input = session.input.audio
+    assert isinstance(session.output.audio, _SyncedAudioOutput)
+    transcript_sync = session.output.audio._synchronizer
+    stt = session.stt
+    assert isinstance(stt, FakeSTT)
+    assert isinstance(audio_input, FakeAudioInput)
+
+    loop_lag: list[float] = []
+    lag_task = asyncio.create_task(_loop_lag_task(loop_lag))
+    try:
+        await session.start(Agent(instructions="You are a helpful assistant."))
+        # the fake vad and stt start their timeline with the first frame
+        t_origin = time.time()
+        audio_task = asyncio.create_task(_audio_task(audio_input))
+        await stt.fake_user_speeches_done
+        await asyncio.sleep(3.0 / speed)  # the last answer
+
+        await utils.aio.cancel_and_wait(audio_task)
+        await session.aclose()
+        await transcript_sync.aclose()
+    finally:
+        lag_task.cancel()
+
+    latencies = [
+        first_frame - (t_origin + end / speed)
+        for first_frame, end in zip(audio_output.first_frame_times, speech_ends)
+    ]
+    Path(opts["result_path"]).write_text(
+        json.dumps({"latencies": latencies, "loop_lag": loop_lag, "turns": len(speech_ends)})
+    )
+    job_ctx.shutdown("benchmark done")
+
+
+def _fake_job(index: int, metadata: dict[str, Any]) -> job.RunningJobInfo:
+    return job.RunningJobInfo(
+        job=agent.Job(
+            id=f"bench_job_{index}", type=agent.JobType.JT_ROOM, metadata=json.dumps(metadata)
+        ),
+        url="fake_url",
+        token="fake_token",
+        accept_arguments=job.JobAcceptArguments(name="", identity="", metadata=""),
+        worker_id="fake_id",
+        fake_job=True,
+    )
+
+
+def _percentile(values: list[float], q: float) -> float:
+    if not values:
+        return float("nan")
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q / 100 * len(values)))]
+
+
+@dataclass
+class _RunResult:
+    executor: str
+    sessions: int
+    completed: int
+    missing_answers: int
+    latency_p50: float
+    latency_p95: float
+    latency_max: float
+    loop_lag_p50: float
+    loop_lag_p95: float
+    loop_lag_max: float
+    cpu_per_session: float
+    rss_mb_per_session: float
+
+
+class _ResourceMonitor:
+    """CPU time and peak RSS of a set of processes, the processes that exited keep their last
+    sample"""
+
+    def __init__(self, baseline_rss: int = 0) -> None:
+        self._procs: dict[int, psutil.Process] = {}
+        self._cpu: dict[int, float] = {}
+        self._start_cpu: dict[int, float] = {}
+        self._baseline_rss = baseline_rss
+        self.peak_rss = 0
+
+    def sample(self, pids: list[int]) -> None:
+        rss = 0
+        for pid in pids:
+            try:
+                proc = self._procs.setdefault(pid, psutil.Process(pid))
+                with proc.oneshot():
+                    cpu = proc.cpu_times()
+                    rss += proc.memory_info().rss
+            except psutil.NoSuchProcess:
+                continue
+
+            self._start_cpu.setdefault(pid, cpu.user + cpu.system)
+            self._cpu[pid] = cpu.user + cpu.system
+
+        self.peak_rss = max(self.peak_rss, rss - self._baseline_rss)
+
+    @property
+    def cpu_time(self) -> float:
+        return sum(self._cpu[pid] - self._start_cpu[pid] for pid in self._cpu)
+
+
+async def _run(
+    executor_type: JobExecutorType, n_sessions: int, args: argparse.Namespace
+) -> _RunResult:
+    pool = ipc.proc_pool.ProcPool(
+        initialize_process_fnc=_prewarm,
+        job_entrypoint_fnc=_entrypoint,
+        session_end_fnc=None,
+        num_idle_processes=n_sessions,
+        job_executor_type=executor_type,
+        initialize_timeout=60.0,
+        close_timeout=10.0,
+        inference_executor=None,
+        memory_warn_mb=0,
+        memory_limit_mb=0,
+        http_proxy=None,
+        mp_ctx=mp.get_context("spawn"),
+        loop=asyncio.get_running_loop(),
+    )
+    await pool.start()
+
+    this_process = psutil.Process()
+    monitor = _ResourceMonitor(
+        baseline_rss=this_process.memory_info().rss
+        if executor_type == JobExecutorType.THREAD
+        else 0
+    )
+
+    def _pids() -> list[int]:
+        if executor_type == JobExecutorType.THREAD:
+            return [os.getpid()]
+        return [proc.pid for proc in pool.processes if proc.running_job and proc.pid is not None]
+
+    # don't replace the processes used by the jobs, they would compete with the sessions
+    pool.set_target_idle_processes(0)
+
+    with tempfile.TemporaryDirectory() as result_dir:
+        result_paths = [Path(result_dir) / f"session_{i}.json" for i in range(n_sessions)]
+        start = time.perf_counter()
+        for i, result_path in enumerate(result_paths):
+            metadata = {"speed": args.speed, "turns": args.turns, "result_path": str(result_path)}
+            await pool.launch_job(_fake_job(i, metadata))
+
+        monitor.sample(_pids())
+        # a session lasts ~6s per turn
+        deadline = start + (6.0 * args.turns + 10.0) / args.speed + 30.0
+        while time.perf_counter() < deadline:
+            await asyncio.sleep(0.5)
+            monitor.sample(_pids())
+            if all(path.exists() for path in result_paths):
+                break
+
+        elapsed = time.perf_counter() - start
+        results = [json.loads(path.read_text()) for path in result_paths if path.exists()]
+
+    await pool.aclose()
+
+    latencies = [latency for r in results for latency in r["latencies"]]
+    loop_lag = [lag for r in results for lag in r["loop_lag"]]
+    return _RunResult(
+        executor=executor_type.value,
+        sessions=n_sessions,
+        completed=len(results),
+        missing_answers=sum(r["turns"] - len(r["latencies"]) for r in results),
+        latency_p50=_percentile(latencies, 50),
+        latency_p95=_percentile(latencies, 95),
+        latency_max=max(latencies, default=float("nan")),
+        loop_lag_p50=_percentile(loop_lag, 50) * 1000,
+        loop_lag_p95=_percentile(loop_lag, 95) * 1000,
+        loop_lag_max=max(loop_lag, default=float("nan")) * 1000,
+        cpu_per_session=monitor.cpu_time / elapsed / n_sessions * 100,
+        rss_mb_per_session=monitor.peak_rss / n_sessions / (1024 * 1024),
+    )
+
+
+def _knee(results: list[_RunResult], args: argparse.Namespace) -> int | None:
+    baseline = results[0].latency_p95
+    for r in results:
+        if (
+            r.completed < r.sessions
+            or r.missing_answers
+            or r.latency_p95 > baseline * args.knee_factor
+            or r.loop_lag_p95 > args.max_loop_lag
+        ):
+            return r.sessions
+    return None
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--executor", nargs="+", choices=["thread", "process"], default=["thread", "process"]
+    )
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 4, 8, 16])
+    parser.add_argument("--turns", type=int, default=3)
+    parser.add_argument("--speed", type=float, default=1.0)
+    parser.add_argument("--knee-factor", type=float, default=1.5)
+    parser.add_argument("--max-loop-lag", type=float, default=50.0)
+    parser.add_argument("--json", type=str, default=None)
+    args = parser.parse_args()
+
+    all_results: list[_RunResult] = []
+    for executor in args.executor:
+        executor_type = JobExecutorType(executor)
+        print(
+            f"{executor:<8} {'sessions':>8} {'done':>5} {'missed':>6} "
+            f"{'eot->audio p50/p95/max (s)':>27} {'loop lag p50/p95/max (ms)':>26} "
+            f"{'cpu %/sess':>10} {'rss MB/sess':>11}"
+        )
+        results: list[_RunResult] = []
+        for n_sessions in sorted(args.sessions):
+            r = await _run(executor_type, n_sessions, args)
+            results.append(r)
+            print(
+                f"{'':<8} {r.sessions:>8} {r.completed:>5} {r.missing_answers:>6} "
+                f"{r.latency_p50:>9.3f}/{r.latency_p95:.3f}/{r.latency_max:.3f} "
+                f"{r.loop_lag_p50:>10.1f}/{r.loop_lag_p95:.1f}/{r.loop_lag_max:.1f} "
+                f"{r.cpu_per_session:>10.1f} {r.rss_mb_per_session:>11.1f}"
+            )
+
+        knee = _knee(results, args)
+        print(f"{'':<8} knee: {f'{knee} sessions' if knee else 'not reached'}\n")
+        all_results.extend(results)
+
+    if args.json:
+        Path(args.json).write_text(json.dumps([asdict(r) for r in all_results], indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
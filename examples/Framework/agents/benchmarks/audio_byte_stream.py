@@ -0,0 +1,59 @@
+"""AudioByteStream microbenchmark.
+
+Pushes 5s of 24kHz mono PCM in 20ms, 1s and 5s chunks and reports the time spent in push/flush
+for a few output frame sizes.
+
+    python benchmarks/audio_byte_stream.py [--rounds 20]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import time
+
+from livekit.agents.utils.audio import AudioByteStream
+
+SAMPLE_RATE = 24000
+DURATION = 5.0
+
+
+def _bench(pcm: bytes, chunk_ms: int, frame_ms: int, rounds: int) -> tuple[float, int]:
+    chunk_size = SAMPLE_RATE * chunk_ms // 1000 * 2
+    chunks = [pcm[i : i + chunk_size] for i in range(0, len(pcm), chunk_size)]
+
+    best = float("inf")
+    n_frames = 0
+    for _ in range(rounds):
+        bstream = AudioByteStream(
+            SAMPLE_RATE, 1, samples_per_channel=SAMPLE_RATE * frame_ms // 1000
+        )
+        start = time.perf_counter()
+        n_frames = 0
+        for chunk in chunks:
+            n_frames += len(bstream.push(chunk))
+        n_frames += len(bstream.flush())
+        best = min(best, time.perf_counter() - start)
+
+    return best, n_frames
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    pcm = os.urandom(int(SAMPLE_RATE * DURATION) * 2)
+    print(f"{DURATION}s of {SAMPLE_RATE}Hz mono PCM, best of {args.rounds} rounds")
+    for chunk_ms in (20, 1000, 5000):
+        for frame_ms in (10, 20, 100):
+            elapsed, n_frames = _bench(pcm, chunk_ms, frame_ms, args.rounds)
+            print(
+                f"chunks {chunk_ms:>4}ms  frames {frame_ms:>3}ms  "
+                f"total {elapsed * 1000:7.3f}ms  per frame {elapsed / n_frames * 1e6:6.2f}us  "
+                f"frames {n_frames}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""Compressed audio decoder benchmark.
+
+Encodes a 60s MP3 in memory, pushes it to an AudioStreamDecoder in 1KB chunks (as a fast TTS
+HTTP response would) and decodes it, with the StreamBuffer rewriting its BytesIO on every read
+(the previous implementation) and with the chunk deque. Also reports the decoders started
+concurrently, each of them used to start its own thread pool.
+
+    python benchmarks/audio_decoder.py [--duration 60] [--chunk-size 1024] [--concurrent 20]
+
+The cost of the BytesIO buffer grows with the square of the buffered bytes, --duration 300 shows it.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import io
+import threading
+import time
+
+import av
+import numpy as np
+
+from livekit.agents.utils.codecs import decoder
+
+SAMPLE_RATE = 24000
+
+
+class _BytesIOStreamBuffer:
+    # the previous implementation, the unread bytes are copied on every read
+    def __init__(self) -> None:
+        self._buffer = io.BytesIO()
+        self._data_available = threading.Condition(threading.Lock())
+        self._eof = False
+
+    def write(self, data: bytes) -> None:
+        with self._data_available:
+            self._buffer.seek(0, io.SEEK_END)
+            self._buffer.write(data)
+            self._data_available.notify_all()
+
+    def read(self, size: int = -1) -> bytes:
+        if self._buffer.closed:
+            return b""
+
+        with self._data_available:
+            while True:
+                if self._buffer.closed:
+                    return b""
+                self._buffer.seek(0)
+                data = self._buffer.read(size)
+                if data:
+                    remaining = self._buffer.read()
+                    self._buffer = io.BytesIO(remaining)
+                    return data
+                if self._eof:
+                    return b""
+                self._data_available.wait()
+
+    def end_input(self) -> None:
+        with self._data_available:
+            self._eof = True
+            self._data_available.notify_all()
+
+    def close(self) -> None:
+        self._buffer.close()
+
+
+def _encode_mp3(duration: float) -> bytes:
+    out = io.BytesIO()
+    with av.open(out, mode="w", format="mp3") as container:
+        stream = container.add_stream("mp3", rate=SAMPLE_RATE, layout="mono")
+        t = np.arange(int(duration * SAMPLE_RATE)) / SAMPLE_RATE
+        pcm = (np.sin(2 * np.pi * 220 * t) * 8000).astype(np.int16)
+        for i in range(0, len(pcm), SAMPLE_RATE):
+            frame = av.AudioFrame.from_ndarray(
+                pcm[i : i + SAMPLE_RATE].reshape(1, -1), format="s16", layout="mono"
+            )
+            frame.sample_rate = SAMPLE_RATE
+            for packet in stream.encode(frame):
+                container.mux(packet)
+        for packet in stream.encode(None):
+            container.mux(packet)
+
+    return out.getvalue()
+
+
+async def _decode(data: bytes, chunk_size: int) -> float:
+    dec = decoder.AudioStreamDecoder(sample_rate=SAMPLE_RATE, num_channels=1, format="audio/mpeg")
+    for i in range(0, len(data), chunk_size):
+        dec.push(data[i : i + chunk_size])
+    dec.end_input()
+
+    n_samples = 0
+    async for frame in dec:
+        n_samples += frame.samples_per_channel
+    await dec.aclose()
+    return n_samples / SAMPLE_RATE
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--duration", type=float, default=60)
+    parser.add_argument("--chunk-size", type=int, default=1024)
+    parser.add_argument("--concurrent", type=int, default=20)
+    args = parser.parse_args()
+
+    data = _encode_mp3(args.duration)
+    print(f"{len(data) / 1024:.0f}KB mp3, {args.duration:.0f}s, {args.chunk_size}B chunks")
+
+    chunk_buffer = decoder.StreamBuffer
+    for label, buffer_cls in (("bytesio", _BytesIOStreamBuffer), ("chunks", chunk_buffer)):
+        decoder.StreamBuffer = buffer_cls  # type: ignore[misc]
+
+        start = time.perf_counter()
+        decoded = await _decode(data, args.chunk_size)
+        single = time.perf_counter() - start
+
+        threads_before = threading.active_count()
+        start = time.perf_counter()
+        await asyncio.gather(*(_decode(data, args.chunk_size) for _ in range(args.concurrent)))
+        concurrent = time.perf_counter() - start
+
+        print(
+            f"{label:<8} decoded {decoded:5.1f}s in {single:6.3f}s  "
+            f"{args.concurrent} concurrent in {concurrent:6.3f}s  "
+            f"threads {threads_before} -> {threading.active_count()}"
+        )
+
+    decoder.StreamBuffer = chunk_buffer  # type: ignore[misc]
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,93 @@
+"""AudioHub benchmark.
+
+Feeds --duration seconds of 10ms frames of a participant track to an STT and a VAD both
+running at 16kHz, resampled by each of them (RecognizeStream and the silero VADStream
+each own a resampler, as before) and through an AudioHub, and reports the time spent
+resampling and fanning out the frames per second of audio.
+
+    python benchmarks/audio_hub.py [--duration 60] [--input-rate 48000 24000] [--rate 16000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+
+import numpy as np
+
+from livekit import rtc
+from livekit.agents.utils.audio import AudioHub
+
+
+def _frames(duration: float, sample_rate: int) -> list[rtc.AudioFrame]:
+    samples = sample_rate // 100
+    rng = np.random.default_rng(0)
+    return [
+        rtc.AudioFrame(
+            data=(rng.standard_normal(samples) * 3000).astype(np.int16).tobytes(),
+            sample_rate=sample_rate,
+            num_channels=1,
+            samples_per_channel=samples,
+        )
+        for _ in range(int(duration * 100))
+    ]
+
+
+async def _per_consumer(frames: list[rtc.AudioFrame], rate: int) -> float:
+    stt_resampler = rtc.AudioResampler(
+        frames[0].sample_rate, rate, quality=rtc.AudioResamplerQuality.HIGH
+    )
+    vad_resampler = rtc.AudioResampler(
+        frames[0].sample_rate, rate, quality=rtc.AudioResamplerQuality.QUICK
+    )
+    start = time.perf_counter()
+    for frame in frames:
+        stt_resampler.push(frame)
+        vad_resampler.push(frame)
+    return time.perf_counter() - start
+
+
+async def _hub(frames: list[rtc.AudioFrame], rate: int) -> float:
+    hub = AudioHub()
+    subs = [hub.subscribe("stt", sample_rate=rate), hub.subscribe("vad", sample_rate=rate)]
+
+    async def _consume(sub: object) -> None:
+        async for _ in sub:  # type: ignore[attr-defined]
+            pass
+
+    tasks = [asyncio.create_task(_consume(sub)) for sub in subs]
+    await asyncio.sleep(0)
+    start = time.perf_counter()
+    for i, frame in enumerate(frames):
+        hub.push(frame)
+        if i % 10 == 9:
+            await asyncio.sleep(0)  # the consumers read every 100ms
+
+    await asyncio.sleep(0)
+    elapsed = time.perf_counter() - start
+    hub.close()
+    await asyncio.gather(*tasks)
+    return elapsed
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--duration", type=float, default=60)
+    parser.add_argument("--input-rate", type=int, nargs="+", default=[48000, 24000])
+    parser.add_argument("--rate", type=int, default=16000)
+    args = parser.parse_args()
+
+    print(f"{'input':>6} {'per consumer (ms/s)':>20} {'hub (ms/s)':>11}")
+    for input_rate in args.input_rate:
+        frames = _frames(args.duration, input_rate)
+        per_consumer = await _per_consumer(frames, args.rate)
+        hub = await _hub(frames, args.rate)
+        print(
+            f"{input_rate:>6} {per_consumer / args.duration * 1000:>20.3f} "
+            f"{hub / args.duration * 1000:>11.3f}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,101 @@
+"""Chat context diff benchmark.
+
+Diffs a conversation against its next turn (two items appended, a message edited and an old item
+removed), the sync done by the realtime models, with the quadratic DP LCS the diff used before
+and with the current one.
+
+    python benchmarks/chat_ctx_diff.py [--items 100 1000 5000] [--rounds 5]
+"""
+
+from __future__ import annotations
+
+import argparse
+import functools
+import time
+from typing import Callable
+
+from livekit.agents.llm import ChatContext, ChatMessage, FunctionCall, utils
+
+
+def _dp_lcs(old_ids: list[str], new_ids: list[str]) -> list[str]:
+    # the previous implementation, a full (n+1)x(m+1) table
+    n, m = len(old_ids), len(new_ids)
+    dp = [[0] * (m + 1) for _ in range(n + 1)]
+    for i in range(1, n + 1):
+        for j in range(1, m + 1):
+            if old_ids[i - 1] == new_ids[j - 1]:
+                dp[i][j] = dp[i - 1][j - 1] + 1
+            else:
+                dp[i][j] = max(dp[i - 1][j], dp[i][j - 1])
+
+    lcs_ids = []
+    i, j = n, m
+    while i > 0 and j > 0:
+        if old_ids[i - 1] == new_ids[j - 1]:
+            lcs_ids.append(old_ids[i - 1])
+            i -= 1
+            j -= 1
+        elif dp[i - 1][j] > dp[i][j - 1]:
+            i -= 1
+        else:
+            j -= 1
+
+    return list(reversed(lcs_ids))
+
+
+def _contexts(n_items: int) -> tuple[ChatContext, ChatContext]:
+    items = [
+        ChatMessage(id=f"item_{i}", role="user" if i % 2 else "assistant", content=[f"turn {i}"])
+        if i % 5
+        else FunctionCall(id=f"item_{i}", call_id=f"call_{i}", name="lookup", arguments="{}")
+        for i in range(n_items)
+    ]
+    old = ChatContext(items)
+    new_items = items[1:] + [
+        ChatMessage(id="item_new_0", role="user", content=["hello"]),
+        ChatMessage(id="item_new_1", role="assistant", content=["hi"]),
+    ]
+    new_items[len(new_items) // 2] = ChatMessage(
+        id=new_items[len(new_items) // 2].id, role="user", content=["edited"]
+    )
+    return old, ChatContext(new_items)
+
+
+def _time(fnc: Callable[[], object], rounds: int) -> float:
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fnc()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--items", type=int, nargs="+", default=[100, 1000, 5000])
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    for n_items in args.items:
+        old, new = _contexts(n_items)
+        diff = utils.compute_chat_ctx_diff(old, new)
+        assert len(diff.to_remove) == 1 and len(diff.to_create) == 2
+        assert len(diff.to_update) == 1
+
+        old_ids = [item.id for item in old.items]
+        new_ids = [item.id for item in new.items]
+        assert utils._compute_lcs(old_ids, new_ids) == _dp_lcs(old_ids, new_ids)
+
+        # the DP table of 5k items is 25M cells, a single round is enough
+        dp_rounds = 1 if n_items > 1000 else args.rounds
+        dp = _time(functools.partial(_dp_lcs, old_ids, new_ids), dp_rounds)
+        lis = _time(functools.partial(utils._compute_lcs, old_ids, new_ids), args.rounds)
+        full = _time(functools.partial(utils.compute_chat_ctx_diff, old, new), args.rounds)
+        print(
+            f"{n_items:>5} items  dp lcs {dp * 1000:9.2f}ms  lis lcs {lis * 1000:7.3f}ms  "
+            f"diff {full * 1000:7.3f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""ChatContext lookup and insertion benchmark.
+
+On a long conversation where a third of the items are function calls and their outputs, measures
+with the linear scans ChatContext used before and with the id index / binary search:
+
+- sync: get_by_id() for every item, as the realtime models do when syncing their context
+- turn: a user message, two tool calls with their outputs and the reply inserted by created_at,
+  then get_by_id() of the new items
+- merge: merging the contexts of two agents (e.g. on a handoff), interleaved by created_at
+
+    python benchmarks/chat_ctx_lookup.py [--items 500 2000 10000] [--turns 50]
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from typing import Callable
+
+from livekit.agents.llm import ChatContext, ChatItem, ChatMessage, FunctionCall, FunctionCallOutput
+
+
+def _get_by_id_scan(chat_ctx: ChatContext, item_id: str) -> ChatItem | None:
+    # the previous implementations
+    return next((item for item in chat_ctx.items if item.id == item_id), None)
+
+
+def _insert_scan(chat_ctx: ChatContext, item: ChatItem) -> None:
+    items = chat_ctx.items
+    for i in reversed(range(len(items))):
+        if items[i].created_at <= item.created_at:
+            list.insert(items, i + 1, item)
+            return
+    list.insert(items, 0, item)
+
+
+def _merge_scan(chat_ctx: ChatContext, other: ChatContext) -> None:
+    existing_ids = {item.id for item in chat_ctx.items}
+    for item in other.items:
+        if item.id not in existing_ids:
+            _insert_scan(chat_ctx, item)
+            existing_ids.add(item.id)
+
+
+def _get_by_id(chat_ctx: ChatContext, item_id: str) -> ChatItem | None:
+    return chat_ctx.get_by_id(item_id)
+
+
+def _insert(chat_ctx: ChatContext, item: ChatItem) -> None:
+    chat_ctx.insert(item)
+
+
+def _merge(chat_ctx: ChatContext, other: ChatContext) -> None:
+    chat_ctx.merge(other)
+
+
+def _turn_items(i: int, t: float) -> list[ChatItem]:
+    return [
+        ChatMessage(id=f"msg_{i}", role="user", content=[f"question {i}"], created_at=t),
+        FunctionCall(
+            id=f"call_{i}/fnc_0", call_id=f"c{i}_0", name="lookup", arguments="{}", created_at=t + 1
+        ),
+        FunctionCall(
+            id=f"call_{i}/fnc_1", call_id=f"c{i}_1", name="lookup", arguments="{}", created_at=t + 1
+        ),
+        FunctionCallOutput(
+            id=f"out_{i}_0", call_id=f"c{i}_0", output="ok", is_error=False, created_at=t + 2
+        ),
+        FunctionCallOutput(
+            id=f"out_{i}_1", call_id=f"c{i}_1", output="ok", is_error=False, created_at=t + 2
+        ),
+        ChatMessage(id=f"reply_{i}", role="assistant", content=[f"answer {i}"], created_at=t + 3),
+    ]
+
+
+def _conversation(n_items: int, prefix: str = "", offset: float = 0.0) -> ChatContext:
+    items: list[ChatItem] = []
+    i = 0
+    while len(items) < n_items:
+        for item in _turn_items(i, i * 10.0 + offset):
+            item.id = prefix + item.id
+            items.append(item)
+        i += 1
+    return ChatContext(items[:n_items])
+
+
+def _bench(
+    n_items: int,
+    turns: int,
+    get_by_id: Callable[[ChatContext, str], ChatItem | None],
+    insert: Callable[[ChatContext, ChatItem], None],
+    merge: Callable[[ChatContext, ChatContext], None],
+) -> tuple[float, float, float]:
+    chat_ctx = _conversation(n_items)
+    ids = [item.id for item in chat_ctx.items]
+    start = time.perf_counter()
+    for item_id in ids:
+        get_by_id(chat_ctx, item_id)
+    sync = time.perf_counter() - start
+
+    last = chat_ctx.items[-1].created_at
+    start = time.perf_counter()
+    for turn in range(turns):
+        new_items = _turn_items(n_items + turn, last + 10.0 * (turn + 1))
+        # the tool outputs are created before the reply is inserted
+        for item in new_items:
+            insert(chat_ctx, item)
+        for item in new_items:
+            get_by_id(chat_ctx, item.id)
+    turn_ms = (time.perf_counter() - start) / turns
+
+    chat_ctx = _conversation(n_items)
+    other = _conversation(n_items, prefix="other_", offset=5.0)
+    start = time.perf_counter()
+    merge(chat_ctx, other)
+    merge_s = time.perf_counter() - start
+    return sync, turn_ms, merge_s
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--items", type=int, nargs="+", default=[500, 2000, 10000])
+    parser.add_argument("--turns", type=int, default=50)
+    args = parser.parse_args()
+
+    print(f"{'items':>6} {'impl':>6} {'sync (ms)':>10} {'turn (ms)':>10} {'merge (ms)':>11}")
+    for n_items in args.items:
+        for label, fncs in (
+            ("scan", (_get_by_id_scan, _insert_scan, _merge_scan)),
+            ("index", (_get_by_id, _insert, _merge)),
+        ):
+            sync, turn, merge = _bench(n_items, args.turns, *fncs)
+            print(
+                f"{n_items:>6} {label:>6} {sync * 1000:>10.2f} {turn * 1000:>10.3f} "
+                f"{merge * 1000:>11.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""Job process executor benchmark.
+
+Warms up a ProcPool with the process and the fork executors, the prewarm function loads the
+silero VAD. Reports the time until the idle processes are ready, the time to replace a process
+used by a job once the pool is warm, and the memory used per process (USS is the memory only
+used by that process, PSS splits the shared pages between the processes sharing them).
+
+    python benchmarks/job_executor.py [--processes 4]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import multiprocessing as mp
+import statistics
+import time
+
+import psutil
+
+from livekit.agents import JobContext, JobExecutorType, JobProcess, ipc, job
+from livekit.protocol import agent
+
+
+def _prewarm(proc: JobProcess) -> None:
+    from livekit.plugins import silero
+
+    proc.userdata["vad"] = silero.VAD.load()
+
+
+async def _entrypoint(job_ctx: JobContext) -> None:
+    job_ctx.shutdown("benchmark")
+
+
+def _fake_job() -> job.RunningJobInfo:
+    return job.RunningJobInfo(
+        job=agent.Job(id="bench_job", type=agent.JobType.JT_ROOM),
+        url="fake_url",
+        token="fake_token",
+        accept_arguments=job.JobAcceptArguments(name="", identity="", metadata=""),
+        worker_id="fake_id",
+        fake_job=True,
+    )
+
+
+def _memory_mb(pids: list[int]) -> tuple[float, float, float]:
+    rss = uss = pss = 0
+    measured = 0
+    for pid in pids:
+        try:
+            info = psutil.Process(pid).memory_full_info()
+        except psutil.NoSuchProcess:
+            continue  # the process of the finished job
+
+        rss += info.rss
+        uss += info.uss
+        pss += getattr(info, "pss", 0)
+        measured += 1
+
+    mb = 1024 * 1024 * max(measured, 1)
+    return rss / mb, uss / mb, pss / mb
+
+
+async def _bench(executor_type: JobExecutorType, n_processes: int) -> None:
+    pool = ipc.proc_pool.ProcPool(
+        initialize_process_fnc=_prewarm,
+        job_entrypoint_fnc=_entrypoint,
+        session_end_fnc=None,
+        num_idle_processes=n_processes,
+        job_executor_type=executor_type,
+        initialize_timeout=60.0,
+        close_timeout=10.0,
+        inference_executor=None,
+        memory_warn_mb=0,
+        memory_limit_mb=0,
+        http_proxy=None,
+        mp_ctx=mp.get_context("spawn"),
+        loop=asyncio.get_running_loop(),
+    )
+
+    created_at: dict[int, float] = {}
+    launch_times: list[float] = []
+    ready_q = asyncio.Queue[None]()
+
+    def _on_created(proc: ipc.job_executor.JobExecutor) -> None:
+        created_at[id(proc)] = time.perf_counter()
+
+    def _on_ready(proc: ipc.job_executor.JobExecutor) -> None:
+        launch_times.append(time.perf_counter() - created_at[id(proc)])
+        ready_q.put_nowait(None)
+
+    pool.on("process_created", _on_created)
+    pool.on("process_ready", _on_ready)
+
+    start = time.perf_counter()
+    await pool.start()
+    for _ in range(n_processes):
+        await ready_q.get()
+    pool_ready = time.perf_counter() - start
+
+    # the pool replaces the process used by a job, once everything is imported and warm
+    await pool.launch_job(_fake_job())
+    await ready_q.get()
+    warm_launch = launch_times[-1]
+
+    pids = [proc.pid for proc in pool.processes if proc.pid is not None]
+    rss, uss, pss = _memory_mb(pids)
+
+    template = ""
+    fork_server = pool._fork_server
+    if fork_server is not None and fork_server.pid is not None:
+        t_rss, t_uss, t_pss = _memory_mb([fork_server.pid])
+        template = f"  template rss {t_rss:.0f}MB uss {t_uss:.0f}MB pss {t_pss:.0f}MB"
+
+    await pool.aclose()
+
+    print(
+        f"{executor_type.value:<8} {n_processes} idle ready in {pool_ready:6.2f}s  "
+        f"launch median {statistics.median(launch_times[:-1]):5.2f}s  warm launch "
+        f"{warm_launch:5.2f}s\n"
+        f"{'':<8} per process rss {rss:.0f}MB uss {uss:.0f}MB pss {pss:.0f}MB{template}"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--processes", type=int, default=4)
+    args = parser.parse_args()
+
+    for executor_type in (JobExecutorType.PROCESS, JobExecutorType.FORK):
+        await _bench(executor_type, args.processes)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,126 @@
+"""Job process log transport benchmark.
+
+Sends N records with extras from a handler to a LogQueueListener over a socketpair, with the
+pickled LogRecord per message the transport used before and with the batched records. Reports
+the time spent in emit() (the job's threads) and until the listener handled every record.
+
+    python benchmarks/log_transport.py [--records 50000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import copy
+import logging
+import pickle
+import socket
+import threading
+import time
+
+from livekit.agents import ipc, utils
+
+
+class _PickleHandler(logging.Handler):
+    # the previous transport, one pickled LogRecord per message
+    def __init__(self, duplex: utils.aio.duplex_unix._Duplex) -> None:
+        super().__init__()
+        self._duplex = duplex
+
+    def emit(self, record: logging.LogRecord) -> None:
+        msg = self.format(record)
+        record = copy.copy(record)
+        record.message = msg
+        record.msg = msg
+        record.args = None
+        record.exc_info = None
+        self._duplex.send_bytes(pickle.dumps(record))
+
+
+class _PickleListener:
+    def __init__(self, duplex: utils.aio.duplex_unix._Duplex, n_records: int) -> None:
+        self._duplex = duplex
+        self._n_records = n_records
+
+    def run(self) -> None:
+        for _ in range(self._n_records):
+            record = pickle.loads(self._duplex.recv_bytes())
+            logging.getLogger(record.name).callHandlers(record)
+
+
+class _Counter(logging.Handler):
+    def __init__(self, n_records: int) -> None:
+        super().__init__()
+        self.count = 0
+        self.done = threading.Event()
+        self._n_records = n_records
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.count += 1
+        if self.count == self._n_records:
+            self.done.set()
+
+
+def _bench(label: str, n_records: int) -> None:
+    counter = _Counter(n_records)
+    lger = logging.getLogger("bench_log_transport")
+    lger.propagate = False
+    lger.handlers = [counter]
+    lger.setLevel(logging.DEBUG)
+
+    pch, cch = socket.socketpair()
+    parent = utils.aio.duplex_unix._Duplex.open(pch)
+    child = utils.aio.duplex_unix._Duplex.open(cch)
+
+    handler: logging.Handler
+    if label == "pickle":
+        handler = _PickleHandler(child)
+        threading.Thread(target=_PickleListener(parent, n_records).run, daemon=True).start()
+    else:
+        handler = ipc.log_queue.LogQueueHandler(child)
+        listener = ipc.log_queue.LogQueueListener(parent, lambda r: None)
+        listener.start()
+
+    records = [
+        lger.makeRecord(
+            lger.name,
+            logging.DEBUG,
+            __file__,
+            0,
+            "received %d bytes",
+            (i,),
+            None,
+            extra={"room": "room_1", "participant": "user"},
+        )
+        for i in range(n_records)
+    ]
+
+    start = time.perf_counter()
+    for record in records:
+        handler.emit(record)
+    emit_time = time.perf_counter() - start
+    counter.done.wait()
+    total_time = time.perf_counter() - start
+
+    handler.close()
+    if label != "pickle":
+        listener.stop()
+    else:
+        parent.close()
+
+    print(
+        f"{label:<8} {n_records} records  emit {emit_time * 1e6 / n_records:6.2f}us/record  "
+        f"handled after {total_time:6.3f}s"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--records", type=int, default=50000)
+    args = parser.parse_args()
+
+    for label in ("pickle", "batched"):
+        _bench(label, args.records)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""OpenAI Realtime audio events benchmark.
+
+Measures the per-event cost of the audio the RealtimeSession sends (input_audio_buffer.append,
+every 100ms) and receives (response.output_audio.delta) with the pydantic models it used before
+and with the templated/raw fast path, nobody listening to the openai_* events.
+
+    python benchmarks/openai_realtime.py [--events 20000] [--chunk-ms 100]
+"""
+
+from __future__ import annotations
+
+import argparse
+import base64
+import binascii
+import json
+import time
+
+from openai.types.realtime import InputAudioBufferAppendEvent, ResponseAudioDeltaEvent
+
+from livekit.plugins.openai.realtime import realtime_model
+
+SAMPLE_RATE = 24000
+
+# the server events compared before response.output_audio.delta in the previous if/elif chain
+_PREVIOUS_CHAIN = [
+    "input_audio_buffer.speech_started",
+    "input_audio_buffer.speech_stopped",
+    "response.created",
+    "response.output_item.added",
+    "response.content_part.added",
+    "conversation.item.added",
+    "conversation.item.deleted",
+    "conversation.item.input_audio_transcription.delta",
+    "conversation.item.input_audio_transcription.completed",
+    "conversation.item.input_audio_transcription.failed",
+    "response.output_text.delta",
+    "response.output_text.done",
+    "response.output_audio_transcript.delta",
+    "response.output_audio.delta",
+]
+
+
+def _send_model(pcm: bytes) -> str:
+    ev = InputAudioBufferAppendEvent(
+        type="input_audio_buffer.append", audio=base64.b64encode(pcm).decode("utf-8")
+    )
+    msg = ev.model_dump(by_alias=True, exclude_unset=True, exclude_defaults=False)
+    return json.dumps(msg)
+
+
+def _send_template(pcm: bytes) -> str:
+    msg = realtime_model._InputAudioAppend(binascii.b2a_base64(pcm, newline=False).decode("ascii"))
+    return (
+        realtime_model._INPUT_AUDIO_APPEND_PREFIX
+        + msg.audio
+        + realtime_model._INPUT_AUDIO_APPEND_SUFFIX
+    )
+
+
+def _recv_model(data: str) -> bytes:
+    event = json.loads(data)
+    for event_type in _PREVIOUS_CHAIN:
+        if event["type"] == event_type:
+            break
+    return base64.b64decode(ResponseAudioDeltaEvent.construct(**event).delta)
+
+
+def _recv_raw(data: str) -> bytes:
+    event = json.loads(data)
+    event_cls, _ = realtime_model._SERVER_EVENT_HANDLERS[event["type"]]
+    assert event_cls is None
+    return binascii.a2b_base64(event["delta"])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--events", type=int, default=20000)
+    parser.add_argument("--chunk-ms", type=int, default=100)
+    args = parser.parse_args()
+
+    pcm = (bytes(range(256)) * SAMPLE_RATE)[: SAMPLE_RATE * 2 * args.chunk_ms // 1000]
+    delta = json.dumps(
+        {
+            "type": "response.output_audio.delta",
+            "event_id": "event_123",
+            "response_id": "resp_123",
+            "item_id": "item_123",
+            "output_index": 0,
+            "content_index": 0,
+            "delta": base64.b64encode(pcm).decode(),
+        }
+    )
+    assert json.loads(_send_model(pcm)) == json.loads(_send_template(pcm))
+    assert _recv_model(delta) == _recv_raw(delta) == pcm
+
+    print(f"{len(pcm)}B of pcm per event   (us per event)")
+    for label, fnc, arg in (
+        ("append model", _send_model, pcm),
+        ("append template", _send_template, pcm),
+        ("delta model", _recv_model, delta),
+        ("delta raw", _recv_raw, delta),
+    ):
+        start = time.perf_counter()
+        for _ in range(args.events):
+            fnc(arg)  # type: ignore[operator]
+        elapsed = time.perf_counter() - start
+        print(f"{label:<16} {elapsed / args.events * 1e6:8.2f}")
+
+
+if __name__ == "__main__":
+    main()
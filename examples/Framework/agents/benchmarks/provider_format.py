@@ -0,0 +1,101 @@
+"""ChatContext.to_provider_format benchmark.
+
+Converts an append-only conversation (user and assistant messages, tool calls with their outputs
+and a few images) to every provider format, once per turn as an agent does: two items are
+appended between two conversions of the same context.
+
+    python benchmarks/provider_format.py [--items 50 500 2000] [--turns 50] [--image-every 100]
+"""
+
+from __future__ import annotations
+
+import argparse
+import base64
+import gc
+import json
+import statistics
+import time
+
+from livekit.agents.llm import (
+    ChatContext,
+    ChatItem,
+    ChatMessage,
+    FunctionCall,
+    FunctionCallOutput,
+    ImageContent,
+)
+
+FORMATS = ("openai", "anthropic", "google", "aws", "mistralai")
+# about the size of a sampled video frame encoded to JPEG
+_IMAGE = "data:image/jpeg;base64," + base64.b64encode(bytes(40 * 1024)).decode()
+
+
+def _items(start: int, n_items: int, image_every: int = 100) -> list[ChatItem]:
+    items: list[ChatItem] = []
+    for i in range(start, start + n_items):
+        if i % 10 == 3:
+            args = json.dumps({"city": f"city {i}", "days": 3})
+            items.append(
+                FunctionCall(
+                    id=f"item_{i}/fnc_0", call_id=f"call_{i}", name="weather", arguments=args
+                )
+            )
+        elif i % 10 == 4:
+            items.append(
+                FunctionCallOutput(
+                    id=f"item_{i}",
+                    call_id=f"call_{i - 1}",
+                    name="weather",
+                    output="sunny, 24C",
+                    is_error=False,
+                )
+            )
+        elif i % image_every == image_every // 2:
+            items.append(
+                ChatMessage(
+                    id=f"item_{i}",
+                    role="user",
+                    content=["what is this?", ImageContent(image=_IMAGE)],
+                )
+            )
+        else:
+            role = "user" if i % 2 else "assistant"
+            items.append(
+                ChatMessage(
+                    id=f"item_{i}", role=role, content=[f"message {i} " + "lorem ipsum " * 8]
+                )
+            )
+    return items
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--items", type=int, nargs="+", default=[50, 500, 2000])
+    parser.add_argument("--turns", type=int, default=50)
+    parser.add_argument("--image-every", type=int, default=100)
+    args = parser.parse_args()
+
+    print(f"{'items':>6} " + " ".join(f"{fmt:>10}" for fmt in FORMATS) + "   (median ms per turn)")
+    for n_items in args.items:
+        results = []
+        for fmt in FORMATS:
+            chat_ctx = ChatContext(_items(0, n_items, args.image_every))
+            chat_ctx.to_provider_format(fmt)
+
+            gc.collect()
+            elapsed = []
+            for turn in range(args.turns):
+                i = n_items + turn * 2
+                chat_ctx.add_message(id=f"item_{i}", role="user", content=f"question {i}")
+                chat_ctx.add_message(id=f"item_{i + 1}", role="assistant", content=f"answer {i}")
+                start = time.perf_counter()
+                chat_ctx.to_provider_format(fmt)
+                elapsed.append(time.perf_counter() - start)
+
+            results.append(statistics.median(elapsed) * 1000)
+
+        print(f"{n_items:>6} " + " ".join(f"{ms:>10.3f}" for ms in results))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""RecorderIO encoder pool benchmark.
+
+Encodes N concurrent recordings fed with 2.5s stereo chunks at the same time, with one thread per
+recording (the previous RecorderIO behaviour) and with the shared pool. Reports the time until
+every recording is written and the worst lag of an asyncio loop running in the meantime (the GIL
+contention felt by the sessions).
+
+    python benchmarks/recorder_encoder.py [--recordings 60] [--chunks 4] [--workers 2]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+from livekit import rtc
+from livekit.agents.voice.recorder_io import RecorderEncoderPool
+
+SAMPLE_RATE = 24000
+CHUNK_DURATION = 2.5
+
+
+def _chunk() -> list[rtc.AudioFrame]:
+    samples_per_frame = SAMPLE_RATE // 50
+    pcm = (np.random.uniform(-0.3, 0.3, int(SAMPLE_RATE * CHUNK_DURATION)) * 32767).astype(np.int16)
+    return [
+        rtc.AudioFrame(
+            data=pcm[i : i + samples_per_frame].tobytes(),
+            sample_rate=SAMPLE_RATE,
+            num_channels=1,
+            samples_per_channel=samples_per_frame,
+        )
+        for i in range(0, len(pcm), samples_per_frame)
+    ]
+
+
+async def _bench(n_recordings: int, n_chunks: int, workers: int, out_dir: Path) -> None:
+    pool = RecorderEncoderPool(max_workers=workers, max_queue_depth=n_chunks)
+    loop = asyncio.get_running_loop()
+    done = asyncio.Event()
+    remaining = n_recordings
+    lock = threading.Lock()
+
+    def _on_closed() -> None:
+        nonlocal remaining
+        with lock:
+            remaining -= 1
+            if remaining == 0:
+                loop.call_soon_threadsafe(done.set)
+
+    encoders = [
+        pool.open(
+            output_path=out_dir / f"{workers}_{i}.ogg",
+            sample_rate=48000,
+            on_closed=_on_closed,
+        )
+        for i in range(n_recordings)
+    ]
+    chunk_in, chunk_out = _chunk(), _chunk()
+
+    max_lag = 0.0
+
+    async def _ticker() -> None:
+        nonlocal max_lag
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(0.01)
+            max_lag = max(max_lag, time.perf_counter() - start - 0.01)
+
+    ticker = asyncio.create_task(_ticker())
+    start = time.perf_counter()
+    for _ in range(n_chunks):
+        for encoder in encoders:
+            encoder.push(chunk_in, chunk_out)
+    for encoder in encoders:
+        encoder.close()
+
+    await done.wait()
+    elapsed = time.perf_counter() - start
+    ticker.cancel()
+    pool.shutdown()
+
+    label = "per recording" if workers == n_recordings else f"pool of {workers}"
+    print(
+        f"{label:<14} threads {workers:>3}  encoded {n_recordings * n_chunks * CHUNK_DURATION:6.0f}s "
+        f"of audio in {elapsed:6.2f}s  max loop lag {max_lag * 1000:7.1f}ms  "
+        f"dropped {pool.dropped_chunks}"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--recordings", type=int, default=60)
+    parser.add_argument("--chunks", type=int, default=4)
+    parser.add_argument("--workers", type=int, default=2)
+    args = parser.parse_args()
+
+    # every chunk is realigned (the input resampler isn't flushed), don't log it
+    logging.getLogger("livekit.agents").setLevel(logging.ERROR)
+
+    with tempfile.TemporaryDirectory() as out_dir:
+        for workers in (args.recordings, args.workers):
+            await _bench(args.recordings, args.chunks, workers, Path(out_dir))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
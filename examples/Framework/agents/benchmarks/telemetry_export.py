@@ -0,0 +1,127 @@
+"""Span export overhead benchmark.
+
+Runs agent sessions made of turns with the spans an agent creates (user turn, eou detection, llm
+and tts nodes, tool calls) and reports the time spent creating and ending the spans on the calling
+thread (i.e. the event loop) and in the on_end of the processor, with no processor, with the
+OpenTelemetry BatchSpanProcessor and with the SampledBatchSpanProcessor keeping every trace or
+sampling them. The exporter takes --export-latency ms per batch, as an OTLP exporter would.
+
+    python benchmarks/telemetry_export.py [--sessions 200] [--turns 20] [--slow-ratio 0.05]
+        [--export-latency 20]
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import random
+import time
+from collections.abc import Sequence
+
+from opentelemetry.sdk.trace import ReadableSpan, SpanProcessor, TracerProvider
+from opentelemetry.sdk.trace.export import BatchSpanProcessor, SpanExporter, SpanExportResult
+
+from livekit.agents.telemetry import SampledBatchSpanProcessor, trace_types
+
+
+class _TimedProcessor(SpanProcessor):
+    # the time spent in on_end of the wrapped processor, on the thread ending the spans
+    def __init__(self, processor: SpanProcessor) -> None:
+        self._processor = processor
+        self.on_end_time = 0.0
+
+    def on_end(self, span: ReadableSpan) -> None:
+        start = time.perf_counter()
+        self._processor.on_end(span)
+        self.on_end_time += time.perf_counter() - start
+
+    def shutdown(self) -> None:
+        self._processor.shutdown()
+
+
+class _SlowExporter(SpanExporter):
+    def __init__(self, latency: float) -> None:
+        self._latency = latency
+        self.exported = 0
+
+    def export(self, spans: Sequence[ReadableSpan]) -> SpanExportResult:
+        time.sleep(self._latency)
+        self.exported += len(spans)
+        return SpanExportResult.SUCCESS
+
+
+def _run(processor: SpanProcessor | None, args: argparse.Namespace) -> tuple[float, int]:
+    provider = TracerProvider()
+    if processor is not None:
+        provider.add_span_processor(processor)
+
+    tracer = provider.get_tracer("bench")
+    rng = random.Random(0)
+    n_spans = 0
+    start = time.perf_counter()
+    for _ in range(args.sessions):
+        slow_session = rng.random() < args.slow_ratio
+        with tracer.start_as_current_span("agent_session"):
+            for turn in range(args.turns):
+                with tracer.start_as_current_span("user_turn"):
+                    with tracer.start_as_current_span("eou_detection") as span:
+                        span.set_attribute(trace_types.ATTR_EOU_PROBABILITY, 0.9)
+                with tracer.start_as_current_span("agent_turn") as turn_span:
+                    with tracer.start_as_current_span("llm_node"):
+                        with tracer.start_as_current_span("llm_request"):
+                            pass
+                    with tracer.start_as_current_span("function_tool"):
+                        pass
+                    with tracer.start_as_current_span("tts_node"):
+                        with tracer.start_as_current_span("tts_request"):
+                            pass
+                    latency = 2.5 if slow_session and turn == args.turns // 2 else 0.8
+                    turn_span.set_attribute(trace_types.ATTR_E2E_LATENCY, latency)
+                n_spans += 9
+            n_spans += 1
+
+    elapsed = time.perf_counter() - start
+    provider.shutdown()
+    return elapsed, n_spans
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sessions", type=int, default=200)
+    parser.add_argument("--turns", type=int, default=20)
+    parser.add_argument("--slow-ratio", type=float, default=0.05)
+    parser.add_argument("--export-latency", type=float, default=20)
+    args = parser.parse_args()
+
+    latency = args.export_latency / 1000
+    print(
+        f"{'processor':<16} {'loop (us/span)':>15} {'on_end (us/span)':>17} {'exported':>9} "
+        f"{'dropped':>8} {'sampled out':>12}"
+    )
+    for label in ("none", "batch", "sampled 100%", "sampled 1%+tail"):
+        exporter = _SlowExporter(latency)
+        processor: SpanProcessor | None = None
+        if label == "batch":
+            processor = BatchSpanProcessor(exporter)
+        elif label == "sampled 100%":
+            processor = SampledBatchSpanProcessor(exporter)
+        elif label == "sampled 1%+tail":
+            processor = SampledBatchSpanProcessor(exporter, sample_rate=0.01, latency_threshold=2.0)
+
+        gc.collect()
+        timed = _TimedProcessor(processor) if processor is not None else None
+        elapsed, n_spans = _run(timed, args)
+        on_end = timed.on_end_time / n_spans * 1e6 if timed is not None else 0.0
+        dropped = sampled_out = "-"
+        if isinstance(processor, SampledBatchSpanProcessor):
+            stats = processor.stats
+            dropped, sampled_out = str(stats.spans_dropped), str(stats.spans_sampled_out)
+
+        print(
+            f"{label:<16} {elapsed / n_spans * 1e6:>15.2f} {on_end:>17.2f} "
+            f"{exporter.exported:>9} {dropped:>8} {sampled_out:>12}"
+        )
+
+
+if __name__ == "__main__":
+    main()
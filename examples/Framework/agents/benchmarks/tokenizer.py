@@ -0,0 +1,86 @@
+"""Streamed sentence tokenizer benchmark.
+
+Pushes a ~10k token LLM-like stream (one word per push) through each tokenizer and reports
+the total push time and the time until the first sentence is emitted.
+
+    python benchmarks/tokenizer.py [--tokens 10000] [--rounds 5]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import functools
+import pathlib
+import re
+import time
+from typing import Callable
+
+from livekit.agents import tokenize
+from livekit.agents.tokenize import _basic_sent, basic, blingfire
+
+_TEXT_FILE = pathlib.Path(__file__).parent.parent / "tests" / "long_transcript.txt"
+
+
+def _make_deltas(n_tokens: int) -> list[str]:
+    words = re.findall(r"\S+\s*", _TEXT_FILE.read_text())
+    return [words[i % len(words)] for i in range(n_tokens)]
+
+
+def _basic_no_boundary_hint() -> tokenize.SentenceStream:
+    # the basic tokenizer as it behaved before the incremental scan: tokenized on every push
+    return tokenize.BufferedSentenceStream(
+        tokenizer=functools.partial(_basic_sent.split_sentences, min_sentence_len=20),
+        min_token_len=20,
+        min_ctx_len=10,
+    )
+
+
+async def _bench(
+    make_stream: Callable[[], tokenize.SentenceStream], deltas: list[str]
+) -> tuple[float, float, int]:
+    stream = make_stream()
+    first_sentence = 0.0
+
+    start = time.perf_counter()
+    for delta in deltas:
+        stream.push_text(delta)
+        if not first_sentence and stream._event_ch.qsize():  # type: ignore[attr-defined]
+            first_sentence = time.perf_counter() - start
+    stream.end_input()
+    total = time.perf_counter() - start
+
+    n_sentences = 0
+    async for _ in stream:
+        n_sentences += 1
+
+    return total, first_sentence, n_sentences
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tokens", type=int, default=10_000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    deltas = _make_deltas(args.tokens)
+    tokenizers: dict[str, Callable[[], tokenize.SentenceStream]] = {
+        "basic": basic.SentenceTokenizer().stream,
+        "basic (no boundary hint)": _basic_no_boundary_hint,
+        "blingfire": blingfire.SentenceTokenizer().stream,
+    }
+
+    print(f"{args.tokens} tokens, best of {args.rounds} rounds")
+    for name, make_stream in tokenizers.items():
+        results = [await _bench(make_stream, deltas) for _ in range(args.rounds)]
+        total, first_sentence, n_sentences = min(results)
+        print(
+            f"{name:<26} total {total * 1000:8.2f}ms  "
+            f"per token {total / args.tokens * 1e6:6.2f}us  "
+            f"first sentence {first_sentence * 1e6:8.1f}us  "
+            f"sentences {n_sentences}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
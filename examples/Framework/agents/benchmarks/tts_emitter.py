@@ -0,0 +1,107 @@
+"""tts.AudioEmitter throughput benchmark.
+
+Pushes PCM and MP3 audio to a streaming AudioEmitter in small chunks (as a TTS websocket would),
+flushing after every sentence, and reports the frames emitted per second of CPU time of the
+process (i.e. per core, the decoder threads included).
+
+    python benchmarks/tts_emitter.py [--segments 20] [--sentences 10] [--sentence-duration 3]
+        [--chunk-size 4096] [--frame-size-ms 200]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import io
+import time
+
+import av
+import numpy as np
+
+from livekit.agents import tts, utils
+
+SAMPLE_RATE = 24000
+
+
+def _sine(duration: float) -> np.ndarray:
+    t = np.arange(int(duration * SAMPLE_RATE)) / SAMPLE_RATE
+    return (np.sin(2 * np.pi * 220 * t) * 8000).astype(np.int16)
+
+
+def _encode_mp3(pcm: np.ndarray) -> bytes:
+    out = io.BytesIO()
+    with av.open(out, mode="w", format="mp3") as container:
+        stream = container.add_stream("mp3", rate=SAMPLE_RATE, layout="mono")
+        frame = av.AudioFrame.from_ndarray(pcm.reshape(1, -1), format="s16", layout="mono")
+        frame.sample_rate = SAMPLE_RATE
+        for packet in stream.encode(frame):
+            container.mux(packet)
+        for packet in stream.encode(None):
+            container.mux(packet)
+
+    return out.getvalue()
+
+
+async def _run(args: argparse.Namespace, mime_type: str, sentence: bytes) -> tuple[int, float]:
+    dst_ch = utils.aio.Chan[tts.SynthesizedAudio]()
+    emitter = tts.AudioEmitter(label="bench", dst_ch=dst_ch)
+
+    start = time.process_time()
+    emitter.initialize(
+        request_id="bench",
+        sample_rate=SAMPLE_RATE,
+        num_channels=1,
+        mime_type=mime_type,
+        frame_size_ms=args.frame_size_ms,
+        stream=True,
+    )
+
+    async def _consume() -> int:
+        n_frames = 0
+        async for _ in dst_ch:
+            n_frames += 1
+        return n_frames
+
+    consume_task = asyncio.create_task(_consume())
+    for i in range(args.segments):
+        emitter.start_segment(segment_id=f"seg_{i}")
+        for _ in range(args.sentences):
+            for j in range(0, len(sentence), args.chunk_size):
+                emitter.push(sentence[j : j + args.chunk_size])
+                await asyncio.sleep(0)
+            emitter.flush()
+        emitter.end_segment()
+
+    emitter.end_input()
+    await emitter.join()
+    dst_ch.close()
+    n_frames = await consume_task
+    return n_frames, time.process_time() - start
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--segments", type=int, default=20)
+    parser.add_argument("--sentences", type=int, default=10)
+    parser.add_argument("--sentence-duration", type=float, default=3)
+    parser.add_argument("--chunk-size", type=int, default=4096)
+    parser.add_argument("--frame-size-ms", type=int, default=200)
+    args = parser.parse_args()
+
+    pcm = _sine(args.sentence_duration)
+    audio_s = args.segments * args.sentences * args.sentence_duration
+    print(f"{audio_s:.0f}s of audio, {args.frame_size_ms}ms frames, {args.chunk_size}B chunks")
+
+    for label, mime_type, sentence in (
+        ("pcm", "audio/pcm", pcm.tobytes()),
+        ("mp3", "audio/mpeg", _encode_mp3(pcm)),
+    ):
+        n_frames, cpu_time = await _run(args, mime_type, sentence)
+        print(
+            f"{label:<4} {n_frames:6d} frames in {cpu_time:6.3f}s cpu  "
+            f"{n_frames / cpu_time:9.0f} frames/s  {audio_s / cpu_time:7.0f}x realtime"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -16,6 +16,11 @@ _RunnersDict = dict[str, type["_InferenceRunner"]]
 class _InferenceRunner(ABC, _RunnerMeta):
     registered_runners: _RunnersDict = {}
 
+    # micro-batching inside the inference process. when MAX_BATCH_SIZE > 1, requests arriving
+    # within MAX_BATCH_WAIT seconds of each other are grouped and passed to run_batch
+    MAX_BATCH_SIZE: ClassVar[int] = 1
+    MAX_BATCH_WAIT: ClassVar[float] = 0.0
+
     @classmethod
     def register_runner(cls, runner_class: type[_InferenceRunner]) -> None:
         if threading.current_thread() != threading.main_thread():
@@ -35,3 +40,18 @@ class _InferenceRunner(ABC, _RunnerMeta):
     def run(self, data: bytes) -> bytes | None:
         """Run inference on the given data."""
         ...
+
+    def run_batch(self, data: list[bytes]) -> list[bytes | None | Exception]:
+        """Run inference on a batch of requests, results must be in the same order as the inputs.
+
+        A request that fails is returned as its exception, so that it doesn't fail the other
+        requests of the batch. The default implementation calls run for each request, runners
+        supporting batched inference should override it.
+        """
+        results: list[bytes | None | Exception] = []
+        for d in data:
+            try:
+                results.append(self.run(d))
+            except Exception as e:
+                results.append(e)
+        return results
@@ -1,21 +1,31 @@
 from . import (
     channel,
+    idle_policy,
+    inference_codec,
     inference_proc_executor,
     job_executor,
+    job_fork_executor,
     job_proc_executor,
     job_thread_executor,
+    log_queue,
     proc_pool,
     proto,
+    shm_audio,
 )
 
 __all__ = [
     "channel",
+    "idle_policy",
+    "inference_codec",
     "inference_proc_executor",
     "job_executor",
+    "job_fork_executor",
     "job_proc_executor",
     "job_thread_executor",
+    "log_queue",
     "proc_pool",
     "proto",
+    "shm_audio",
 ]
 
 # Cleanup docs of unexported modules
@@ -59,8 +59,8 @@ def send_message(dplx: utils.aio.duplex_unix._Duplex, msg: Message) -> None:
     dplx.send_bytes(_write_message(msg))
 
 
-def write_bytes(b: io.BytesIO, buf: bytes) -> None:
-    b.write(len(buf).to_bytes(4, "big"))
+def write_bytes(b: io.BytesIO, buf: bytes | memoryview) -> None:
+    b.write(memoryview(buf).nbytes.to_bytes(4, "big"))
     b.write(buf)
 
 
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import math
+from abc import ABC, abstractmethod
+from collections import deque
+
+_MIN_RATE_SPAN = 5.0
+
+
+class IdleProcessPolicy(ABC):
+    """Decides how many warmed processes the ProcPool keeps idle.
+
+    The pool reports job arrivals and process launch times, and reads the target on every tick.
+    `num_idle_processes` is the value configured on the server (ServerOptions.num_idle_processes).
+    Lowering the target doesn't close idle processes, they just aren't replaced once used.
+    """
+
+    def on_job_requested(self, *, now: float) -> None:  # noqa: B027
+        """Called when a job asks the pool for a process"""
+
+    def on_process_ready(self, *, launch_time: float) -> None:  # noqa: B027
+        """Called once a process is initialized, launch_time includes the wait for a free
+        initialization slot"""
+
+    @abstractmethod
+    def target_idle_processes(self, num_idle_processes: int, *, now: float) -> int: ...
+
+    def max_idle_processes(self, num_idle_processes: int) -> int:
+        """Upper bound of target_idle_processes, the load based limit of the server is capped to
+        it"""
+        return num_idle_processes
+
+
+class StaticIdlePolicy(IdleProcessPolicy):
+    """Always keep num_idle_processes warm (the default)"""
+
+    def target_idle_processes(self, num_idle_processes: int, *, now: float) -> int:
+        return num_idle_processes
+
+
+class PredictiveIdlePolicy(IdleProcessPolicy):
+    """Size the idle pool after the jobs expected to arrive while a process cold-starts.
+
+    The arrival rate is measured over a sliding window and the launch time is an EWMA of the
+    observed process launches. The target is `ceil(rate * launch_time * headroom)`, bounded by
+    [min_idle_processes, max_idle_processes]. It goes back down as the window forgets a burst.
+    """
+
+    def __init__(
+        self,
+        *,
+        min_idle_processes: int | None = None,
+        max_idle_processes: int = 16,
+        window: float = 30.0,
+        headroom: float = 2.0,
+        launch_time_alpha: float = 0.3,
+        default_launch_time: float = 2.0,
+    ) -> None:
+        """
+        Args:
+            min_idle_processes: lower bound of the target, defaults to the configured
+                num_idle_processes.
+            max_idle_processes: upper bound of the target.
+            window: duration in seconds over which the job arrival rate is measured.
+            headroom: multiplier applied to the expected number of arrivals during a launch.
+            launch_time_alpha: smoothing factor of the launch time EWMA.
+            default_launch_time: launch time assumed until a process was launched.
+        """
+        if window <= 0:
+            raise ValueError("window must be positive")
+
+        self._min_idle_processes = min_idle_processes
+        self._max_idle_processes = max_idle_processes
+        self._window = window
+        self._headroom = headroom
+        self._alpha = launch_time_alpha
+        self._launch_time = default_launch_time
+        self._launch_time_measured = False
+        self._arrivals: deque[float] = deque()
+        self._first_seen: float | None = None
+        self._rate = 0.0
+
+    @property
+    def arrival_rate(self) -> float:
+        """Jobs per second over the last window, as of the last update"""
+        return self._rate
+
+    @property
+    def launch_time(self) -> float:
+        """Smoothed time between a spawn and the process being ready"""
+        return self._launch_time
+
+    def on_job_requested(self, *, now: float) -> None:
+        self._arrivals.append(now)
+        self._update_rate(now)
+
+    def on_process_ready(self, *, launch_time: float) -> None:
+        if not self._launch_time_measured:
+            self._launch_time = launch_time
+            self._launch_time_measured = True
+        else:
+            self._launch_time += self._alpha * (launch_time - self._launch_time)
+
+    def _update_rate(self, now: float) -> None:
+        if self._first_seen is None:
+            self._first_seen = now
+
+        while self._arrivals and self._arrivals[0] <= now - self._window:
+            self._arrivals.popleft()
+
+        # don't underestimate the rate of a burst right after the pool started, without
+        # overreacting to its first job
+        span = min(self._window, max(now - self._first_seen, _MIN_RATE_SPAN))
+        self._rate = len(self._arrivals) / span
+
+    def _min_idle(self, num_idle_processes: int) -> int:
+        if self._min_idle_processes is not None:
+            return self._min_idle_processes
+        return num_idle_processes
+
+    def target_idle_processes(self, num_idle_processes: int, *, now: float) -> int:
+        self._update_rate(now)
+        expected = math.ceil(self._rate * self._launch_time * self._headroom)
+        max_idle = self.max_idle_processes(num_idle_processes)
+        return max(self._min_idle(num_idle_processes), min(expected, max_idle))
+
+    def max_idle_processes(self, num_idle_processes: int) -> int:
+        return max(self._max_idle_processes, self._min_idle(num_idle_processes))
@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import struct
+from typing import Protocol, TypeVar, Union
+
+# the payloads never leave the host, so native byte order is used everywhere
+_U8 = struct.Struct("=B")
+_U32 = struct.Struct("=I")
+_F32 = struct.Struct("=f")
+_F64 = struct.Struct("=d")
+
+Buffer = Union[bytes, bytearray, memoryview]
+
+_ReqT = TypeVar("_ReqT")
+_RespT = TypeVar("_RespT")
+
+
+class InferenceCodec(Protocol[_ReqT, _RespT]):
+    """Encodes the payloads exchanged between a job and an _InferenceRunner.
+
+    The job process uses encode_request/decode_response, the inference process
+    decode_request/encode_response.
+    """
+
+    def encode_request(self, req: _ReqT) -> Buffer: ...
+
+    def decode_request(self, data: Buffer) -> _ReqT: ...
+
+    def encode_response(self, resp: _RespT) -> Buffer: ...
+
+    def decode_response(self, data: Buffer) -> _RespT: ...
+
+
+class BinaryWriter:
+    """Append-only writer backed by a growable bytearray.
+
+    getbuffer() returns a memoryview over the written bytes, so the encoded payload can
+    be handed to the IPC channel without an extra copy.
+    """
+
+    def __init__(self, capacity: int = 256) -> None:
+        self._buf = bytearray(capacity)
+        self._pos = 0
+
+    def _reserve(self, size: int) -> None:
+        required = self._pos + size
+        if required > len(self._buf):
+            self._buf.extend(bytes(max(required, len(self._buf) * 2) - len(self._buf)))
+
+    def write_u8(self, v: int) -> None:
+        self._reserve(1)
+        _U8.pack_into(self._buf, self._pos, v)
+        self._pos += 1
+
+    def write_u32(self, v: int) -> None:
+        self._reserve(4)
+        _U32.pack_into(self._buf, self._pos, v)
+        self._pos += 4
+
+    def write_f32(self, v: float) -> None:
+        self._reserve(4)
+        _F32.pack_into(self._buf, self._pos, v)
+        self._pos += 4
+
+    def write_f64(self, v: float) -> None:
+        self._reserve(8)
+        _F64.pack_into(self._buf, self._pos, v)
+        self._pos += 8
+
+    def write_bytes(self, data: Buffer) -> None:
+        mv = memoryview(data).cast("B")
+        self.write_u32(mv.nbytes)
+        self._reserve(mv.nbytes)
+        self._buf[self._pos : self._pos + mv.nbytes] = mv
+        self._pos += mv.nbytes
+
+    def write_string(self, s: str) -> None:
+        self.write_bytes(s.encode("utf-8"))
+
+    def write_int32_array(self, arr: Buffer) -> None:
+        """Write a contiguous buffer of int32 (e.g. an array.array("i") or a np.int32 array)"""
+        mv = memoryview(arr)
+        if mv.itemsize != 4:
+            raise ValueError("write_int32_array expects a buffer of 32-bit integers")
+
+        self.write_bytes(mv)
+
+    def getbuffer(self) -> memoryview:
+        return memoryview(self._buf)[: self._pos]
+
+
+class BinaryReader:
+    """Reads the format produced by BinaryWriter without copying the underlying buffer"""
+
+    def __init__(self, data: Buffer) -> None:
+        self._mv = memoryview(data).cast("B")
+        self._pos = 0
+
+    def read_u8(self) -> int:
+        (v,) = _U8.unpack_from(self._mv, self._pos)
+        self._pos += 1
+        return int(v)
+
+    def read_u32(self) -> int:
+        (v,) = _U32.unpack_from(self._mv, self._pos)
+        self._pos += 4
+        return int(v)
+
+    def read_f32(self) -> float:
+        (v,) = _F32.unpack_from(self._mv, self._pos)
+        self._pos += 4
+        return float(v)
+
+    def read_f64(self) -> float:
+        (v,) = _F64.unpack_from(self._mv, self._pos)
+        self._pos += 8
+        return float(v)
+
+    def read_bytes(self) -> memoryview:
+        length = self.read_u32()
+        if self._pos + length > self._mv.nbytes:
+            raise ValueError("truncated payload")
+
+        mv = self._mv[self._pos : self._pos + length]
+        self._pos += length
+        return mv
+
+    def read_string(self) -> str:
+        return str(self.read_bytes(), "utf-8")
+
+    def read_int32_array(self) -> memoryview:
+        return self.read_bytes().cast("i")
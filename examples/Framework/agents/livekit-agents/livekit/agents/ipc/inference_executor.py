@@ -4,4 +4,4 @@ from typing import Protocol
 
 
 class InferenceExecutor(Protocol):
-    async def do_inference(self, method: str, data: bytes) -> bytes | None: ...
+    async def do_inference(self, method: str, data: bytes | memoryview) -> bytes | None: ...
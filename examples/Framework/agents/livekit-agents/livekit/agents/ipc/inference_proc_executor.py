@@ -75,20 +75,21 @@ class InferenceProcExecutor(SupervisedProc):
                 with contextlib.suppress(asyncio.InvalidStateError):
                     fut.set_result(msg)
 
-    async def do_inference(self, method: str, data: bytes) -> bytes | None:
+    async def do_inference(self, method: str, data: bytes | memoryview) -> bytes | None:
         if not self.started:
             raise RuntimeError("process not started")
 
         request_id = shortuuid("inference_req_")
         fut = asyncio.Future[proto.InferenceResponse]()
 
+        # register the future before sending, batched responses can come back right away
+        self._active_requests[request_id] = fut
+
         await channel.asend_message(
             self._pch,
             proto.InferenceRequest(request_id=request_id, method=method, data=data),
         )
 
-        self._active_requests[request_id] = fut
-
         inf_resp = await fut
         if inf_resp.error:
             raise RuntimeError(f"inference of {method} failed: {inf_resp.error}")
@@ -16,10 +16,10 @@ import time
 from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 
-from ..inference_runner import _RunnersDict
+from ..inference_runner import _InferenceRunner, _RunnersDict
 from ..log import logger
 from ..utils import aio, hw, log_exceptions
-from . import proto
+from . import proto, shm_audio
 from .channel import Message
 from .proc_client import _ProcClient
 
@@ -50,6 +50,9 @@ class _InferenceProc:
         # create an instance of each runner (the ctor must not requires any argument)
         self._runners = {name: runner() for name, runner in runners.items()}
         self._executor = ThreadPoolExecutor(max_workers=math.ceil(hw.get_cpu_monitor().cpu_count()))
+        self._batch_queues: dict[str, asyncio.Queue[proto.InferenceRequest]] = {}
+        # shared memory rings created by the jobs, attached lazily on the first window read
+        self._shm_registry = shm_audio.registry()
 
     def initialize(self, init_req: proto.InitializeRequest, client: _ProcClient) -> None:
         self._client = client
@@ -77,13 +80,49 @@ class _InferenceProc:
 
     @log_exceptions(logger=logger)
     async def entrypoint(self, cch: aio.ChanReceiver[Message]) -> None:
-        async for msg in cch:
-            if isinstance(msg, proto.InferenceRequest):
-                await self._handle_inference_request(msg)
+        batch_tasks: list[asyncio.Task[None]] = []
+        for method, runner in self._runners.items():
+            if runner.MAX_BATCH_SIZE > 1:
+                queue = asyncio.Queue[proto.InferenceRequest]()
+                self._batch_queues[method] = queue
+                batch_tasks.append(
+                    asyncio.create_task(
+                        self._batch_task(runner, queue), name=f"inference_batch_{method}"
+                    )
+                )
 
-            if isinstance(msg, proto.ShutdownRequest):
-                await self._client.send(proto.Exiting(reason=msg.reason))
-                break
+        try:
+            async for msg in cch:
+                if isinstance(msg, proto.InferenceRequest):
+                    if msg.method in (shm_audio.SHM_REGISTER_METHOD, shm_audio.SHM_RELEASE_METHOD):
+                        await self._handle_shm_request(msg)
+                    elif (batch_queue := self._batch_queues.get(msg.method)) is not None:
+                        batch_queue.put_nowait(msg)
+                    else:
+                        await self._handle_inference_request(msg)
+
+                if isinstance(msg, proto.ShutdownRequest):
+                    await self._client.send(proto.Exiting(reason=msg.reason))
+                    break
+        finally:
+            await aio.cancel_and_wait(*batch_tasks)
+            self._shm_registry.close()
+
+    async def _handle_shm_request(self, msg: proto.InferenceRequest) -> None:
+        name = bytes(msg.data).decode()
+        try:
+            if msg.method == shm_audio.SHM_REGISTER_METHOD:
+                self._shm_registry.register(name)
+            else:
+                self._shm_registry.release(name)
+        except Exception as e:
+            logger.exception("error attaching shared audio ring", extra={"ring": name})
+            await self._client.send(
+                proto.InferenceResponse(request_id=msg.request_id, error=str(e))
+            )
+            return
+
+        await self._client.send(proto.InferenceResponse(request_id=msg.request_id))
 
     async def _handle_inference_request(self, msg: proto.InferenceRequest) -> None:
         loop = asyncio.get_running_loop()
@@ -92,8 +131,9 @@ class _InferenceProc:
             logger.warning("unknown inference method", extra={"method": msg.method})
 
         try:
+            # data is always bytes once read from the channel, bytes() doesn't copy it
             data = await loop.run_in_executor(
-                self._executor, self._runners[msg.method].run, msg.data
+                self._executor, self._runners[msg.method].run, bytes(msg.data)
             )
             await self._client.send(proto.InferenceResponse(request_id=msg.request_id, data=data))
         except Exception as e:
@@ -101,3 +141,70 @@ class _InferenceProc:
             await self._client.send(
                 proto.InferenceResponse(request_id=msg.request_id, error=str(e))
             )
+
+    @log_exceptions(logger=logger)
+    async def _batch_task(
+        self, runner: _InferenceRunner, queue: asyncio.Queue[proto.InferenceRequest]
+    ) -> None:
+        loop = asyncio.get_running_loop()
+        method = runner.__class__.INFERENCE_METHOD
+
+        while True:
+            batch = [await queue.get()]
+            first_time = time.perf_counter()
+            deadline = first_time + runner.MAX_BATCH_WAIT
+
+            # collect the requests arriving within the batching window
+            while len(batch) < runner.MAX_BATCH_SIZE:
+                if not queue.empty():
+                    batch.append(queue.get_nowait())
+                    continue
+
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+
+                try:
+                    batch.append(await asyncio.wait_for(queue.get(), timeout=remaining))
+                except asyncio.TimeoutError:
+                    break
+
+            start_time = time.perf_counter()
+            try:
+                results = await loop.run_in_executor(
+                    self._executor, runner.run_batch, [bytes(req.data) for req in batch]
+                )
+                if len(results) != len(batch):
+                    raise RuntimeError(
+                        f"run_batch returned {len(results)} results for {len(batch)} requests"
+                    )
+            except Exception as e:
+                logger.exception("error running batched inference", extra={"method": method})
+                for req in batch:
+                    await self._client.send(
+                        proto.InferenceResponse(request_id=req.request_id, error=str(e))
+                    )
+                continue
+
+            logger.debug(
+                "inference batch done",
+                extra={
+                    "method": method,
+                    "batch_size": len(batch),
+                    "wait_time": round(start_time - first_time, 4),
+                    "elapsed_time": round(time.perf_counter() - start_time, 4),
+                },
+            )
+
+            for req, data in zip(batch, results):
+                if isinstance(data, Exception):
+                    # only this request failed, the rest of the batch is answered normally
+                    logger.error("error running inference", exc_info=data, extra={"method": method})
+                    await self._client.send(
+                        proto.InferenceResponse(request_id=req.request_id, error=str(data))
+                    )
+                    continue
+
+                await self._client.send(
+                    proto.InferenceResponse(request_id=req.request_id, data=data)
+                )
@@ -25,6 +25,11 @@ class JobExecutor(Protocol):
     @property
     def status(self) -> JobStatus: ...
 
+    @property
+    def ping_delay(self) -> float:
+        """Round-trip time in seconds of the last ping, grows while a ping is unanswered"""
+        ...
+
     async def start(self) -> None: ...
 
     async def join(self) -> None: ...
@@ -38,6 +43,28 @@ class JobExecutor(Protocol):
     def logging_extra(self) -> dict[str, Any]: ...
 
 
+class _PingDelay:
+    """tracks the ping/pong round-trip with a job, it includes the lag of the job's event loop"""
+
+    def __init__(self) -> None:
+        self._delay_ms = 0
+        self._unanswered_ts: int | None = None
+
+    def on_ping(self, timestamp: int) -> None:
+        if self._unanswered_ts is None:
+            self._unanswered_ts = timestamp
+
+    def on_pong(self, timestamp: int, now: int) -> int:
+        self._delay_ms = now - timestamp
+        if self._unanswered_ts is not None and self._unanswered_ts <= timestamp:
+            self._unanswered_ts = None
+        return self._delay_ms
+
+    def delay(self, now: int) -> float:
+        pending = now - self._unanswered_ts if self._unanswered_ts is not None else 0
+        return max(self._delay_ms, pending) / 1000
+
+
 class JobStatus(Enum):
     RUNNING = "running"
     FAILED = "failed"
@@ -0,0 +1,356 @@
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import os
+import signal
+import socket
+import struct
+import threading
+import time
+from collections.abc import Awaitable
+from multiprocessing.context import BaseContext
+from typing import Any, Callable
+
+import psutil
+
+from ..job import JobContext, JobProcess
+from ..log import logger
+from ..utils.aio import duplex_unix
+from .inference_executor import InferenceExecutor
+from .job_proc_executor import ProcJobExecutor
+from .job_proc_lazy_main import ForkServerStartArgs, fork_server_main
+from .log_queue import LogQueueListener, LogTransportOptions, capture_log_levels
+
+# control messages between the worker and the fork server: (type, a, b)
+_MSG = struct.Struct("=Iii")
+_MSG_FORK = 1  # worker -> server, a=request id, carries the ipc and log sockets
+_MSG_SHUTDOWN = 2  # worker -> server
+_MSG_READY = 3  # server -> worker, initialize_process_fnc completed
+_MSG_FORKED = 4  # server -> worker, a=request id, b=pid
+_MSG_EXITED = 5  # server -> worker, a=pid, b=exit code
+
+
+class JobForkServer:
+    """Template process that runs initialize_process_fnc once and forks the job processes.
+
+    The forked processes share the memory of the prewarmed template (models, imported modules)
+    copy-on-write, so launching a process no longer re-imports and reloads everything. The
+    template only forks and reaps its children, it must stay single-threaded: the prewarm
+    function must not leave threads running (e.g. a started onnxruntime session is fine,
+    a background thread is not).
+    """
+
+    def __init__(
+        self,
+        *,
+        initialize_process_fnc: Callable[[JobProcess], Any],
+        job_entrypoint_fnc: Callable[[JobContext], Awaitable[None]],
+        session_end_fnc: Callable[[JobContext], Awaitable[None]] | None,
+        initialize_timeout: float,
+        http_proxy: str | None,
+        mp_ctx: BaseContext,
+        log_options: LogTransportOptions | None = None,
+    ) -> None:
+        self._initialize_process_fnc = initialize_process_fnc
+        self._job_entrypoint_fnc = job_entrypoint_fnc
+        self._session_end_fnc = session_end_fnc
+        self._initialize_timeout = initialize_timeout
+        self._http_proxy = http_proxy
+        self._mp_ctx = mp_ctx
+        self._log_options = log_options
+
+        self._send_lock = threading.Lock()
+        self._lock = threading.Lock()
+        self._ready_fut = concurrent.futures.Future[None]()
+        self._fork_futs: dict[int, concurrent.futures.Future[int]] = {}
+        self._pending_children: dict[int, _ForkedProcess] = {}
+        self._children: dict[int, _ForkedProcess] = {}
+        self._next_req_id = 0
+        self._alive = False
+        self._started = False
+
+    @property
+    def alive(self) -> bool:
+        return self._alive
+
+    @property
+    def pid(self) -> int | None:
+        return self._proc.pid if self._started else None
+
+    async def start(self) -> None:
+        """start the fork server and wait for initialize_process_fnc to complete"""
+        if self._started:
+            raise RuntimeError("fork server already started")
+
+        self._started = True
+        self._alive = True
+        self._ctrl, ctrl_cch = socket.socketpair()
+        log_pch, log_cch = socket.socketpair()
+
+        self._log_listener = LogQueueListener(
+            duplex_unix._Duplex.open(log_pch),
+            lambda record: setattr(record, "fork_server", True),
+        )
+        self._log_listener.start()
+
+        self._proc = self._mp_ctx.Process(  # type: ignore
+            target=fork_server_main,
+            args=(
+                ForkServerStartArgs(
+                    initialize_process_fnc=self._initialize_process_fnc,
+                    job_entrypoint_fnc=self._job_entrypoint_fnc,
+                    session_end_fnc=self._session_end_fnc,
+                    http_proxy=self._http_proxy,
+                    ctrl_cch=ctrl_cch,
+                    log_cch=log_cch,
+                    log_levels=capture_log_levels(),
+                    log_options=self._log_options,
+                ),
+            ),
+            name="job_proc_template",
+        )
+
+        loop = asyncio.get_running_loop()
+        start_time = time.perf_counter()
+        await loop.run_in_executor(None, self._proc.start)
+        ctrl_cch.close()
+        log_cch.close()
+
+        self._read_thread = threading.Thread(
+            target=self._read_thread_fnc, name="fork_server_reader", daemon=True
+        )
+        self._read_thread.start()
+
+        try:
+            await asyncio.wait_for(
+                asyncio.wrap_future(self._ready_fut), timeout=self._initialize_timeout
+            )
+        except Exception:
+            await self.aclose()
+            raise
+
+        logger.info(
+            "fork server ready",
+            extra={
+                "pid": self._proc.pid,
+                "elapsed_time": round(time.perf_counter() - start_time, 2),
+            },
+        )
+
+    async def aclose(self) -> None:
+        if not self._started:
+            return
+
+        with self._lock:
+            self._alive = False
+
+        try:
+            self._send(_MSG_SHUTDOWN)
+        except OSError:
+            pass
+
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self._proc.join, 5.0)
+        if self._proc.is_alive():
+            self._proc.kill()
+            await loop.run_in_executor(None, self._proc.join)
+
+        await loop.run_in_executor(None, self._read_thread.join)
+        self._ctrl.close()
+        self._log_listener.stop()
+
+    def fork(self, cch: socket.socket, log_cch: socket.socket, proc: _ForkedProcess) -> int:
+        """fork a job process using the given sockets, blocking, returns the pid of the child"""
+        fut = concurrent.futures.Future[int]()
+        with self._lock:
+            if not self._alive:
+                raise RuntimeError("fork server is not running")
+
+            req_id = self._next_req_id
+            self._next_req_id += 1
+            self._fork_futs[req_id] = fut
+            self._pending_children[req_id] = proc
+
+        try:
+            self._send(_MSG_FORK, req_id, fds=[cch.fileno(), log_cch.fileno()])
+        except OSError as e:
+            with self._lock:
+                self._fork_futs.pop(req_id, None)
+                self._pending_children.pop(req_id, None)
+            raise RuntimeError("fork server is not running") from e
+
+        return fut.result()
+
+    def _send(self, msg_type: int, a: int = 0, b: int = 0, *, fds: list[int] | None = None) -> None:
+        with self._send_lock:
+            socket.send_fds(self._ctrl, [_MSG.pack(msg_type, a, b)], fds or [])
+
+    def _read_thread_fnc(self) -> None:
+        while True:
+            try:
+                data = self._ctrl.recv(_MSG.size, socket.MSG_WAITALL)
+            except OSError:
+                data = b""
+
+            if len(data) < _MSG.size:
+                break
+
+            msg_type, a, b = _MSG.unpack(data)
+            if msg_type == _MSG_READY:
+                self._ready_fut.set_result(None)
+            elif msg_type == _MSG_FORKED:
+                with self._lock:
+                    fut = self._fork_futs.pop(a, None)
+                    proc = self._pending_children.pop(a, None)
+                    if proc is not None:
+                        self._children[b] = proc
+
+                if fut is not None:
+                    fut.set_result(b)
+            elif msg_type == _MSG_EXITED:
+                with self._lock:
+                    child = self._children.pop(a, None)
+
+                if child is not None:
+                    child._set_exitcode(b)
+
+        self._on_closed()
+
+    def _on_closed(self) -> None:
+        with self._lock:
+            if self._alive:
+                logger.error("fork server exited unexpectedly", extra={"pid": self._proc.pid})
+
+            self._alive = False
+            fork_futs, self._fork_futs = self._fork_futs, {}
+            self._pending_children.clear()
+            children, self._children = self._children, {}
+
+        if not self._ready_fut.done():
+            self._ready_fut.set_exception(RuntimeError("fork server failed to initialize"))
+
+        for fut in fork_futs.values():
+            fut.set_exception(RuntimeError("fork server exited"))
+
+        # the children were reparented, their exit code isn't observable anymore
+        for child in children.values():
+            threading.Thread(
+                target=child._wait_orphaned, name="fork_orphan_monitor", daemon=True
+            ).start()
+
+
+class _ForkedProcess:
+    """multiprocessing.Process-like handle of a process forked by the JobForkServer"""
+
+    def __init__(self, server: JobForkServer, cch: socket.socket, log_cch: socket.socket) -> None:
+        self._server = server
+        self._cch = cch
+        self._log_cch = log_cch
+        self._pid: int | None = None
+        self._exitcode: int | None = None
+        self._exited = threading.Event()
+        self._closed = False
+
+    @property
+    def pid(self) -> int | None:
+        return self._pid
+
+    @property
+    def exitcode(self) -> int | None:
+        return self._exitcode
+
+    def start(self) -> None:
+        self._pid = self._server.fork(self._cch, self._log_cch, self)
+
+    def join(self, timeout: float | None = None) -> None:
+        self._exited.wait(timeout)
+
+    def is_alive(self) -> bool:
+        if self._closed:
+            raise ValueError("process object is closed")
+
+        return self._pid is not None and not self._exited.is_set()
+
+    def kill(self) -> None:
+        self._signal(signal.SIGKILL)
+
+    def terminate(self) -> None:
+        self._signal(signal.SIGTERM)
+
+    def close(self) -> None:
+        self._closed = True
+
+    def _signal(self, sig: int) -> None:
+        if self._pid is None or self._exited.is_set():
+            return
+
+        try:
+            os.kill(self._pid, sig)
+        except ProcessLookupError:
+            pass
+
+    def _set_exitcode(self, exitcode: int) -> None:
+        self._exitcode = exitcode
+        self._exited.set()
+
+    def _wait_orphaned(self) -> None:
+        assert self._pid is not None
+        while psutil.pid_exists(self._pid):
+            time.sleep(0.5)
+
+        self._set_exitcode(1)
+
+
+class ForkJobExecutor(ProcJobExecutor):
+    """ProcJobExecutor whose process is forked from a prewarmed JobForkServer.
+
+    initialize_process_fnc already ran in the fork server, the job process only answers the
+    initialization handshake. user_arguments are not supported, the prewarmed JobProcess is shared
+    by every forked process.
+    """
+
+    def __init__(
+        self,
+        *,
+        fork_server: JobForkServer,
+        initialize_process_fnc: Callable[[JobProcess], Any],
+        job_entrypoint_fnc: Callable[[JobContext], Awaitable[None]],
+        session_end_fnc: Callable[[JobContext], Awaitable[None]] | None,
+        inference_executor: InferenceExecutor | None,
+        initialize_timeout: float,
+        close_timeout: float,
+        memory_warn_mb: float,
+        memory_limit_mb: float,
+        ping_interval: float,
+        ping_timeout: float,
+        high_ping_threshold: float,
+        http_proxy: str | None,
+        mp_ctx: BaseContext,
+        loop: asyncio.AbstractEventLoop,
+    ) -> None:
+        super().__init__(
+            initialize_process_fnc=initialize_process_fnc,
+            job_entrypoint_fnc=job_entrypoint_fnc,
+            session_end_fnc=session_end_fnc,
+            inference_executor=inference_executor,
+            initialize_timeout=initialize_timeout,
+            close_timeout=close_timeout,
+            memory_warn_mb=memory_warn_mb,
+            memory_limit_mb=memory_limit_mb,
+            ping_interval=ping_interval,
+            ping_timeout=ping_timeout,
+            high_ping_threshold=high_ping_threshold,
+            http_proxy=http_proxy,
+            mp_ctx=mp_ctx,
+            loop=loop,
+        )
+        self._fork_server = fork_server
+
+    def _create_process(self, cch: socket.socket, log_cch: socket.socket) -> _ForkedProcess:
+        return _ForkedProcess(self._fork_server, cch, log_cch)
+
+    def logging_extra(self) -> dict[str, Any]:
+        extra = super().logging_extra()
+        extra["fork_server_pid"] = self._fork_server.pid
+        return extra
@@ -1,7 +1,6 @@
 from __future__ import annotations
 
 import asyncio
-import multiprocessing as mp
 import socket
 from collections.abc import Awaitable
 from multiprocessing.context import BaseContext
@@ -15,7 +14,8 @@ from . import channel, proto
 from .inference_executor import InferenceExecutor
 from .job_executor import JobStatus
 from .job_proc_lazy_main import ProcStartArgs, proc_main
-from .supervised_proc import SupervisedProc
+from .log_queue import LogTransportOptions, capture_log_levels
+from .supervised_proc import SupervisedProc, _ProcessHandle
 
 
 class ProcJobExecutor(SupervisedProc):
@@ -36,6 +36,7 @@ class ProcJobExecutor(SupervisedProc):
         http_proxy: str | None,
         mp_ctx: BaseContext,
         loop: asyncio.AbstractEventLoop,
+        log_options: LogTransportOptions | None = None,
     ) -> None:
         super().__init__(
             initialize_timeout=initialize_timeout,
@@ -57,6 +58,7 @@ class ProcJobExecutor(SupervisedProc):
         self._job_entrypoint_fnc = job_entrypoint_fnc
         self._session_end_fnc = session_end_fnc
         self._inference_executor = inference_executor
+        self._log_options = log_options
         self._inference_tasks: list[asyncio.Task[None]] = []
         self._id = shortuuid("PCEXEC_")
 
@@ -83,7 +85,7 @@ class ProcJobExecutor(SupervisedProc):
     def running_job(self) -> RunningJobInfo | None:
         return self._running_job
 
-    def _create_process(self, cch: socket.socket, log_cch: socket.socket) -> mp.Process:
+    def _create_process(self, cch: socket.socket, log_cch: socket.socket) -> _ProcessHandle:
         proc_args = ProcStartArgs(
             initialize_process_fnc=self._initialize_process_fnc,
             job_entrypoint_fnc=self._job_entrypoint_fnc,
@@ -91,6 +93,8 @@ class ProcJobExecutor(SupervisedProc):
             log_cch=log_cch,
             mp_cch=cch,
             user_arguments=self._user_args,
+            log_levels=capture_log_levels(),
+            log_options=self._log_options,
         )
 
         return self._mp_ctx.Process(  # type: ignore
@@ -13,7 +13,7 @@ import asyncio
 import contextlib
 import socket
 from collections.abc import Awaitable
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Any, Callable, cast
 
 from opentelemetry import trace
@@ -26,6 +26,7 @@ from ..telemetry import trace_types, tracer
 from ..utils import aio, http_context, log_exceptions, shortuuid
 from .channel import Message
 from .inference_executor import InferenceExecutor
+from .log_queue import LogTransportOptions, apply_log_levels
 from .proc_client import _ProcClient
 from .proto import (
     Exiting,
@@ -45,30 +46,41 @@ class ProcStartArgs:
     mp_cch: socket.socket
     log_cch: socket.socket
     user_arguments: Any | None = None
+    log_levels: dict[str, int] = field(default_factory=dict)
+    log_options: LogTransportOptions | None = None
 
 
 def proc_main(args: ProcStartArgs) -> None:
+    apply_log_levels(args.log_levels)
+    job_proc = _JobProc(
+        args.initialize_process_fnc,
+        args.job_entrypoint_fnc,
+        args.session_end_fnc,
+        JobExecutorType.PROCESS,
+        args.user_arguments,
+    )
+    _run_job_proc(job_proc, mp_cch=args.mp_cch, log_cch=args.log_cch, log_options=args.log_options)
+
+
+def _run_job_proc(
+    job_proc: _JobProc,
+    *,
+    mp_cch: socket.socket,
+    log_cch: socket.socket,
+    log_options: LogTransportOptions | None,
+) -> None:
     import logging
 
     from .log_queue import LogQueueHandler
     from .proc_client import _ProcClient
 
     root_logger = logging.getLogger()
-    root_logger.setLevel(logging.NOTSET)
 
-    log_cch = aio.duplex_unix._Duplex.open(args.log_cch)
-    log_handler = LogQueueHandler(log_cch)
+    log_duplex = aio.duplex_unix._Duplex.open(log_cch)
+    log_handler = LogQueueHandler(log_duplex, log_options)
     root_logger.addHandler(log_handler)
 
-    job_proc = _JobProc(
-        args.initialize_process_fnc,
-        args.job_entrypoint_fnc,
-        args.session_end_fnc,
-        JobExecutorType.PROCESS,
-        args.user_arguments,
-    )
-
-    client = _ProcClient(args.mp_cch, args.log_cch, job_proc.initialize, job_proc.entrypoint)
+    client = _ProcClient(mp_cch, log_cch, job_proc.initialize, job_proc.entrypoint)
     try:
         client.initialize()
     except Exception:
@@ -114,21 +126,166 @@ def proc_main(args: ProcStartArgs) -> None:
     log_handler.close()
 
 
+@dataclass
+class ForkServerStartArgs:
+    initialize_process_fnc: Callable[[JobProcess], Any]
+    job_entrypoint_fnc: Callable[[JobContext], Any]
+    session_end_fnc: Callable[[JobContext], Awaitable[None]] | None
+    http_proxy: str | None
+    ctrl_cch: socket.socket
+    log_cch: socket.socket
+    log_levels: dict[str, int] = field(default_factory=dict)
+    log_options: LogTransportOptions | None = None
+
+
+def fork_server_main(args: ForkServerStartArgs) -> None:
+    """main function of the template process used by the ForkJobExecutor
+
+    The process runs initialize_process_fnc once, then forks a job process each time the worker
+    sends it a pair of sockets. The forked processes share the prewarmed memory copy-on-write.
+    """
+    import logging
+    import os
+    import select
+    import signal
+
+    from . import job_fork_executor as fork_proto
+    from .log_queue import BlockingLogQueueHandler
+
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_IGN)
+
+    # the template stays single-threaded so it can be forked safely, logs are sent synchronously
+    apply_log_levels(args.log_levels)
+    root_logger = logging.getLogger()
+    log_handler = BlockingLogQueueHandler(aio.duplex_unix._Duplex.open(args.log_cch))
+    root_logger.addHandler(log_handler)
+
+    job_proc = JobProcess(
+        executor_type=JobExecutorType.PROCESS,
+        user_arguments=None,
+        http_proxy=args.http_proxy,
+    )
+    try:
+        args.initialize_process_fnc(job_proc)
+    except Exception:
+        logger.exception("error while prewarming the fork server")
+        raise SystemExit(1) from None
+
+    ctrl = args.ctrl_cch
+    ctrl.setblocking(True)
+
+    # SIGCHLD wakes up the select loop to report the exit of the forked processes
+    wakeup_r, wakeup_w = os.pipe()
+    os.set_blocking(wakeup_w, False)
+    signal.set_wakeup_fd(wakeup_w)
+    signal.signal(signal.SIGCHLD, lambda *_: None)
+
+    def _send(msg_type: int, a: int = 0, b: int = 0) -> None:
+        ctrl.sendall(fork_proto._MSG.pack(msg_type, a, b))
+
+    def _reap() -> None:
+        while True:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+
+            if pid == 0:
+                return
+
+            _send(fork_proto._MSG_EXITED, pid, os.waitstatus_to_exitcode(status))
+
+    _send(fork_proto._MSG_READY)
+    try:
+        while True:
+            readable, _, _ = select.select([ctrl.fileno(), wakeup_r], [], [], 1.0)
+            if wakeup_r in readable:
+                os.read(wakeup_r, 4096)
+
+            _reap()
+
+            if ctrl.fileno() not in readable:
+                continue
+
+            data, fds, _, _ = socket.recv_fds(ctrl, fork_proto._MSG.size, 2, socket.MSG_WAITALL)
+            if not data:
+                break  # the worker closed the control channel
+
+            msg_type, req_id, _ = fork_proto._MSG.unpack(data)
+            if msg_type == fork_proto._MSG_SHUTDOWN:
+                break
+
+            if msg_type != fork_proto._MSG_FORK or len(fds) != 2:
+                for fd in fds:
+                    os.close(fd)
+                continue
+
+            pid = os.fork()
+            if pid == 0:
+                # never returns
+                signal.set_wakeup_fd(-1)
+                signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+                os.close(wakeup_r)
+                os.close(wakeup_w)
+                ctrl.close()
+                # the template's log socket must not outlive the template, its EOF is what
+                # tells the worker that the template exited
+                root_logger.removeHandler(log_handler)
+                log_handler.close()
+                _forked_job_main(args, job_proc, fds[0], fds[1])
+
+            for fd in fds:
+                os.close(fd)
+
+            _send(fork_proto._MSG_FORKED, req_id, pid)
+    except (BrokenPipeError, ConnectionResetError):
+        pass  # the worker is gone
+
+
+def _forked_job_main(
+    args: ForkServerStartArgs, job_proc: JobProcess, mp_fd: int, log_fd: int
+) -> None:
+    import os
+    import sys
+
+    exitcode = 0
+    try:
+        _run_job_proc(
+            _JobProc(
+                args.initialize_process_fnc,
+                args.job_entrypoint_fnc,
+                args.session_end_fnc,
+                JobExecutorType.PROCESS,
+                prewarmed_proc=job_proc,
+            ),
+            mp_cch=socket.socket(fileno=mp_fd),
+            log_cch=socket.socket(fileno=log_fd),
+            log_options=args.log_options,
+        )
+    except BaseException:
+        exitcode = 1
+    finally:
+        sys.stdout.flush()
+        sys.stderr.flush()
+        # skip the interpreter/multiprocessing teardown inherited from the template
+        os._exit(exitcode)
+
+
 class _InfClient(InferenceExecutor):
     def __init__(self, proc_client: _ProcClient) -> None:
         self._client = proc_client
         self._active_requests: dict[str, asyncio.Future[InferenceResponse]] = {}
 
-    async def do_inference(self, method: str, data: bytes) -> bytes | None:
+    async def do_inference(self, method: str, data: bytes | memoryview) -> bytes | None:
         request_id = shortuuid("inference_job_")
         fut = asyncio.Future[InferenceResponse]()
+        self._active_requests[request_id] = fut
 
         await self._client.send(
             InferenceRequest(request_id=request_id, method=method, data=data),
         )
 
-        self._active_requests[request_id] = fut
-
         inf_resp = await fut
         if inf_resp.error:
             raise RuntimeError(f"inference of {method} failed: {inf_resp.error}")
@@ -159,9 +316,12 @@ class _JobProc:
         session_end_fnc: Callable[[JobContext], Awaitable[None]] | None,
         executor_type: JobExecutorType,
         user_arguments: Any | None = None,
+        *,
+        prewarmed_proc: JobProcess | None = None,
     ) -> None:
         self._executor_type = executor_type
         self._user_arguments = user_arguments
+        self._prewarmed_proc = prewarmed_proc
         self._initialize_process_fnc = initialize_process_fnc
         self._job_entrypoint_fnc = job_entrypoint_fnc
         self._session_end_fnc = session_end_fnc
@@ -178,6 +338,11 @@ class _JobProc:
     def initialize(self, init_req: InitializeRequest, client: _ProcClient) -> None:
         self._client = client
         self._inf_client = _InfClient(client)
+        if self._prewarmed_proc is not None:
+            # initialize_process_fnc already ran in the fork server
+            self._job_proc = self._prewarmed_proc
+            return
+
         self._job_proc = JobProcess(
             executor_type=self._executor_type,
             user_arguments=self._user_arguments,
@@ -15,7 +15,7 @@ from ..log import logger
 from ..utils.aio import duplex_unix
 from . import channel, job_proc_lazy_main, proto
 from .inference_executor import InferenceExecutor
-from .job_executor import JobStatus
+from .job_executor import JobStatus, _PingDelay
 
 
 @dataclass
@@ -69,6 +69,7 @@ class ThreadJobExecutor:
         self._inference_executor = inference_executor
         self._inference_tasks: list[asyncio.Task[None]] = []
         self._id = utils.shortuuid("THEXEC_")
+        self._ping_delay = _PingDelay()
 
     @property
     def id(self) -> str:
@@ -97,6 +98,10 @@ class ThreadJobExecutor:
     def running_job(self) -> RunningJobInfo | None:
         return self._running_job
 
+    @property
+    def ping_delay(self) -> float:
+        return self._ping_delay.delay(utils.time_ms())
+
     async def start(self) -> None:
         if self.started:
             raise RuntimeError("runner already started")
@@ -271,7 +276,7 @@ class ThreadJobExecutor:
                 break
 
             if isinstance(msg, proto.PongResponse):
-                delay = utils.time_ms() - msg.timestamp
+                delay = self._ping_delay.on_pong(msg.timestamp, utils.time_ms())
                 if delay > self._opts.high_ping_threshold * 1000:
                     logger.warning(
                         "job executor is unresponsive",
@@ -289,8 +294,10 @@ class ThreadJobExecutor:
         ping_interval = utils.aio.interval(self._opts.ping_interval)
         while True:
             await ping_interval.tick()
+            timestamp = utils.time_ms()
+            self._ping_delay.on_ping(timestamp)
             try:
-                await channel.asend_message(self._pch, proto.PingRequest(timestamp=utils.time_ms()))
+                await channel.asend_message(self._pch, proto.PingRequest(timestamp=timestamp))
             except utils.aio.duplex_unix.DuplexClosed:
                 break
 
@@ -1,16 +1,73 @@
 from __future__ import annotations
 
-import copy
+import json
 import logging
-import pickle
-import queue
+import os
+import struct
 import sys
 import threading
-from typing import Callable, Optional
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Callable
 
 from .. import utils
+from ..log import logger
 from ..utils.aio import duplex_unix
 
+# batch: record count, records dropped by the child since the previous batch, child pid
+_BATCH_HEADER = struct.Struct("!III")
+# record: levelno, created, relativeCreated, thread, lineno, then the length of each of the
+# _RECORD_STRINGS and of the JSON extras
+_RECORD_STRINGS = ("name", "msg", "threadName", "processName", "taskName", "pathname", "funcName")
+_RECORD_HEADER = struct.Struct("!HddQI" + "I" * (len(_RECORD_STRINGS) + 1))
+
+# attributes every LogRecord has, the others were passed with `extra=`
+_RECORD_ATTRS = frozenset(logging.makeLogRecord({}).__dict__) | {"message", "asctime", "taskName"}
+# the attributes of the records received from a job process that aren't sent: args, exc_info
+# and stack_info are already formatted into msg. the others are overwritten for each record,
+# the defaults of the worker (e.g. its thread) must not leak into them
+_RECORD_DEFAULTS = {
+    **logging.makeLogRecord({}).__dict__,
+    "thread": None,
+    "threadName": None,
+    "processName": None,
+    "relativeCreated": 0.0,
+}
+# e.g. the "websocket" attribute added by the websockets library is sent as its repr
+_EXTRA_ENCODER = json.JSONEncoder(default=repr, separators=(",", ":"))
+
+
+@dataclass
+class LogTransportOptions:
+    flush_interval: float = 0.1
+    """Seconds the records of a job process are buffered before being sent to the worker."""
+    max_batch_size: int = 256
+    """Records sent at once, a full batch is sent without waiting for the flush interval."""
+    max_queued_records: int | None = None
+    """Records a job process keeps while the worker is falling behind, the oldest are dropped
+    above it. None keeps every record.
+
+    The records are re-created in the worker with the attributes of the job's record, the
+    message being already formatted: args, exc_info, exc_text and stack_info aren't sent (the
+    exception and the stack are part of msg), filename and module are derived from pathname."""
+
+
+def capture_log_levels() -> dict[str, int]:
+    """Levels of the root logger (as "") and of the loggers with an explicit level"""
+    levels = {"": logging.getLogger().level}
+    for name, lger in logging.Logger.manager.loggerDict.items():
+        if isinstance(lger, logging.Logger) and lger.level != logging.NOTSET:
+            levels[name] = lger.level
+
+    return levels
+
+
+def apply_log_levels(levels: dict[str, int]) -> None:
+    """Use the levels of the worker in a job process, the records the worker would filter out
+    aren't created"""
+    for name, level in levels.items():
+        logging.getLogger(name or None).setLevel(level)
+
 
 class LogQueueListener:
     def __init__(
@@ -21,6 +78,12 @@ class LogQueueListener:
         self._thread: threading.Thread | None = None
         self._duplex = duplex
         self._prepare_fnc = prepare_fnc
+        self._dropped_records = 0
+
+    @property
+    def dropped_records(self) -> int:
+        """Records dropped by the process because the listener was falling behind"""
+        return self._dropped_records
 
     def start(self) -> None:
         self._thread = threading.Thread(target=self._monitor, name="ipc_log_listener")
@@ -50,17 +113,34 @@ class LogQueueListener:
             except utils.aio.duplex_unix.DuplexClosed:
                 break
 
-            record = pickle.loads(data)
-            self.handle(record)
+            records, dropped, pid = _deserialize_batch(data)
+            if dropped:
+                self._dropped_records += dropped
+                logger.warning(
+                    "process logs are dropped, the worker is falling behind",
+                    extra={"pid": pid, "dropped_records": dropped},
+                )
+
+            for record in records:
+                self.handle(record)
 
 
 class LogQueueHandler(logging.Handler):
-    _sentinal = None
+    """Sends the records to the LogQueueListener of the worker in batches, from a thread"""
 
-    def __init__(self, duplex: utils.aio.duplex_unix._Duplex) -> None:
+    def __init__(
+        self,
+        duplex: utils.aio.duplex_unix._Duplex,
+        options: LogTransportOptions | None = None,
+    ) -> None:
         super().__init__()
         self._duplex = duplex
-        self._send_q = queue.SimpleQueue[Optional[bytes]]()
+        self._opts = options or LogTransportOptions()
+        self._cond = threading.Condition(threading.Lock())
+        self._records: deque[bytes] = deque()
+        self._dropped = 0
+        self._dropped_records = 0
+        self._closing = False
         self._send_thread = threading.Thread(target=self._forward_logs, name="ipc_log_forwarder")
         self._send_thread.start()
 
@@ -68,15 +148,35 @@ class LogQueueHandler(logging.Handler):
     def thread(self) -> threading.Thread:
         return self._send_thread
 
+    @property
+    def dropped_records(self) -> int:
+        """Records dropped since the handler was created"""
+        return self._dropped_records
+
     def _forward_logs(self) -> None:
+        opts = self._opts
         while True:
-            serialized_record = self._send_q.get()
-            if serialized_record is None:
-                break
+            with self._cond:
+                self._cond.wait_for(lambda: self._records or self._dropped or self._closing)
+                if not self._closing and len(self._records) < opts.max_batch_size:
+                    # gather the records emitted during the flush interval
+                    self._cond.wait_for(
+                        lambda: len(self._records) >= opts.max_batch_size or self._closing,
+                        timeout=opts.flush_interval,
+                    )
 
-            try:
-                self._duplex.send_bytes(serialized_record)
-            except duplex_unix.DuplexClosed:
+                n = min(len(self._records), opts.max_batch_size)
+                batch = [self._records.popleft() for _ in range(n)]
+                dropped, self._dropped = self._dropped, 0
+                done = self._closing and not self._records
+
+            if batch or dropped:
+                try:
+                    self._duplex.send_bytes(_serialize_batch(batch, dropped))
+                except duplex_unix.DuplexClosed:
+                    break
+
+            if done:
                 break
 
         self._duplex.close()
@@ -87,26 +187,134 @@ class LogQueueHandler(logging.Handler):
             if sys.is_finalizing():
                 return
 
-            # from https://github.com/python/cpython/blob/91b7f2e7f6593acefda4fa860250dd87d6f849bf/Lib/logging/handlers.py#L1453
-            msg = self.format(record)
-            record = copy.copy(record)
-            record.message = msg
-            record.msg = msg
-            record.args = None
-            record.exc_info = None
-            record.exc_text = None
-            record.stack_info = None
+            data = _serialize_record(self, record)
+            max_queued = self._opts.max_queued_records
+            with self._cond:
+                if max_queued is not None and len(self._records) >= max_queued:
+                    self._records.popleft()
+                    self._dropped += 1
+                    self._dropped_records += 1
+
+                self._records.append(data)
+                n_records = len(self._records)
+                if n_records == 1 or n_records >= self._opts.max_batch_size:
+                    self._cond.notify()
+
+        except Exception:
+            self.handleError(record)
+
+    def close(self) -> None:
+        super().close()
+        with self._cond:
+            self._closing = True
+            self._cond.notify()
 
-            # https://websockets.readthedocs.io/en/stable/topics/logging.html#logging-to-json
-            # webosckets library add "websocket" attribute to log records, which is not pickleable
-            if hasattr(record, "websocket"):
-                record.websocket = None
+        if threading.current_thread() is not self._send_thread:
+            # flush, the process may exit right after (e.g. os._exit in a forked job)
+            self._send_thread.join(timeout=2.0)
 
-            self._send_q.put_nowait(pickle.dumps(record))
 
+class BlockingLogQueueHandler(logging.Handler):
+    """Sends the records from the logging thread, for processes that must stay single-threaded
+    (e.g. the template process forking the jobs)"""
+
+    def __init__(self, duplex: utils.aio.duplex_unix._Duplex) -> None:
+        super().__init__()
+        self._duplex = duplex
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            if sys.is_finalizing():
+                return
+
+            self._duplex.send_bytes(_serialize_batch([_serialize_record(self, record)], 0))
+        except duplex_unix.DuplexClosed:
+            pass
         except Exception:
             self.handleError(record)
 
     def close(self) -> None:
         super().close()
-        self._send_q.put_nowait(self._sentinal)
+        self._duplex.close()
+
+
+def _serialize_record(handler: logging.Handler, record: logging.LogRecord) -> bytes:
+    # the formatted message includes the exception and the stack
+    strings = [
+        record.name.encode("utf-8"),
+        handler.format(record).encode("utf-8"),
+    ]
+    for attr in _RECORD_STRINGS[2:]:
+        value = getattr(record, attr, None)
+        strings.append(value.encode("utf-8") if value else b"")
+
+    extra = {
+        key: value
+        for key, value in record.__dict__.items()
+        if key not in _RECORD_ATTRS and not key.startswith("_")
+    }
+    extra_data = _EXTRA_ENCODER.encode(extra).encode("utf-8") if extra else b""
+
+    return (
+        _RECORD_HEADER.pack(
+            record.levelno,
+            record.created,
+            record.relativeCreated,
+            record.thread or 0,
+            record.lineno,
+            *(len(string) for string in strings),
+            len(extra_data),
+        )
+        + b"".join(strings)
+        + extra_data
+    )
+
+
+def _serialize_batch(records: list[bytes], dropped: int) -> bytes:
+    return _BATCH_HEADER.pack(len(records), dropped, os.getpid()) + b"".join(records)
+
+
+def _deserialize_batch(data: bytes) -> tuple[list[logging.LogRecord], int, int]:
+    n_records, dropped, pid = _BATCH_HEADER.unpack_from(data)
+    offset = _BATCH_HEADER.size
+    records = []
+    for _ in range(n_records):
+        levelno, created, relative_created, thread, lineno, *lengths = _RECORD_HEADER.unpack_from(
+            data, offset
+        )
+        offset += _RECORD_HEADER.size
+        strings: dict[str, str | None] = {}
+        for attr, length in zip(_RECORD_STRINGS, lengths):
+            strings[attr] = data[offset : offset + length].decode("utf-8") if length else None
+            offset += length
+
+        # cheaper than makeLogRecord, which builds a full LogRecord before updating it
+        record = logging.LogRecord.__new__(logging.LogRecord)
+        attrs: dict[str, Any] = record.__dict__
+        attrs.update(_RECORD_DEFAULTS)
+        extra_len = lengths[-1]
+        if extra_len:
+            attrs.update(json.loads(data[offset : offset + extra_len]))
+            offset += extra_len
+
+        pathname = strings["pathname"] or ""
+        filename = os.path.basename(pathname)
+        attrs.update(strings)
+        attrs.update(
+            name=strings["name"] or "",
+            msg=strings["msg"] or "",
+            levelno=levelno,
+            levelname=logging.getLevelName(levelno),
+            pathname=pathname,
+            filename=filename,
+            module=os.path.splitext(filename)[0],
+            lineno=lineno,
+            created=created,
+            msecs=(created - int(created)) * 1000,
+            relativeCreated=relative_created,
+            thread=thread or None,
+            process=pid,
+        )
+        records.append(record)
+
+    return records, dropped, pid
@@ -2,6 +2,8 @@ from __future__ import annotations
 
 import asyncio
 import math
+import os
+import time
 from collections.abc import Awaitable
 from multiprocessing.context import BaseContext
 from typing import Any, Callable, Literal
@@ -9,10 +11,13 @@ from typing import Any, Callable, Literal
 from .. import utils
 from ..job import JobContext, JobExecutorType, JobProcess, RunningJobInfo
 from ..log import logger
+from ..telemetry import metrics
 from ..utils import aio
 from ..utils.hw.cpu import get_cpu_monitor
-from . import inference_executor, job_proc_executor, job_thread_executor
+from . import inference_executor, job_fork_executor, job_proc_executor, job_thread_executor
+from .idle_policy import IdleProcessPolicy, StaticIdlePolicy
 from .job_executor import JobExecutor
+from .log_queue import LogTransportOptions
 
 EventTypes = Literal[
     "process_created",
@@ -42,8 +47,13 @@ class ProcPool(utils.EventEmitter[EventTypes]):
         memory_limit_mb: float,
         http_proxy: str | None,
         loop: asyncio.AbstractEventLoop,
+        idle_policy: IdleProcessPolicy | None = None,
+        log_options: LogTransportOptions | None = None,
     ) -> None:
         super().__init__()
+        if job_executor_type == JobExecutorType.FORK and not hasattr(os, "fork"):
+            raise ValueError("the fork job executor is only supported on POSIX platforms")
+
         self._job_executor_type = job_executor_type
         self._mp_ctx = mp_ctx
         self._initialize_process_fnc = initialize_process_fnc
@@ -57,7 +67,9 @@ class ProcPool(utils.EventEmitter[EventTypes]):
         self._memory_warn_mb = memory_warn_mb
         self._default_num_idle_processes = num_idle_processes
         self._http_proxy = http_proxy
-        self._target_idle_processes = num_idle_processes
+        self._log_options = log_options
+        self._idle_policy = idle_policy or StaticIdlePolicy()
+        self._target_idle_processes = self._idle_policy.max_idle_processes(num_idle_processes)
 
         self._init_sem = asyncio.Semaphore(MAX_CONCURRENT_INITIALIZATIONS)
         self._warmed_proc_queue = asyncio.Queue[JobExecutor]()
@@ -68,8 +80,12 @@ class ProcPool(utils.EventEmitter[EventTypes]):
         self._closed = False
 
         self._idle_ready = asyncio.Event()
+        self._idle_target = num_idle_processes
         self._jobs_waiting_for_process = 0
 
+        self._fork_server: job_fork_executor.JobForkServer | None = None
+        self._fork_server_lock = asyncio.Lock()
+
     @property
     def processes(self) -> list[JobExecutor]:
         return self._executors
@@ -99,6 +115,8 @@ class ProcPool(utils.EventEmitter[EventTypes]):
         await aio.cancel_and_wait(self._main_atask)
 
     async def launch_job(self, info: RunningJobInfo) -> None:
+        requested_at = time.monotonic()
+        self._idle_policy.on_job_requested(now=requested_at)
         self._jobs_waiting_for_process += 1
         if (
             self._warmed_proc_queue.empty()
@@ -111,19 +129,26 @@ class ProcPool(utils.EventEmitter[EventTypes]):
 
         proc = await self._warmed_proc_queue.get()
         self._jobs_waiting_for_process -= 1
+        metrics.job_waited_for_process(time_elapsed=time.monotonic() - requested_at)
 
         await proc.launch_job(info)
         self.emit("process_job_launched", proc)
 
     def set_target_idle_processes(self, num_idle_processes: int) -> None:
+        """Load based limit of idle processes, the idle policy decides the target within it"""
         self._target_idle_processes = num_idle_processes
 
     @property
     def target_idle_processes(self) -> int:
         return self._target_idle_processes
 
+    @property
+    def max_idle_processes(self) -> int:
+        return self._idle_policy.max_idle_processes(self._default_num_idle_processes)
+
     @utils.log_exceptions(logger=logger)
     async def _proc_spawn_task(self) -> None:
+        spawned_at = time.monotonic()
         proc: JobExecutor
         if self._job_executor_type == JobExecutorType.THREAD:
             proc = job_thread_executor.ThreadJobExecutor(
@@ -154,6 +179,25 @@ class ProcPool(utils.EventEmitter[EventTypes]):
                 memory_warn_mb=self._memory_warn_mb,
                 memory_limit_mb=self._memory_limit_mb,
                 http_proxy=self._http_proxy,
+                log_options=self._log_options,
+            )
+        elif self._job_executor_type == JobExecutorType.FORK:
+            proc = job_fork_executor.ForkJobExecutor(
+                fork_server=await self._ensure_fork_server(),
+                initialize_process_fnc=self._initialize_process_fnc,
+                job_entrypoint_fnc=self._job_entrypoint_fnc,
+                session_end_fnc=self._session_end_fnc,
+                initialize_timeout=self._initialize_timeout,
+                close_timeout=self._close_timeout,
+                inference_executor=self._inf_executor,
+                mp_ctx=self._mp_ctx,
+                loop=self._loop,
+                ping_interval=2.5,
+                ping_timeout=60,
+                high_ping_threshold=0.5,
+                memory_warn_mb=self._memory_warn_mb,
+                memory_limit_mb=self._memory_limit_mb,
+                http_proxy=self._http_proxy,
             )
         else:
             raise ValueError(f"unsupported job executor: {self._job_executor_type}")
@@ -173,8 +217,11 @@ class ProcPool(utils.EventEmitter[EventTypes]):
                 # neither be used to launch jobs
 
                 self.emit("process_ready", proc)
+                self._idle_policy.on_process_ready(launch_time=time.monotonic() - spawned_at)
                 self._warmed_proc_queue.put_nowait(proc)
-                if self._warmed_proc_queue.qsize() >= self._default_num_idle_processes:
+                if self._warmed_proc_queue.qsize() >= min(
+                    self._default_num_idle_processes, self._idle_target
+                ):
                     self._idle_ready.set()
             except Exception:
                 logger.exception("error initializing process", extra=proc.logging_extra())
@@ -183,6 +230,27 @@ class ProcPool(utils.EventEmitter[EventTypes]):
         self._monitor_tasks.add(monitor_task)
         monitor_task.add_done_callback(self._monitor_tasks.discard)
 
+    async def _ensure_fork_server(self) -> job_fork_executor.JobForkServer:
+        """start the fork server, or restart it if it died"""
+        async with self._fork_server_lock:
+            if self._fork_server is not None and self._fork_server.alive:
+                return self._fork_server
+
+            if self._fork_server is not None:
+                await self._fork_server.aclose()
+
+            self._fork_server = job_fork_executor.JobForkServer(
+                initialize_process_fnc=self._initialize_process_fnc,
+                job_entrypoint_fnc=self._job_entrypoint_fnc,
+                session_end_fnc=self._session_end_fnc,
+                initialize_timeout=self._initialize_timeout,
+                http_proxy=self._http_proxy,
+                mp_ctx=self._mp_ctx,
+                log_options=self._log_options,
+            )
+            await self._fork_server.start()
+            return self._fork_server
+
     @utils.log_exceptions(logger=logger)
     async def _monitor_process_task(self, proc: JobExecutor) -> None:
         try:
@@ -195,11 +263,18 @@ class ProcPool(utils.EventEmitter[EventTypes]):
     async def _main_task(self) -> None:
         try:
             while not self._closed:
-                current_pending = self._warmed_proc_queue.qsize() + len(self._spawn_tasks)
-                to_spawn = (
-                    min(self._target_idle_processes, self._default_num_idle_processes)
-                    - current_pending
+                idle_target = self._idle_policy.target_idle_processes(
+                    self._default_num_idle_processes, now=time.monotonic()
                 )
+                if idle_target != self._idle_target:
+                    logger.debug(
+                        "idle process target updated",
+                        extra={"previous": self._idle_target, "target": idle_target},
+                    )
+                    self._idle_target = idle_target
+
+                current_pending = self._warmed_proc_queue.qsize() + len(self._spawn_tasks)
+                to_spawn = min(self._target_idle_processes, idle_target) - current_pending
 
                 for _ in range(to_spawn):
                     task = asyncio.create_task(self._proc_spawn_task())
@@ -211,3 +286,5 @@ class ProcPool(utils.EventEmitter[EventTypes]):
             await asyncio.gather(*[proc.aclose() for proc in self._executors])
             await asyncio.gather(*self._spawn_tasks)
             await asyncio.gather(*self._monitor_tasks)
+            if self._fork_server is not None:
+                await self._fork_server.aclose()
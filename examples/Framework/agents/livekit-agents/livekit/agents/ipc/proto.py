@@ -155,7 +155,8 @@ class InferenceRequest:
     MSG_ID: ClassVar[int] = 7
     method: str = ""
     request_id: str = ""
-    data: bytes = b""
+    # the sender may pass a memoryview (e.g. from ipc.inference_codec.BinaryWriter) to avoid a copy
+    data: bytes | memoryview = b""
 
     def write(self, b: io.BytesIO) -> None:
         channel.write_string(b, self.method)
@@ -0,0 +1,225 @@
+from __future__ import annotations
+
+import contextlib
+import struct
+import threading
+from dataclasses import dataclass
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+
+from .inference_codec import BinaryReader, BinaryWriter, Buffer
+from .inference_executor import InferenceExecutor
+
+# inference methods reserved to attach/release a ring in the inference process
+SHM_REGISTER_METHOD = "lk_shm_audio_register"
+SHM_RELEASE_METHOD = "lk_shm_audio_release"
+
+# header: magic, window_size (samples), capacity (windows), dtype itemsize, dtype kind
+_HEADER = struct.Struct("=4sIIB1s")
+_HEADER_SIZE = 64  # keep the slots aligned
+_SLOT_SEQ = struct.Struct("=Q")
+_SLOT_HEADER_SIZE = 8
+# seq of a slot that holds no window, either not written yet or being written
+_EMPTY_SLOT = 0xFFFFFFFFFFFFFFFF
+_MAGIC = b"LKAR"
+
+
+@dataclass
+class SharedAudioWindow:
+    """Notification sent over the IPC channel once a window has been written to a ring"""
+
+    ring_name: str
+    seq: int
+
+    def encode(self) -> memoryview:
+        w = BinaryWriter(capacity=32 + len(self.ring_name))
+        w.write_string(self.ring_name)
+        w.write_u32(self.seq & 0xFFFFFFFF)
+        w.write_u32(self.seq >> 32)
+        return w.getbuffer()
+
+    @staticmethod
+    def decode(data: Buffer) -> SharedAudioWindow:
+        r = BinaryReader(data)
+        ring_name = r.read_string()
+        seq = r.read_u32() | (r.read_u32() << 32)
+        return SharedAudioWindow(ring_name=ring_name, seq=seq)
+
+
+class SharedAudioRing:
+    """Fixed-size audio windows in a multiprocessing.shared_memory segment.
+
+    The job process creates the ring and writes windows into it, the inference process attaches
+    to it by name and reads the windows in place. Only a SharedAudioWindow (name + sequence
+    number) has to go through the IPC channel.
+
+    Each slot stores the sequence number of the window it holds, so a reader can detect that
+    the writer lapped it (the ring is too small for the inference latency). The writer clears
+    the seq of a slot while it overwrites it, and the reader checks the seq before and after
+    copying the samples out (seqlock), a window overwritten mid-read is never returned.
+    """
+
+    def __init__(self, shm: shared_memory.SharedMemory, *, owner: bool) -> None:
+        assert shm.buf is not None
+        magic, window_size, capacity, itemsize, kind = _HEADER.unpack_from(shm.buf, 0)
+        if magic != _MAGIC:
+            raise ValueError(f"{shm.name} is not a shared audio ring")
+
+        self._shm = shm
+        self._buf = shm.buf
+        self._owner = owner
+        self._window_size = int(window_size)
+        self._capacity = int(capacity)
+        self._dtype = np.dtype(f"{kind.decode()}{itemsize}")
+        self._slot_size = _SLOT_HEADER_SIZE + self._window_size * int(itemsize)
+        self._next_seq = 0
+
+    @classmethod
+    def create(
+        cls, *, window_size: int, capacity: int = 64, dtype: str = "float32"
+    ) -> SharedAudioRing:
+        dt = np.dtype(dtype)
+        slot_size = _SLOT_HEADER_SIZE + window_size * dt.itemsize
+        shm = shared_memory.SharedMemory(create=True, size=_HEADER_SIZE + capacity * slot_size)
+        buf = shm.buf
+        assert buf is not None
+        _HEADER.pack_into(buf, 0, _MAGIC, window_size, capacity, dt.itemsize, dt.kind.encode())
+        for i in range(capacity):
+            # the segment starts zeroed, slot 0 would otherwise look like it holds window 0
+            _SLOT_SEQ.pack_into(buf, _HEADER_SIZE + i * slot_size, _EMPTY_SLOT)
+
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name: str) -> SharedAudioRing:
+        shm = shared_memory.SharedMemory(name=name)
+        # the creator owns the segment, don't let this process' resource tracker unlink it
+        with contextlib.suppress(Exception):
+            resource_tracker.unregister(shm._name, "shared_memory")  # type: ignore[attr-defined]
+
+        return cls(shm, owner=False)
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    @property
+    def window_size(self) -> int:
+        return self._window_size
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    def _slot_offset(self, seq: int) -> int:
+        return _HEADER_SIZE + (seq % self._capacity) * self._slot_size
+
+    def write(self, window: np.ndarray) -> SharedAudioWindow:
+        """Copy a window into the next slot and return the notification to send"""
+        if window.size != self._window_size:
+            raise ValueError(f"expected a window of {self._window_size} samples, got {window.size}")
+
+        seq = self._next_seq
+        self._next_seq += 1
+
+        offset = self._slot_offset(seq)
+        _SLOT_SEQ.pack_into(self._buf, offset, _EMPTY_SLOT)
+        dst = np.ndarray(
+            (self._window_size,),
+            dtype=self._dtype,
+            buffer=self._buf,
+            offset=offset + _SLOT_HEADER_SIZE,
+        )
+        np.copyto(dst, window.reshape(-1), casting="same_kind")
+        _SLOT_SEQ.pack_into(self._buf, offset, seq)
+        return SharedAudioWindow(ring_name=self.name, seq=seq)
+
+    def read(self, seq: int, out: np.ndarray | None = None) -> np.ndarray:
+        """Copy the window out of the ring, into out if given (e.g. a row of a batch)
+
+        Raises ValueError if the window isn't available, or was overwritten while being copied.
+        """
+        offset = self._slot_offset(seq)
+        self._check_seq(seq, offset)
+
+        view = np.ndarray(
+            (self._window_size,),
+            dtype=self._dtype,
+            buffer=self._buf,
+            offset=offset + _SLOT_HEADER_SIZE,
+        )
+        if out is None:
+            out = view.copy()
+        else:
+            np.copyto(out, view)
+
+        # the writer may have lapped the reader during the copy
+        self._check_seq(seq, offset)
+        return out
+
+    def _check_seq(self, seq: int, offset: int) -> None:
+        (slot_seq,) = _SLOT_SEQ.unpack_from(self._buf, offset)
+        if slot_seq != seq:
+            raise ValueError(f"window {seq} is no longer available (slot holds {slot_seq})")
+
+    def is_valid(self, seq: int) -> bool:
+        (slot_seq,) = _SLOT_SEQ.unpack_from(self._buf, self._slot_offset(seq))
+        return bool(slot_seq == seq)
+
+    def close(self) -> None:
+        self._shm.close()
+
+        if self._owner:
+            self._shm.unlink()
+
+    async def register(self, executor: InferenceExecutor) -> None:
+        """Have the inference process attach to the ring before the first window is sent"""
+        await executor.do_inference(SHM_REGISTER_METHOD, self.name.encode())
+
+    async def aclose(self, executor: InferenceExecutor) -> None:
+        """Ask the inference process to detach from the ring, then close it"""
+        try:
+            await executor.do_inference(SHM_RELEASE_METHOD, self.name.encode())
+        finally:
+            self.close()
+
+
+class SharedAudioRegistry:
+    """Rings attached by the inference process, keyed by shared memory name"""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._rings: dict[str, SharedAudioRing] = {}
+
+    def register(self, name: str) -> None:
+        self.get(name)
+
+    def get(self, name: str) -> SharedAudioRing:
+        with self._lock:
+            ring = self._rings.get(name)
+            if ring is None:
+                ring = self._rings[name] = SharedAudioRing.attach(name)
+            return ring
+
+    def release(self, name: str) -> None:
+        with self._lock:
+            ring = self._rings.pop(name, None)
+
+        if ring is not None:
+            ring.close()
+
+    def close(self) -> None:
+        with self._lock:
+            rings, self._rings = list(self._rings.values()), {}
+
+        for ring in rings:
+            ring.close()
+
+
+_registry = SharedAudioRegistry()
+
+
+def registry() -> SharedAudioRegistry:
+    """The process-wide registry, used by inference runners to read the windows they're sent"""
+    return _registry
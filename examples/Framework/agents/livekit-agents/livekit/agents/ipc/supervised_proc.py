@@ -3,7 +3,6 @@ from __future__ import annotations
 import asyncio
 import contextlib
 import logging
-import multiprocessing as mp
 import signal
 import socket
 import sys
@@ -13,7 +12,7 @@ from abc import ABC, abstractmethod
 from collections.abc import Generator
 from dataclasses import dataclass
 from multiprocessing.context import BaseContext
-from typing import Any
+from typing import Any, Protocol
 
 import psutil
 
@@ -22,6 +21,7 @@ from ..telemetry import metrics
 from ..utils import aio, log_exceptions, time_ms
 from ..utils.aio import duplex_unix
 from . import channel, proto
+from .job_executor import _PingDelay
 from .log_queue import LogQueueListener
 
 
@@ -46,6 +46,28 @@ def _mask_ctrl_c() -> Generator[None, None, None]:
             signal.signal(signal.SIGINT, old)
 
 
+class _ProcessHandle(Protocol):
+    """subset of multiprocessing.Process used by SupervisedProc"""
+
+    @property
+    def pid(self) -> int | None: ...
+
+    @property
+    def exitcode(self) -> int | None: ...
+
+    def start(self) -> None: ...
+
+    def join(self, timeout: float | None = None) -> None: ...
+
+    def is_alive(self) -> bool: ...
+
+    def kill(self) -> None: ...
+
+    def terminate(self) -> None: ...
+
+    def close(self) -> None: ...
+
+
 @dataclass
 class _ProcOpts:
     initialize_timeout: float
@@ -94,9 +116,10 @@ class SupervisedProc(ABC):
         self._kill_sent = False
         self._initialize_fut = asyncio.Future[None]()
         self._lock = asyncio.Lock()
+        self._ping_delay = _PingDelay()
 
     @abstractmethod
-    def _create_process(self, cch: socket.socket, log_cch: socket.socket) -> mp.Process: ...
+    def _create_process(self, cch: socket.socket, log_cch: socket.socket) -> _ProcessHandle: ...
 
     @abstractmethod
     async def _main_task(self, ipc_ch: aio.ChanReceiver[channel.Message]) -> None: ...
@@ -113,6 +136,10 @@ class SupervisedProc(ABC):
     def pid(self) -> int | None:
         return self._pid
 
+    @property
+    def ping_delay(self) -> float:
+        return self._ping_delay.delay(time_ms())
+
     @property
     def started(self) -> bool:
         return self._supervise_atask is not None
@@ -329,7 +356,7 @@ class SupervisedProc(ABC):
                 break
 
             if isinstance(msg, proto.PongResponse):
-                delay = time_ms() - msg.timestamp
+                delay = self._ping_delay.on_pong(msg.timestamp, time_ms())
                 if delay > self._opts.high_ping_threshold * 1000:
                     logger.warning(
                         "process is unresponsive",
@@ -355,8 +382,10 @@ class SupervisedProc(ABC):
         async def _send_ping_co() -> None:
             while True:
                 await ping_interval.tick()
+                timestamp = time_ms()
+                self._ping_delay.on_ping(timestamp)
                 try:
-                    await channel.asend_message(self._pch, proto.PingRequest(timestamp=time_ms()))
+                    await channel.asend_message(self._pch, proto.PingRequest(timestamp=timestamp))
                 except duplex_unix.DuplexClosed:
                     break
 
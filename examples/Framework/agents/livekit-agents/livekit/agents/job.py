@@ -70,6 +70,8 @@ get_current_job_context = get_job_context
 class JobExecutorType(Enum):
     PROCESS = "process"
     THREAD = "thread"
+    FORK = "fork"
+    """processes forked from a template that ran the prewarm function once (POSIX only)"""
 
 
 class AutoSubscribe(str, Enum):
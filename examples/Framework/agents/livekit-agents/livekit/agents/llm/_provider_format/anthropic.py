@@ -7,7 +7,7 @@ from typing import Any
 
 from livekit.agents import llm
 
-from .utils import group_tool_calls
+from .utils import cached_item_format, group_tool_calls
 
 
 @dataclass
@@ -45,30 +45,8 @@ def to_chat_ctx(
             content = []
             current_role = role
 
-        if msg.type == "message":
-            for c in msg.content:
-                if c and isinstance(c, str):
-                    content.append({"text": c, "type": "text"})
-                elif isinstance(c, llm.ImageContent):
-                    content.append(_to_image_content(c))
-        elif msg.type == "function_call":
-            content.append(
-                {
-                    "id": msg.call_id,
-                    "type": "tool_use",
-                    "name": msg.name,
-                    "input": json.loads(msg.arguments or "{}"),
-                }
-            )
-        elif msg.type == "function_call_output":
-            content.append(
-                {
-                    "tool_use_id": msg.call_id,
-                    "type": "tool_result",
-                    "content": msg.output,
-                    "is_error": msg.is_error,
-                }
-            )
+        # copied, the cache control is set on the blocks of the request
+        content.extend(map(dict, cached_item_format(msg, "anthropic", _to_content_blocks)))
 
     if current_role is not None and content:
         messages.append({"role": current_role, "content": content})
@@ -86,6 +64,35 @@ def to_chat_ctx(
     return messages, AnthropicFormatData(system_messages=system_messages)
 
 
+def _to_content_blocks(msg: llm.ChatItem) -> list[dict[str, Any]]:
+    blocks: list[dict[str, Any]] = []
+    if msg.type == "message":
+        for c in msg.content:
+            if c and isinstance(c, str):
+                blocks.append({"text": c, "type": "text"})
+            elif isinstance(c, llm.ImageContent):
+                blocks.append(_to_image_content(c))
+    elif msg.type == "function_call":
+        blocks.append(
+            {
+                "id": msg.call_id,
+                "type": "tool_use",
+                "name": msg.name,
+                "input": json.loads(msg.arguments or "{}"),
+            }
+        )
+    elif msg.type == "function_call_output":
+        blocks.append(
+            {
+                "tool_use_id": msg.call_id,
+                "type": "tool_result",
+                "content": msg.output,
+                "is_error": msg.is_error,
+            }
+        )
+    return blocks
+
+
 def _to_image_content(image: llm.ImageContent) -> dict[str, Any]:
     cache_key = "serialized_image"
     if cache_key not in image._cache:
@@ -5,7 +5,7 @@ from typing import Any, Literal
 
 from livekit.agents import llm
 
-from .utils import group_tool_calls
+from .utils import cached_item_format, group_tool_calls
 
 
 def to_chat_ctx(
@@ -18,7 +18,7 @@ def to_chat_ctx(
             continue
 
         # one message can contain zero or more tool calls
-        msg = _to_chat_item(group.message) if group.message else {"role": "assistant"}
+        msg = _cached_chat_item(group.message) if group.message else {"role": "assistant"}
         tool_calls = [
             {
                 "id": tool_call.call_id,
@@ -33,11 +33,16 @@ def to_chat_ctx(
 
         # append tool outputs following the tool calls
         for tool_output in group.tool_outputs:
-            messages.append(_to_chat_item(tool_output))
+            messages.append(_cached_chat_item(tool_output))
 
     return messages, None
 
 
+def _cached_chat_item(msg: llm.ChatItem) -> dict[str, Any]:
+    # copied, the message of a group gets its tool calls
+    return dict(cached_item_format(msg, "openai", _to_chat_item))
+
+
 def _to_chat_item(msg: llm.ChatItem) -> dict[str, Any]:
     if msg.type == "message":
         list_content: list[dict[str, Any]] = []
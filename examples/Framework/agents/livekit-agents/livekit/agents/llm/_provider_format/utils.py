@@ -1,11 +1,47 @@
 from __future__ import annotations
 
-from collections import OrderedDict
 from dataclasses import dataclass, field
+from typing import Any, Callable, TypeVar
 
 from livekit.agents import llm
 from livekit.agents.log import logger
 
+_T = TypeVar("_T")
+
+
+def cached_item_format(item: llm.ChatItem, fmt: str, build: Callable[[Any], _T]) -> _T:
+    """Memoize the provider format of a chat item, so an append-only conversation only converts
+    its new items on every turn.
+
+    The cache is stored on the item and keyed by the fields it's built from, it's rebuilt when the
+    item is mutated. The cached value is shared by the calls, the caller copies it before handing
+    it out.
+    """
+    if item.type == "agent_handoff":
+        return build(item)
+
+    # same dict as item._cache, pydantic's __getattr__ for the private attributes is slow
+    cache: dict[Any, Any] = item.__pydantic_private__["_cache"]  # type: ignore[index]
+    version = _item_version(item)
+    cached = cache.get(fmt)
+    if cached is not None and cached[0] == version:
+        return cached[1]  # type: ignore[no-any-return]
+
+    value = build(item)
+    cache[fmt] = (version, value)
+    return value
+
+
+def _item_version(
+    item: llm.ChatMessage | llm.FunctionCall | llm.FunctionCallOutput,
+) -> tuple[Any, ...]:
+    # the strings of the content are compared by identity first, the comparison is cheap
+    if item.type == "message":
+        return (item.id, item.role, tuple(item.content))
+    elif item.type == "function_call":
+        return (item.id, item.call_id, item.name, item.arguments)
+    return (item.id, item.call_id, item.name, item.output, item.is_error)
+
 
 def group_tool_calls(chat_ctx: llm.ChatContext) -> list[_ChatItemGroup]:
     """Group chat items (messages, function calls, and function outputs)
@@ -24,12 +60,12 @@ def group_tool_calls(chat_ctx: llm.ChatContext) -> list[_ChatItemGroup]:
     Returns:
         A list of _ChatItemGroup objects representing the grouped conversation
     """
-    item_groups: dict[str, _ChatItemGroup] = OrderedDict()  # item_id to group of items
+    item_groups: dict[str, _ChatItemGroup] = {}  # item_id to group of items, in order
     tool_outputs: list[llm.FunctionCallOutput] = []
     for item in chat_ctx.items:
         if (item.type == "message" and item.role == "assistant") or item.type == "function_call":
             # only assistant messages and function calls can be grouped
-            group_id = item.id.split("/")[0]
+            group_id = item.id.partition("/")[0]
             if group_id not in item_groups:
                 item_groups[group_id] = _ChatItemGroup().add(item)
             else:
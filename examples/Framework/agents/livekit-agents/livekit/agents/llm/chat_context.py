@@ -14,9 +14,10 @@
 
 from __future__ import annotations
 
+import operator
 import time
-from collections.abc import Sequence
-from typing import TYPE_CHECKING, Annotated, Any, Literal, Union, overload
+from collections.abc import Iterable, Sequence
+from typing import TYPE_CHECKING, Annotated, Any, Literal, SupportsIndex, Union, overload
 
 from pydantic import BaseModel, Field, PrivateAttr, TypeAdapter
 from typing_extensions import TypeAlias, TypedDict
@@ -159,6 +160,7 @@ class ChatMessage(BaseModel):
     metrics: MetricsReport = Field(default_factory=lambda: MetricsReport())
     created_at: float = Field(default_factory=time.time)
     hash: bytes | None = Field(default=None, deprecated="hash is deprecated")
+    _cache: dict[Any, Any] = PrivateAttr(default_factory=dict)
 
     @property
     def text_content(self) -> str | None:
@@ -183,6 +185,7 @@ class FunctionCall(BaseModel):
     arguments: str
     name: str
     created_at: float = Field(default_factory=time.time)
+    _cache: dict[Any, Any] = PrivateAttr(default_factory=dict)
 
 
 class FunctionCallOutput(BaseModel):
@@ -193,6 +196,7 @@ class FunctionCallOutput(BaseModel):
     output: str
     is_error: bool
     created_at: float = Field(default_factory=time.time)
+    _cache: dict[Any, Any] = PrivateAttr(default_factory=dict)
 
 
 class AgentHandoff(BaseModel):
@@ -208,9 +212,92 @@ ChatItem = Annotated[
 ]
 
 
+class _ChatItems(list[ChatItem]):
+    """The items of a ChatContext, with an id -> position index built on the first lookup.
+
+    Appending keeps the index up to date, the other mutations invalidate it.
+    """
+
+    _index: dict[str, int] | None = None
+
+    def index_of(self, item_id: str) -> int | None:
+        if self._index is not None:
+            idx = self._index.get(item_id)
+            if idx is None or self[idx].id == item_id:
+                return idx
+            # the id of an item was changed in place
+
+        self._index = {}
+        for i, item in enumerate(self):
+            self._index.setdefault(item.id, i)
+        return self._index.get(item_id)
+
+    def _invalidate(self) -> None:
+        self._index = None
+
+    def append(self, item: ChatItem) -> None:
+        super().append(item)
+        if self._index is not None:
+            self._index.setdefault(item.id, len(self) - 1)
+
+    def extend(self, items: Iterable[ChatItem]) -> None:
+        start = len(self)
+        super().extend(items)
+        if self._index is not None:
+            for i in range(start, len(self)):
+                self._index.setdefault(self[i].id, i)
+
+    def __iadd__(self, items: Iterable[ChatItem]) -> _ChatItems:  # type: ignore[override,misc]
+        self.extend(items)
+        return self
+
+    def insert(self, index: SupportsIndex, item: ChatItem) -> None:
+        n = len(self)
+        super().insert(index, item)
+        if self._index is not None:
+            if operator.index(index) >= n:
+                self._index.setdefault(item.id, n)
+            else:
+                self._index = None
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        super().__setitem__(key, value)
+        self._index = None
+
+    def __delitem__(self, key: Any) -> None:
+        super().__delitem__(key)
+        self._index = None
+
+    def __imul__(self, n: SupportsIndex) -> _ChatItems:
+        super().__imul__(n)
+        self._index = None
+        return self
+
+    def pop(self, index: SupportsIndex = -1) -> ChatItem:
+        item = super().pop(index)
+        self._index = None
+        return item
+
+    def remove(self, item: ChatItem) -> None:
+        super().remove(item)
+        self._index = None
+
+    def clear(self) -> None:
+        super().clear()
+        self._index = None
+
+    def sort(self, *args: Any, **kwargs: Any) -> None:
+        super().sort(*args, **kwargs)
+        self._index = None
+
+    def reverse(self) -> None:
+        super().reverse()
+        self._index = None
+
+
 class ChatContext:
     def __init__(self, items: NotGivenOr[list[ChatItem]] = NOT_GIVEN):
-        self._items: list[ChatItem] = items if is_given(items) else []
+        self._items: list[ChatItem] = _ChatItems(items) if is_given(items) else _ChatItems()
 
     @classmethod
     def empty(cls) -> ChatContext:
@@ -222,7 +309,7 @@ class ChatContext:
 
     @items.setter
     def items(self, items: list[ChatItem]) -> None:
-        self._items = items
+        self._items = _ChatItems(items)
 
     def add_message(
         self,
@@ -268,10 +355,14 @@ class ChatContext:
             self._items.insert(idx, _item)
 
     def get_by_id(self, item_id: str) -> ChatItem | None:
-        return next((item for item in self.items if item.id == item_id), None)
+        idx = self.index_by_id(item_id)
+        return self._items[idx] if idx is not None else None
 
     def index_by_id(self, item_id: str) -> int | None:
-        return next((i for i, item in enumerate(self.items) if item.id == item_id), None)
+        if isinstance(self._items, _ChatItems):
+            return self._items.index_of(item_id)
+
+        return next((i for i, item in enumerate(self._items) if item.id == item_id), None)
 
     def copy(
         self,
@@ -492,14 +583,22 @@ class ChatContext:
         """
         Returns the index to insert an item by creation time.
 
-        Iterates in reverse, assuming items are sorted by `created_at`.
+        Binary search, assuming items are sorted by `created_at`.
         Finds the position after the last item with `created_at <=` the given timestamp.
         """
-        for i in reversed(range(len(self._items))):
-            if self._items[i].created_at <= created_at:
-                return i + 1
+        items = self._items
+        if not items or items[-1].created_at <= created_at:
+            return len(items)  # the usual case, a new item
+
+        lo, hi = 0, len(items) - 1
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if items[mid].created_at <= created_at:
+                lo = mid + 1
+            else:
+                hi = mid
 
-        return 0
+        return lo
 
     async def summarize(
         self,
@@ -648,7 +747,7 @@ class _ReadOnlyChatContext(ChatContext):
         "please use .copy() and agent.update_chat_ctx() to modify the chat context"
     )
 
-    class _ImmutableList(list[ChatItem]):
+    class _ImmutableList(_ChatItems):
         def _raise_error(self, *args: Any, **kwargs: Any) -> None:
             logger.error(_ReadOnlyChatContext.error_msg)
             raise RuntimeError(_ReadOnlyChatContext.error_msg)
@@ -2,9 +2,14 @@ from __future__ import annotations
 
 import asyncio
 import base64
+import bisect
+import hashlib
 import inspect
 import sys
+import threading
 import types
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from typing import (
     TYPE_CHECKING,
@@ -28,7 +33,7 @@ from livekit import rtc
 from ..log import logger
 from ..utils import images
 from . import _strict
-from .chat_context import ChatContext, ImageContent
+from .chat_context import ChatContext, ChatItem, ImageContent
 from .tool_context import (
     FunctionTool,
     RawFunctionTool,
@@ -46,34 +51,92 @@ THINK_TAG_END = "</think>"
 
 def _compute_lcs(old_ids: list[str], new_ids: list[str]) -> list[str]:
     """
-    Standard dynamic-programming LCS to get the common subsequence
-    of IDs (in order) that appear in both old_ids and new_ids.
+    Longest common subsequence of IDs (in order) that appear in both old_ids and new_ids.
+
+    The IDs of a ChatContext are unique, so the LCS is the longest increasing subsequence of the
+    old positions of the new IDs, found in O(n log n) with patience sorting. A duplicated ID is
+    only matched once.
     """
-    n, m = len(old_ids), len(new_ids)
-    dp = [[0] * (m + 1) for _ in range(n + 1)]
-
-    # Fill DP table
-    for i in range(1, n + 1):
-        for j in range(1, m + 1):
-            if old_ids[i - 1] == new_ids[j - 1]:
-                dp[i][j] = dp[i - 1][j - 1] + 1
-            else:
-                dp[i][j] = max(dp[i - 1][j], dp[i][j - 1])
-
-    # Backtrack to find the actual LCS sequence
-    lcs_ids = []
-    i, j = n, m
-    while i > 0 and j > 0:
-        if old_ids[i - 1] == new_ids[j - 1]:
-            lcs_ids.append(old_ids[i - 1])
-            i -= 1
-            j -= 1
-        elif dp[i - 1][j] > dp[i][j - 1]:
-            i -= 1
+    old_index: dict[str, int] = {}
+    for i, item_id in enumerate(old_ids):
+        old_index.setdefault(item_id, i)
+
+    # old position of each new id, in the new order
+    positions: list[int] = []
+    for item_id in new_ids:
+        i = old_index.pop(item_id, -1)
+        if i >= 0:
+            positions.append(i)
+
+    # tails[k] is the index in positions of the smallest tail of an increasing run of length k+1
+    tails: list[int] = []
+    tail_values: list[int] = []
+    prev = [-1] * len(positions)
+    for k, pos in enumerate(positions):
+        if not tail_values or pos > tail_values[-1]:
+            j = len(tail_values)  # fast path, the common case of an untouched history
+        else:
+            j = bisect.bisect_left(tail_values, pos)
+
+        if j > 0:
+            prev[k] = tails[j - 1]
+
+        if j == len(tails):
+            tails.append(k)
+            tail_values.append(pos)
         else:
-            j -= 1
+            tails[j] = k
+            tail_values[j] = pos
+
+    lcs_positions = []
+    k = tails[-1] if tails else -1
+    while k >= 0:
+        lcs_positions.append(positions[k])
+        k = prev[k]
+
+    return [old_ids[i] for i in reversed(lcs_positions)]
+
+
+def _is_image_equal(old: ImageContent, new: ImageContent) -> bool:
+    if old.id != new.id:
+        # rebuilt from a provider (e.g. a realtime API echoing the conversation), the frame or the
+        # data URL sent isn't kept as-is and can't be compared
+        return True
+
+    return (
+        (old.image is new.image or old.image == new.image)
+        and old.inference_detail == new.inference_detail
+        and old.inference_width == new.inference_width
+        and old.inference_height == new.inference_height
+    )
+
+
+def _is_item_updated(old: ChatItem, new: ChatItem) -> bool:
+    if old is new:
+        return False
+
+    if old.type != new.type:
+        return True
+
+    if old.type == "message" and new.type == "message":
+        if old.text_content != new.text_content:
+            return True
+
+        old_images = [c for c in old.content if isinstance(c, ImageContent)]
+        new_images = [c for c in new.content if isinstance(c, ImageContent)]
+        if len(old_images) != len(new_images):
+            return True
+
+        return not all(_is_image_equal(a, b) for a, b in zip(old_images, new_images))
 
-    return list(reversed(lcs_ids))
+    if old.type == "function_call" and new.type == "function_call":
+        return old.name != new.name or old.call_id != new.call_id or old.arguments != new.arguments
+
+    if old.type == "function_call_output" and new.type == "function_call_output":
+        # the name and is_error aren't always returned by the providers
+        return old.call_id != new.call_id or old.output != new.output
+
+    return False
 
 
 @dataclass
@@ -88,14 +151,16 @@ class DiffOps:
 
 
 def compute_chat_ctx_diff(old_ctx: ChatContext, new_ctx: ChatContext) -> DiffOps:
-    """Computes the minimal list of create/remove operations to transform old_ctx into new_ctx."""
-    # TODO(theomonnom): Make ChatMessage hashable and also add update ops
+    """Computes the minimal list of create/remove operations to transform old_ctx into new_ctx.
 
+    Items kept in place are reported in `to_update` when their text, their images, or the payload
+    of a function call or output changed.
+    """
     old_ids = [m.id for m in old_ctx.items]
     new_ids = [m.id for m in new_ctx.items]
 
     lcs_ids = set(_compute_lcs(old_ids, new_ids))
-    old_ctx_by_id = {item.id: item for item in old_ctx.items}
+    old_ctx_by_id = {item.id: item for item in reversed(old_ctx.items)}
 
     to_remove = [msg.id for msg in old_ctx.items if msg.id not in lcs_ids]
     to_create: list[tuple[str | None, str]] = []
@@ -105,13 +170,8 @@ def compute_chat_ctx_diff(old_ctx: ChatContext, new_ctx: ChatContext) -> DiffOps
     for new_msg in new_ctx.items:
         if new_msg.id not in lcs_ids:
             to_create.append((prev_id, new_msg.id))
-        else:
-            # check if the content is different
-            old_msg = old_ctx_by_id[new_msg.id]
-            if new_msg.type == "message" and old_msg.type == "message":
-                if new_msg.text_content != old_msg.text_content:
-                    to_update.append((prev_id, new_msg.id))
-                # TODO: check other content types
+        elif _is_item_updated(old_ctx_by_id[new_msg.id], new_msg):
+            to_update.append((prev_id, new_msg.id))
 
         prev_id = new_msg.id
 
@@ -135,8 +195,65 @@ class SerializedImage:
     external_url: str | None = None
 
 
+# process-wide cache of the encoded video frames, a vision agent sampling a video track serializes
+# the same frames for every LLM call (and the frames of a static screen share are identical)
+IMAGE_CACHE_SIZE = 32
+# bytes of the frame sampled for its fingerprint, the values are quantized so that the frames
+# differing only by encoding noise reuse the same encoding
+_FINGERPRINT_SAMPLES = 65536
+_FINGERPRINT_QUANTIZE = bytes(i & 0xF0 for i in range(256))
+
+_image_cache: OrderedDict[tuple[Any, ...], bytes] = OrderedDict()
+_image_cache_lock = threading.Lock()
+_image_executor: ThreadPoolExecutor | None = None
+
+
+def _frame_fingerprint(frame: rtc.VideoFrame) -> bytes:
+    data = frame.data.cast("B")
+    step = max(1, len(data) // _FINGERPRINT_SAMPLES) | 1  # odd, to not sample the same columns
+    sample = data[::step].tobytes().translate(_FINGERPRINT_QUANTIZE)
+    return hashlib.blake2b(sample, digest_size=16).digest()
+
+
+def _image_encode_options(image: ImageContent) -> images.EncodeOptions:
+    opts = images.EncodeOptions()
+    if image.inference_width and image.inference_height:
+        opts.resize_options = images.ResizeOptions(
+            width=image.inference_width,
+            height=image.inference_height,
+            strategy="scale_aspect_fit",
+        )
+    return opts
+
+
+def _encode_frame(frame: rtc.VideoFrame, opts: images.EncodeOptions) -> bytes:
+    resize = opts.resize_options
+    key = (
+        _frame_fingerprint(frame),
+        frame.width,
+        frame.height,
+        frame.type,
+        opts.format,
+        opts.quality,
+        (resize.width, resize.height, resize.strategy) if resize else None,
+    )
+    with _image_cache_lock:
+        encoded = _image_cache.get(key)
+        if encoded is not None:
+            _image_cache.move_to_end(key)
+            return encoded
+
+    encoded = images.encode(frame, opts)
+    with _image_cache_lock:
+        _image_cache[key] = encoded
+        while len(_image_cache) > IMAGE_CACHE_SIZE:
+            _image_cache.popitem(last=False)
+
+    return encoded
+
+
 def serialize_image(image: ImageContent, *, use_cache: bool = True) -> SerializedImage:
-    cache_key = "serialized_image"  # TODO(long): use hash of encoding options if available
+    cache_key = "serialized_image"  # the encoding options only depend on the ImageContent
     if use_cache and cache_key in image._cache:
         return cast(SerializedImage, image._cache[cache_key])
 
@@ -173,14 +290,11 @@ def serialize_image(image: ImageContent, *, use_cache: bool = True) -> Serialize
             )
 
     elif isinstance(image.image, rtc.VideoFrame):
-        opts = images.EncodeOptions()
-        if image.inference_width and image.inference_height:
-            opts.resize_options = images.ResizeOptions(
-                width=image.inference_width,
-                height=image.inference_height,
-                strategy="scale_aspect_fit",
-            )
-        encoded_data = images.encode(image.image, opts)
+        opts = _image_encode_options(image)
+        if use_cache:
+            encoded_data = _encode_frame(image.image, opts)
+        else:
+            encoded_data = images.encode(image.image, opts)
 
         serialized_image = SerializedImage(
             data_bytes=encoded_data,
@@ -195,6 +309,32 @@ def serialize_image(image: ImageContent, *, use_cache: bool = True) -> Serialize
     return serialized_image
 
 
+async def serialize_chat_ctx_images(chat_ctx: ChatContext) -> None:
+    """Encode the video frames of the chat context in a worker thread, the provider formats then
+    serialize them from the cache instead of encoding on the event loop"""
+    global _image_executor
+
+    pending = [
+        content
+        for item in chat_ctx.items
+        if item.type == "message"
+        for content in item.content
+        if isinstance(content, ImageContent)
+        and isinstance(content.image, rtc.VideoFrame)
+        and "serialized_image" not in content._cache
+    ]
+    if not pending:
+        return
+
+    if _image_executor is None:
+        _image_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="image_encode")
+
+    loop = asyncio.get_running_loop()
+    await asyncio.gather(
+        *(loop.run_in_executor(_image_executor, serialize_image, image) for image in pending)
+    )
+
+
 def build_legacy_openai_schema(
     function_tool: FunctionTool, *, internally_tagged: bool = False
 ) -> dict[str, Any]:
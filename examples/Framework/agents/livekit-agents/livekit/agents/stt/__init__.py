@@ -1,6 +1,6 @@
 from .fallback_adapter import AvailabilityChangedEvent, FallbackAdapter
 from .multi_speaker_adapter import MultiSpeakerAdapter
-from .stream_adapter import StreamAdapter, StreamAdapterWrapper
+from .stream_adapter import IncrementalRecognition, StreamAdapter, StreamAdapterWrapper
 from .stt import (
     STT,
     RecognitionUsage,
@@ -23,6 +23,7 @@ __all__ = [
     "STTCapabilities",
     "StreamAdapter",
     "StreamAdapterWrapper",
+    "IncrementalRecognition",
     "RecognitionUsage",
     "FallbackAdapter",
     "AvailabilityChangedEvent",
@@ -1,13 +1,24 @@
 from __future__ import annotations
 
 import asyncio
+import dataclasses
 from collections.abc import AsyncIterable
+from dataclasses import dataclass, field
 from typing import Any
 
+from livekit import rtc
+
 from .. import utils
 from ..types import DEFAULT_API_CONNECT_OPTIONS, NOT_GIVEN, APIConnectOptions, NotGivenOr
-from ..vad import VAD, VADEventType
-from .stt import STT, RecognizeStream, SpeechEvent, SpeechEventType, STTCapabilities
+from ..vad import VAD, VADEvent, VADEventType
+from .stt import (
+    STT,
+    RecognizeStream,
+    SpeechData,
+    SpeechEvent,
+    SpeechEventType,
+    STTCapabilities,
+)
 
 # already a retry mechanism in STT.recognize, don't retry in stream adapter
 DEFAULT_STREAM_ADAPTER_API_CONNECT_OPTIONS = APIConnectOptions(
@@ -15,12 +26,51 @@ DEFAULT_STREAM_ADAPTER_API_CONNECT_OPTIONS = APIConnectOptions(
 )
 
 
+@dataclass
+class IncrementalRecognition:
+    """Recognize the speech in chunks while the user is still speaking.
+
+    The speech is cut at the short pauses detected by the VAD, each chunk is recognized as soon as
+    it is cut and an interim transcript is emitted with the text recognized so far. At the end of
+    speech only the last chunk remains to be recognized, the final transcript is the text of all
+    the chunks.
+    """
+
+    min_chunk_duration: float = 2.0
+    """Minimum duration of a chunk, in seconds."""
+    pause_duration: float = 0.2
+    """Duration of the silence (as accumulated by the VAD) to cut a chunk at, in seconds."""
+    max_concurrent_requests: int = 2
+    """Maximum number of recognition requests in flight per stream."""
+
+
 class StreamAdapter(STT):
-    def __init__(self, *, stt: STT, vad: VAD) -> None:
+    def __init__(
+        self,
+        *,
+        stt: STT,
+        vad: VAD,
+        incremental_recognition: IncrementalRecognition | bool = False,
+    ) -> None:
+        """
+        Args:
+            stt: The non-streaming STT to wrap.
+            vad: The VAD used to detect the speech to recognize.
+            incremental_recognition: Recognize the speech in chunks cut at the pauses, emitting
+                interim transcripts while the user is speaking. It requires a VAD attaching the
+                analyzed audio to its `INFERENCE_DONE` events (e.g. silero), the whole speech is
+                recognized at the end of speech otherwise.
+        """
+        self._incremental: IncrementalRecognition | None = None
+        if incremental_recognition is True:
+            self._incremental = IncrementalRecognition()
+        elif isinstance(incremental_recognition, IncrementalRecognition):
+            self._incremental = incremental_recognition
+
         super().__init__(
             capabilities=STTCapabilities(
                 streaming=True,
-                interim_results=False,
+                interim_results=self._incremental is not None,
                 diarization=False,  # diarization requires streaming STT
             )
         )
@@ -65,6 +115,7 @@ class StreamAdapter(STT):
             wrapped_stt=self._stt,
             language=language,
             conn_options=conn_options,
+            incremental=self._incremental,
         )
 
     def _on_metrics_collected(self, *args: Any, **kwargs: Any) -> None:
@@ -74,6 +125,17 @@ class StreamAdapter(STT):
         self._stt.off("metrics_collected", self._on_metrics_collected)
 
 
+@dataclass
+class _Utterance:
+    # audio since the last cut
+    frames: list[rtc.AudioFrame] = field(default_factory=list)
+    duration: float = 0.0
+    speech_since_cut: bool = False
+    # recognition of the chunks already cut, in order
+    chunks: list[asyncio.Task[SpeechEvent]] = field(default_factory=list)
+    interim_chunks: int = 0
+
+
 class StreamAdapterWrapper(RecognizeStream):
     def __init__(
         self,
@@ -83,12 +145,18 @@ class StreamAdapterWrapper(RecognizeStream):
         wrapped_stt: STT,
         language: NotGivenOr[str],
         conn_options: APIConnectOptions,
+        incremental: IncrementalRecognition | None = None,
     ) -> None:
         super().__init__(stt=stt, conn_options=DEFAULT_STREAM_ADAPTER_API_CONNECT_OPTIONS)
         self._vad = vad
         self._wrapped_stt = wrapped_stt
         self._wrapped_stt_conn_options = conn_options
         self._language = language
+        self._incremental = incremental
+        self._request_sem = asyncio.Semaphore(
+            incremental.max_concurrent_requests if incremental is not None else 1
+        )
+        self._chunk_tasks: set[asyncio.Task[SpeechEvent]] = set()
 
     async def _metrics_monitor_task(self, event_aiter: AsyncIterable[SpeechEvent]) -> None:
         pass  # do nothing
@@ -108,9 +176,16 @@ class StreamAdapterWrapper(RecognizeStream):
 
         async def _recognize() -> None:
             """recognize speech from vad"""
+            utterance: _Utterance | None = None
             async for event in vad_stream:
                 if event.type == VADEventType.START_OF_SPEECH:
                     self._event_ch.send_nowait(SpeechEvent(SpeechEventType.START_OF_SPEECH))
+                    if self._incremental is not None:
+                        utterance = _Utterance()
+                        self._push_speech(utterance, event)
+                elif event.type == VADEventType.INFERENCE_DONE:
+                    if utterance is not None and event.frames:
+                        self._push_speech(utterance, event)
                 elif event.type == VADEventType.END_OF_SPEECH:
                     self._event_ch.send_nowait(
                         SpeechEvent(
@@ -118,22 +193,26 @@ class StreamAdapterWrapper(RecognizeStream):
                         )
                     )
 
-                    merged_frames = utils.merge_frames(event.frames)
-                    t_event = await self._wrapped_stt.recognize(
-                        buffer=merged_frames,
-                        language=self._language,
-                        conn_options=self._wrapped_stt_conn_options,
-                    )
+                    if utterance is not None and utterance.chunks:
+                        # only the audio since the last cut remains to be recognized
+                        speech_data = await self._recognize_last_chunk(utterance)
+                    else:
+                        merged_frames = utils.merge_frames(event.frames)
+                        t_event = await self._wrapped_stt.recognize(
+                            buffer=merged_frames,
+                            language=self._language,
+                            conn_options=self._wrapped_stt_conn_options,
+                        )
+                        speech_data = t_event.alternatives[0] if t_event.alternatives else None
 
-                    if len(t_event.alternatives) == 0:
-                        continue
-                    elif not t_event.alternatives[0].text:
+                    utterance = None
+                    if speech_data is None or not speech_data.text:
                         continue
 
                     self._event_ch.send_nowait(
                         SpeechEvent(
                             type=SpeechEventType.FINAL_TRANSCRIPT,
-                            alternatives=[t_event.alternatives[0]],
+                            alternatives=[speech_data],
                         )
                     )
 
@@ -144,5 +223,74 @@ class StreamAdapterWrapper(RecognizeStream):
         try:
             await asyncio.gather(*tasks)
         finally:
-            await utils.aio.cancel_and_wait(*tasks)
+            await utils.aio.cancel_and_wait(*tasks, *self._chunk_tasks)
             await vad_stream.aclose()
+
+    def _push_speech(self, utterance: _Utterance, event: VADEvent) -> None:
+        assert self._incremental is not None
+
+        utterance.frames.extend(event.frames)
+        utterance.duration += sum(frame.duration for frame in event.frames)
+        if event.raw_accumulated_silence < self._incremental.pause_duration:
+            utterance.speech_since_cut = True
+
+        if (
+            event.speaking
+            and utterance.speech_since_cut
+            and utterance.duration >= self._incremental.min_chunk_duration
+            and event.raw_accumulated_silence >= self._incremental.pause_duration
+        ):
+            task = asyncio.create_task(self._recognize_chunk(utterance.frames))
+            task.add_done_callback(lambda _: self._emit_interim(utterance))
+            task.add_done_callback(self._chunk_tasks.discard)
+            self._chunk_tasks.add(task)
+            utterance.chunks.append(task)
+            utterance.frames = []
+            utterance.duration = 0.0
+            utterance.speech_since_cut = False
+
+    async def _recognize_chunk(self, frames: list[rtc.AudioFrame]) -> SpeechEvent:
+        async with self._request_sem:
+            return await self._wrapped_stt.recognize(
+                buffer=utils.merge_frames(frames),
+                language=self._language,
+                conn_options=self._wrapped_stt_conn_options,
+            )
+
+    def _emit_interim(self, utterance: _Utterance) -> None:
+        # the text of the chunks recognized so far, in order
+        done = 0
+        for task in utterance.chunks:
+            if not task.done() or task.cancelled() or task.exception() is not None:
+                break
+            done += 1
+
+        if done <= utterance.interim_chunks:
+            return
+
+        utterance.interim_chunks = done
+        speech_data = _join_chunks([task.result() for task in utterance.chunks[:done]])
+        if speech_data is not None and speech_data.text:
+            self._event_ch.send_nowait(
+                SpeechEvent(type=SpeechEventType.INTERIM_TRANSCRIPT, alternatives=[speech_data])
+            )
+
+    async def _recognize_last_chunk(self, utterance: _Utterance) -> SpeechData | None:
+        chunks = list(utterance.chunks)
+        # nothing to recognize if the user didn't speak again after the last cut
+        if utterance.speech_since_cut:
+            last_chunk = asyncio.create_task(self._recognize_chunk(utterance.frames))
+            last_chunk.add_done_callback(self._chunk_tasks.discard)
+            self._chunk_tasks.add(last_chunk)
+            chunks.append(last_chunk)
+
+        return _join_chunks(await asyncio.gather(*chunks))
+
+
+def _join_chunks(events: list[SpeechEvent]) -> SpeechData | None:
+    alternatives = [ev.alternatives[0] for ev in events if ev.alternatives]
+    texts = [alt.text.strip() for alt in alternatives if alt.text.strip()]
+    if not alternatives:
+        return None
+
+    return dataclasses.replace(alternatives[-1], text=" ".join(texts))
@@ -278,6 +278,12 @@ class RecognizeStream(ABC):
         self._pushed_sr = 0
         self._resampler: rtc.AudioResampler | None = None
 
+    @property
+    def sample_rate(self) -> int | None:
+        """The sample rate the stream resamples its input to, None when it uses the native
+        rate of the frames"""
+        return self._needed_sr
+
     @abstractmethod
     async def _run(self) -> None: ...
 
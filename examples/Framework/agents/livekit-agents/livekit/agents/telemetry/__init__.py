@@ -1,4 +1,5 @@
 from . import http_server, metrics, trace_types, utils
+from .sampling import SampledBatchSpanProcessor, SpanExportStats
 from .traces import _setup_cloud_tracer, _upload_session_report, set_tracer_provider, tracer
 
 __all__ = [
@@ -7,6 +8,8 @@ __all__ = [
     "trace_types",
     "http_server",
     "set_tracer_provider",
+    "SampledBatchSpanProcessor",
+    "SpanExportStats",
     "utils",
     "_setup_cloud_tracer",
     "_upload_session_report",
@@ -12,6 +12,13 @@ PROC_INITIALIZE_TIME = prometheus_client.Histogram(
     buckets=[0.1, 0.5, 1, 2, 5, 10],
 )
 
+JOB_WAIT_FOR_PROCESS_TIME = prometheus_client.Histogram(
+    "lk_agents_job_wait_for_process_seconds",
+    "Time a job waited for an idle process before being launched",
+    ["nodename"],
+    buckets=[0.005, 0.01, 0.05, 0.1, 0.5, 1, 2, 5, 10],
+)
+
 # Use 'livesum' mode to aggregate active jobs across all processes
 # This sums the values from processes that are still running
 RUNNING_JOB_GAUGE = prometheus_client.Gauge(
@@ -29,6 +36,26 @@ CHILD_PROC_GAUGE = prometheus_client.Gauge(
     multiprocess_mode="max",
 )
 
+RECORDER_QUEUE_DEPTH_GAUGE = prometheus_client.Gauge(
+    "lk_agents_recorder_queue_depth",
+    "Recording chunks waiting for an encoder thread",
+    ["nodename"],
+    multiprocess_mode="livesum",
+)
+
+RECORDER_QUEUE_WAIT_TIME = prometheus_client.Histogram(
+    "lk_agents_recorder_queue_wait_seconds",
+    "Time a recording chunk waited for an encoder thread",
+    ["nodename"],
+    buckets=[0.01, 0.05, 0.1, 0.5, 1, 2.5, 5, 10],
+)
+
+RECORDER_DROPPED_CHUNKS = prometheus_client.Counter(
+    "lk_agents_recorder_dropped_chunks",
+    "Recording chunks dropped because the recording's encoder queue was full",
+    ["nodename"],
+)
+
 CPU_LOAD_GAUGE = prometheus_client.Gauge(
     "lk_agents_worker_load",
     "Worker load percentage",
@@ -61,3 +88,19 @@ def job_ended() -> None:
 
 def proc_initialized(*, time_elapsed: float) -> None:
     PROC_INITIALIZE_TIME.labels(nodename=utils.nodename()).observe(time_elapsed)
+
+
+def job_waited_for_process(*, time_elapsed: float) -> None:
+    JOB_WAIT_FOR_PROCESS_TIME.labels(nodename=utils.nodename()).observe(time_elapsed)
+
+
+def recorder_queue_depth_changed(delta: int) -> None:
+    RECORDER_QUEUE_DEPTH_GAUGE.labels(nodename=utils.nodename()).inc(delta)
+
+
+def recorder_chunk_dequeued(*, time_elapsed: float) -> None:
+    RECORDER_QUEUE_WAIT_TIME.labels(nodename=utils.nodename()).observe(time_elapsed)
+
+
+def recorder_chunk_dropped() -> None:
+    RECORDER_DROPPED_CHUNKS.labels(nodename=utils.nodename()).inc()
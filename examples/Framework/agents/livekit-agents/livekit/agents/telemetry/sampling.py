@@ -0,0 +1,309 @@
+from __future__ import annotations
+
+import collections
+import threading
+import time
+from collections.abc import Sequence
+from dataclasses import dataclass
+
+from opentelemetry import context as otel_context
+from opentelemetry.sdk.trace import ReadableSpan, Span, SpanProcessor
+from opentelemetry.sdk.trace.export import SpanExporter, SpanExportResult
+
+from ..log import logger
+from . import trace_types
+
+_TRACE_ID_MASK = (1 << 64) - 1
+# decisions of the finished traces, for the spans ending after their root span
+_MAX_FINISHED_TRACES = 1024
+
+
+@dataclass
+class SpanExportStats:
+    """Counters of a SampledBatchSpanProcessor, to measure the overhead it adds."""
+
+    spans_ended: int
+    """Spans ended while the processor was running."""
+    spans_exported: int
+    """Spans successfully handed to the exporter."""
+    spans_sampled_out: int
+    """Spans of the traces that were not sampled."""
+    spans_dropped: int
+    """Spans dropped because the export queue or a pending trace buffer was full."""
+    traces_kept: int
+    """Traces kept by the tail sampling (i.e. with a turn latency over the threshold)."""
+    export_batches: int
+    export_errors: int
+    record_time: float
+    """Total time spent in on_end, on the threads ending the spans (the event loop)."""
+    export_time: float
+    """Total time spent exporting, on the export thread."""
+
+    @property
+    def record_time_per_span(self) -> float:
+        return self.record_time / self.spans_ended if self.spans_ended else 0.0
+
+
+class SampledBatchSpanProcessor(SpanProcessor):
+    def __init__(
+        self,
+        span_exporter: SpanExporter,
+        *,
+        sample_rate: float = 1.0,
+        latency_threshold: float | None = 2.0,
+        latency_attributes: Sequence[str] = (trace_types.ATTR_E2E_LATENCY,),
+        max_queue_size: int = 2048,
+        max_export_batch_size: int = 512,
+        schedule_delay: float = 5.0,
+        max_pending_spans: int = 4096,
+    ) -> None:
+        """Span processor sampling the traces of the agent sessions and exporting them in batches.
+
+        Ending a span only appends it to a buffer, the spans are exported off the event loop by a
+        background thread. Every span of an agent session belongs to the same trace, so the
+        sampling is done per session:
+
+        - head sampling: ``sample_rate`` of the traces are kept, decided from the trace id
+        - tail sampling: the spans of the other traces are held until a span reports a turn
+          latency over ``latency_threshold`` (the whole trace is then kept), or until the root span
+          ends (the trace is then dropped)
+
+        e.g. ``sample_rate=0.01, latency_threshold=2.0`` keeps every session with a turn slower
+        than 2s and 1% of the rest. See ``stats`` for the overhead of the processor.
+
+        Args:
+            span_exporter (SpanExporter): The exporter the sampled spans are exported to.
+            sample_rate (float, optional): Ratio of the traces kept regardless of their latency.
+                Defaults to 1.0.
+            latency_threshold (float | None, optional): Keep the traces with a span whose latency
+                attribute is at least this value, in seconds. None disables the tail sampling.
+                Defaults to 2.0.
+            latency_attributes (Sequence[str], optional): The span attributes holding a turn
+                latency. Defaults to the end-to-end latency of the agent turns.
+            max_queue_size (int, optional): Spans waiting for the export, the spans ended when
+                it is full are dropped. Defaults to 2048.
+            max_export_batch_size (int, optional): Maximum spans per export. Defaults to 512.
+            schedule_delay (float, optional): Interval between two exports, in seconds.
+                Defaults to 5.0.
+            max_pending_spans (int, optional): Spans held per trace waiting for the tail sampling
+                decision, the oldest ones are dropped first. Defaults to 4096.
+        """
+        if not 0.0 <= sample_rate <= 1.0:
+            raise ValueError("sample_rate must be between 0 and 1")
+        if max_export_batch_size > max_queue_size:
+            raise ValueError("max_export_batch_size must be less than or equal to max_queue_size")
+
+        self._exporter = span_exporter
+        self._sample_bound = round(sample_rate * (1 << 64))
+        self._latency_threshold = latency_threshold
+        self._latency_attributes = tuple(latency_attributes)
+        self._max_queue_size = max_queue_size
+        self._max_export_batch_size = max_export_batch_size
+        self._schedule_delay = schedule_delay
+        self._max_pending_spans = max_pending_spans
+
+        # appending and popping are atomic, the threads ending the spans never wait for the export
+        self._queue: collections.deque[ReadableSpan] = collections.deque()
+        self._pending: dict[int, collections.deque[ReadableSpan]] = {}
+        self._tail_kept: set[int] = set()
+        self._finished: collections.OrderedDict[int, bool] = collections.OrderedDict()
+
+        self._spans_ended = 0
+        self._spans_exported = 0
+        self._spans_sampled_out = 0
+        self._spans_dropped = 0
+        self._traces_kept = 0
+        self._export_batches = 0
+        self._export_errors = 0
+        self._record_ns = 0
+        self._export_ns = 0
+
+        self._wakeup = threading.Event()
+        self._flush_requests: collections.deque[threading.Event] = collections.deque()
+        self._closed = False
+        self._thread = threading.Thread(
+            target=self._export_thread,
+            name="livekit_span_export",
+            daemon=True,
+        )
+        self._thread.start()
+
+    @property
+    def stats(self) -> SpanExportStats:
+        return SpanExportStats(
+            spans_ended=self._spans_ended,
+            spans_exported=self._spans_exported,
+            spans_sampled_out=self._spans_sampled_out,
+            spans_dropped=self._spans_dropped,
+            traces_kept=self._traces_kept,
+            export_batches=self._export_batches,
+            export_errors=self._export_errors,
+            record_time=self._record_ns / 1e9,
+            export_time=self._export_ns / 1e9,
+        )
+
+    def on_start(self, span: Span, parent_context: otel_context.Context | None = None) -> None:
+        pass
+
+    def on_end(self, span: ReadableSpan) -> None:
+        start = time.perf_counter_ns()
+        try:
+            self._record(span)
+        finally:
+            self._spans_ended += 1
+            self._record_ns += time.perf_counter_ns() - start
+
+    def _record(self, span: ReadableSpan) -> None:
+        span_context = span.context
+        if self._closed or span_context is None or not span_context.trace_flags.sampled:
+            return
+
+        trace_id = span_context.trace_id
+        if (trace_id & _TRACE_ID_MASK) < self._sample_bound:
+            self._enqueue(span)
+            return
+
+        if trace_id in self._tail_kept:
+            self._enqueue(span)
+            if _is_root(span):
+                self._tail_kept.discard(trace_id)
+                self._finish(trace_id, True)
+            return
+
+        if self._latency_threshold is None:
+            self._spans_sampled_out += 1
+            return
+
+        decision = self._finished.get(trace_id)
+        if decision is not None:
+            if decision:
+                self._enqueue(span)
+            else:
+                self._spans_sampled_out += 1
+            return
+
+        if self._is_slow(span):
+            self._traces_kept += 1
+            pending = self._pending.pop(trace_id, None)
+            if pending is not None:
+                for pending_span in pending:
+                    self._enqueue(pending_span)
+            self._enqueue(span)
+            if _is_root(span):
+                self._finish(trace_id, True)
+            else:
+                self._tail_kept.add(trace_id)
+            return
+
+        if _is_root(span):
+            pending = self._pending.pop(trace_id, None)
+            self._spans_sampled_out += 1 + (len(pending) if pending is not None else 0)
+            self._finish(trace_id, False)
+            return
+
+        pending = self._pending.get(trace_id)
+        if pending is None:
+            pending = self._pending[trace_id] = collections.deque(maxlen=self._max_pending_spans)
+        elif len(pending) == self._max_pending_spans:
+            self._spans_dropped += 1
+
+        pending.append(span)
+
+    def _is_slow(self, span: ReadableSpan) -> bool:
+        attrs = span.attributes
+        if not attrs:
+            return False
+
+        assert self._latency_threshold is not None
+        for key in self._latency_attributes:
+            value = attrs.get(key)
+            if isinstance(value, (int, float)) and value >= self._latency_threshold:
+                return True
+
+        return False
+
+    def _finish(self, trace_id: int, kept: bool) -> None:
+        self._finished[trace_id] = kept
+        if len(self._finished) > _MAX_FINISHED_TRACES:
+            self._finished.popitem(last=False)
+
+    def _enqueue(self, span: ReadableSpan) -> None:
+        queue_size = len(self._queue)
+        if queue_size >= self._max_queue_size:
+            self._spans_dropped += 1
+            return
+
+        self._queue.append(span)
+        if queue_size + 1 == self._max_export_batch_size:
+            self._wakeup.set()
+
+    def _export_thread(self) -> None:
+        while not self._closed:
+            self._wakeup.wait(self._schedule_delay)
+            self._wakeup.clear()
+
+            # the flush requests made before this export are done once it returns
+            n_flush = len(self._flush_requests)
+            self._export_queued()
+            for _ in range(n_flush):
+                self._flush_requests.popleft().set()
+
+    def _export_queued(self) -> None:
+        while self._queue:
+            batch: list[ReadableSpan] = []
+            try:
+                while len(batch) < self._max_export_batch_size:
+                    batch.append(self._queue.popleft())
+            except IndexError:
+                pass
+
+            start = time.perf_counter_ns()
+            try:
+                result = self._exporter.export(batch)
+            except Exception:
+                logger.exception("failed to export spans")
+                result = SpanExportResult.FAILURE
+
+            self._export_ns += time.perf_counter_ns() - start
+            self._export_batches += 1
+            if result == SpanExportResult.SUCCESS:
+                self._spans_exported += len(batch)
+            else:
+                self._export_errors += 1
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        if self._closed:
+            return True
+
+        flushed = threading.Event()
+        self._flush_requests.append(flushed)
+        self._wakeup.set()
+        return flushed.wait(timeout_millis / 1000)
+
+    def shutdown(self) -> None:
+        if self._closed:
+            return
+
+        self._closed = True
+        self._wakeup.set()
+        self._thread.join()
+        self._export_queued()
+        self._exporter.shutdown()
+
+        stats = self.stats
+        logger.debug(
+            "span export stopped",
+            extra={
+                "spans_ended": stats.spans_ended,
+                "spans_exported": stats.spans_exported,
+                "spans_sampled_out": stats.spans_sampled_out,
+                "spans_dropped": stats.spans_dropped,
+                "export_errors": stats.export_errors,
+                "record_time_per_span_us": round(stats.record_time_per_span * 1e6, 2),
+                "export_time": round(stats.export_time, 3),
+            },
+        )
+
+
+def _is_root(span: ReadableSpan) -> bool:
+    return span.parent is None or span.parent.is_remote
@@ -19,6 +19,7 @@ ATTR_SESSION_OPTIONS = "lk.session_options"
 ATTR_USER_INPUT = "lk.user_input"
 ATTR_INSTRUCTIONS = "lk.instructions"
 ATTR_SPEECH_INTERRUPTED = "lk.interrupted"
+ATTR_E2E_LATENCY = "lk.e2e_latency"
 
 # llm node
 ATTR_CHAT_CTX = "lk.chat_ctx"
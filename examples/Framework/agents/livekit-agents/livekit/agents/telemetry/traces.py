@@ -25,7 +25,6 @@ from opentelemetry.sdk._logs import (
 from opentelemetry.sdk._logs.export import BatchLogRecordProcessor
 from opentelemetry.sdk.resources import SERVICE_NAME, Resource
 from opentelemetry.sdk.trace import SpanProcessor, TracerProvider
-from opentelemetry.sdk.trace.export import BatchSpanProcessor
 from opentelemetry.trace import Span, TraceFlags, Tracer
 from opentelemetry.util._decorator import _agnosticcontextmanager
 from opentelemetry.util.types import AttributeValue
@@ -34,6 +33,7 @@ from livekit import api
 from livekit.protocol import agent_pb, metrics as proto_metrics
 
 from ..log import logger
+from .sampling import SampledBatchSpanProcessor
 
 if TYPE_CHECKING:
     from ..llm import ChatItem
@@ -145,7 +145,7 @@ def _setup_cloud_tracer(*, room_id: str, job_id: str, cloud_hostname: str) -> No
     )
 
     tracer_provider.add_span_processor(_MetadataSpanProcessor(metadata))
-    tracer_provider.add_span_processor(BatchSpanProcessor(span_exporter))
+    tracer_provider.add_span_processor(SampledBatchSpanProcessor(span_exporter))
 
     logger_provider = LoggerProvider()
     set_logger_provider(logger_provider)
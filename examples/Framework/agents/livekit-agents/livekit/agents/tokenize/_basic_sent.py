@@ -1,5 +1,35 @@
 import re
 
+_alphabets = r"([A-Za-z])"
+_prefixes = r"(Mr|St|Mrs|Ms|Dr)[.]"
+_suffixes = r"(Inc|Ltd|Jr|Sr|Co)"
+_starters = r"(Mr|Mrs|Ms|Dr|Prof|Capt|Cpt|Lt|He\s|She\s|It\s|They\s|Their\s|Our\s|We\s|But\s|However\s|That\s|This\s|Wherever)"  # noqa: E501
+_acronyms = r"([A-Z][.][A-Z][.](?:[A-Z][.])?)"
+_websites = r"[.](com|net|org|io|gov|edu|me)"
+_digits = r"([0-9])"
+
+# compiled once, split_sentences is called on every push of a streamed sentence tokenizer
+# fmt: off
+_PREFIXES_RE = re.compile(_prefixes)
+_WEBSITES_RE = re.compile(_websites)
+_DIGITS_RE = re.compile(_digits + "[.]" + _digits)
+_MULTIPLE_DOTS_RE = re.compile(r"\.{2,}")
+_SINGLE_LETTER_RE = re.compile(r"\s" + _alphabets + "[.] ")
+_ACRONYM_STARTERS_RE = re.compile(_acronyms + " " + _starters)
+_ALPHABETS_3_RE = re.compile(_alphabets + "[.]" + _alphabets + "[.]" + _alphabets + "[.]")
+_ALPHABETS_2_RE = re.compile(_alphabets + "[.]" + _alphabets + "[.]")
+_SUFFIX_STARTERS_RE = re.compile(r" " + _suffixes + "[.] " + _starters)
+_SUFFIXES_RE = re.compile(r" " + _suffixes + "[.]")
+_LETTER_RE = re.compile(r" " + _alphabets + "[.]")
+_QUOTED_STOP_RE = re.compile(r"([.!?。！？])([\"”])")
+_STOP_RE = re.compile(r"([.!?。！？])(?![\"”])")
+# fmt: on
+
+# split_sentences can only break the text after one of these characters, and looks at most
+# BOUNDARY_CTX_LEN characters past them to decide (e.g. "U.S.A. However")
+BOUNDARY_CANDIDATE_RE = re.compile(r"[.!?。！？\n]")
+BOUNDARY_CTX_LEN = 32
+
 
 # rule based segmentation based on https://stackoverflow.com/a/31505798, works surprisingly well
 def split_sentences(
@@ -8,14 +38,6 @@ def split_sentences(
     """
     the text may not contain substrings "<prd>" or "<stop>"
     """
-    alphabets = r"([A-Za-z])"
-    prefixes = r"(Mr|St|Mrs|Ms|Dr)[.]"
-    suffixes = r"(Inc|Ltd|Jr|Sr|Co)"
-    starters = r"(Mr|Mrs|Ms|Dr|Prof|Capt|Cpt|Lt|He\s|She\s|It\s|They\s|Their\s|Our\s|We\s|But\s|However\s|That\s|This\s|Wherever)"  # noqa: E501
-    acronyms = r"([A-Z][.][A-Z][.](?:[A-Z][.])?)"
-    websites = r"[.](com|net|org|io|gov|edu|me)"
-    digits = r"([0-9])"
-    multiple_dots = r"\.{2,}"
 
     # fmt: off
     if retain_format:
@@ -23,26 +45,26 @@ def split_sentences(
     else:
         text = text.replace("\n"," ")
 
-    text = re.sub(prefixes,"\\1<prd>", text)
-    text = re.sub(websites,"<prd>\\1", text)
-    text = re.sub(digits + "[.]" + digits,"\\1<prd>\\2",text)
+    text = _PREFIXES_RE.sub("\\1<prd>", text)
+    text = _WEBSITES_RE.sub("<prd>\\1", text)
+    text = _DIGITS_RE.sub("\\1<prd>\\2",text)
     # text = re.sub(multiple_dots, lambda match: "<prd>" * len(match.group(0)) + "<stop>", text)
     # TODO(theomonnom): need improvement for ""..." dots", check capital + next sentence should not be  # noqa: E501
     # small
-    text = re.sub(multiple_dots, lambda match: "<prd>" * len(match.group(0)), text)
+    text = _MULTIPLE_DOTS_RE.sub(lambda match: "<prd>" * len(match.group(0)), text)
     if "Ph.D" in text:
         text = text.replace("Ph.D.","Ph<prd>D<prd>")
-    text = re.sub(r"\s" + alphabets + "[.] "," \\1<prd> ",text)
-    text = re.sub(acronyms+" "+starters,"\\1<stop> \\2",text)
-    text = re.sub(alphabets + "[.]" + alphabets + "[.]" + alphabets + "[.]","\\1<prd>\\2<prd>\\3<prd>",text)  # noqa: E501
-    text = re.sub(alphabets + "[.]" + alphabets + "[.]","\\1<prd>\\2<prd>",text)
-    text = re.sub(r" "+suffixes+"[.] "+starters," \\1<stop> \\2",text)
-    text = re.sub(r" "+suffixes+"[.]"," \\1<prd>",text)
-    text = re.sub(r" " + alphabets + "[.]"," \\1<prd>",text)
+    text = _SINGLE_LETTER_RE.sub(" \\1<prd> ",text)
+    text = _ACRONYM_STARTERS_RE.sub("\\1<stop> \\2",text)
+    text = _ALPHABETS_3_RE.sub("\\1<prd>\\2<prd>\\3<prd>",text)
+    text = _ALPHABETS_2_RE.sub("\\1<prd>\\2<prd>",text)
+    text = _SUFFIX_STARTERS_RE.sub(" \\1<stop> \\2",text)
+    text = _SUFFIXES_RE.sub(" \\1<prd>",text)
+    text = _LETTER_RE.sub(" \\1<prd>",text)
 
     # mark end of sentence punctuations with <stop>
-    text = re.sub(r"([.!?。！？])([\"”])", "\\1\\2<stop>", text)
-    text = re.sub(r"([.!?。！？])(?![\"”])", "\\1<stop>", text)
+    text = _QUOTED_STOP_RE.sub("\\1\\2<stop>", text)
+    text = _STOP_RE.sub("\\1<stop>", text)
 
     text = text.replace("<prd>",".")
     # fmt: on
@@ -66,6 +66,8 @@ class SentenceTokenizer(tokenizer.SentenceTokenizer):
             ),
             min_token_len=self._config.min_sentence_len,
             min_ctx_len=self._config.stream_context_len,
+            boundary_re=_basic_sent.BOUNDARY_CANDIDATE_RE,
+            boundary_ctx_len=_basic_sent.BOUNDARY_CTX_LEN,
         )
 
 
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import re
 import typing
 from typing import Callable, Union
 
@@ -10,6 +11,8 @@ from .tokenizer import SentenceStream, TokenData, WordStream
 # If the start and end indices are not available, we attempt to locate the token within the text using str.find.  # noqa: E501
 TokenizeCallable = Callable[[str], Union[list[str], list[tuple[str, int, int]]]]
 
+_WHITESPACE_RE = re.compile(r"\s*")
+
 
 class BufferedTokenStream:
     def __init__(
@@ -19,17 +22,29 @@ class BufferedTokenStream:
         min_token_len: int,
         min_ctx_len: int,
         retain_format: bool = False,
+        boundary_re: re.Pattern[str] | None = None,
+        boundary_ctx_len: int = 0,
     ) -> None:
+        """
+        Args:
+            boundary_re: when set, the tokenizer can only split the text after a match of this
+                pattern. The buffer is then only tokenized again once a new candidate was pushed.
+            boundary_ctx_len: number of characters after a candidate the tokenizer looks at to
+                decide if it is a boundary (e.g. "Mr." or "2.5").
+        """
         self._event_ch = aio.Chan[TokenData]()
         self._tokenize_fnc = tokenize_fnc
         self._min_ctx_len = min_ctx_len
         self._min_token_len = min_token_len
         self._retain_format = retain_format
+        self._boundary_re = boundary_re
+        self._boundary_ctx_len = boundary_ctx_len
         self._current_segment_id = shortuuid()
 
         self._buf_tokens: list[str] = []  # <= min_token_len
         self._in_buf = ""
         self._out_buf = ""
+        self._scan_pos = 0  # no boundary candidate can start before this index of _in_buf
 
     @typing.no_type_check
     def push_text(self, text: str) -> None:
@@ -39,20 +54,28 @@ class BufferedTokenStream:
         if len(self._in_buf) < self._min_ctx_len:
             return
 
-        while True:
-            tokens = self._tokenize_fnc(self._in_buf)
-            if len(tokens) <= 1:
-                break
+        if self._boundary_re is not None:
+            if self._boundary_re.search(self._in_buf, self._scan_pos) is None:
+                self._scan_pos = len(self._in_buf)
+                return
 
+        # tokenize the pending text once and emit everything but the last token, which may
+        # still grow with the next pushes
+        tokens = self._tokenize_fnc(self._in_buf)
+        pos = 0
+        for tok in tokens[:-1]:
             if self._out_buf:
                 self._out_buf += " "
 
-            tok = tokens.pop(0)
-            tok_text = tok
             if isinstance(tok, tuple):
-                tok_text = tok[0]
+                self._out_buf += tok[0]
+                pos = tok[2]
+            else:
+                self._out_buf += tok
+                tok_i = self._in_buf.find(tok, pos)
+                pos = (tok_i if tok_i >= 0 else pos) + len(tok)
+                pos = _WHITESPACE_RE.match(self._in_buf, pos).end()
 
-            self._out_buf += tok_text
             if len(self._out_buf) >= self._min_token_len:
                 self._event_ch.send_nowait(
                     TokenData(token=self._out_buf, segment_id=self._current_segment_id)
@@ -60,11 +83,14 @@ class BufferedTokenStream:
 
                 self._out_buf = ""
 
-            if isinstance(tok, tuple):
-                self._in_buf = self._in_buf[tok[2] :]
-            else:
-                tok_i = max(self._in_buf.find(tok), 0)
-                self._in_buf = self._in_buf[tok_i + len(tok) :].lstrip()
+        if pos:
+            self._in_buf = self._in_buf[pos:]
+
+        if self._boundary_re is not None:
+            # the remaining candidates didn't split the text, only the ones close to its end can
+            # still become a boundary once more text is pushed
+            end = len(self._in_buf.rstrip())
+            self._scan_pos = max(0, end - self._boundary_ctx_len)
 
     @typing.no_type_check
     def flush(self) -> None:
@@ -89,6 +115,7 @@ class BufferedTokenStream:
         self._current_segment_id = shortuuid()
         self._in_buf = ""
         self._out_buf = ""
+        self._scan_pos = 0
 
     def end_input(self) -> None:
         self.flush()
@@ -116,11 +143,15 @@ class BufferedSentenceStream(BufferedTokenStream, SentenceStream):
         tokenizer: TokenizeCallable,
         min_token_len: int,
         min_ctx_len: int,
+        boundary_re: re.Pattern[str] | None = None,
+        boundary_ctx_len: int = 0,
     ) -> None:
         super().__init__(
             tokenize_fnc=tokenizer,
             min_token_len=min_token_len,
             min_ctx_len=min_ctx_len,
+            boundary_re=boundary_re,
+            boundary_ctx_len=boundary_ctx_len,
         )
 
 
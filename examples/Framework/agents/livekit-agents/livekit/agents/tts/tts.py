@@ -778,33 +778,74 @@ class AudioEmitter:
         debug_frames: list[rtc.AudioFrame] = []
         timed_transcripts: list[TimedString] = []
 
+        # single deadline for the slow generation flush, the timer isn't re-armed for every frame
+        # but only when it fires before the deadline (which moves later with every frame sent)
+        flush_deadline: float | None = None
         flush_timer: asyncio.TimerHandle | None = None
         sent_start: float | None = None
         sent_duration: float = 0.0
         event_loop = asyncio.get_event_loop()
 
+        # one re-chunker reused by every segment and decoder, cleared when a segment starts and
+        # when a decoder stops so the bytes left by a failed segment don't leak into the next one
+        rechunker: audio.AudioByteStream | None = None
+        rechunker_format: tuple[int, int] | None = None
+
+        def _rechunker(sample_rate: int, num_channels: int) -> audio.AudioByteStream:
+            nonlocal rechunker, rechunker_format
+            if rechunker is None or rechunker_format != (sample_rate, num_channels):
+                rechunker_format = (sample_rate, num_channels)
+                rechunker = audio.AudioByteStream(
+                    sample_rate=sample_rate,
+                    num_channels=num_channels,
+                    samples_per_channel=int(sample_rate // 1000 * self._frame_size_ms),
+                )
+            return rechunker
+
+        def _on_flush_timer() -> None:
+            nonlocal flush_timer, flush_deadline
+            flush_timer = None
+            if flush_deadline is None:
+                return
+
+            if event_loop.time() < flush_deadline:
+                flush_timer = event_loop.call_at(flush_deadline, _on_flush_timer)
+                return
+
+            flush_deadline = None
+            self.flush()
+            logger.debug("flush audio emitter due to slow audio generation")
+
         def _send_audio(ev: SynthesizedAudio, *, flush_if_delayed: bool = False) -> None:
-            nonlocal sent_start, sent_duration, flush_timer
+            nonlocal sent_start, sent_duration, flush_timer, flush_deadline
 
             self._dst_ch.send_nowait(ev)
             if sent_start is None:
                 sent_start = event_loop.time()
             sent_duration += ev.frame.duration
 
-            if flush_timer is not None:
-                flush_timer.cancel()
-
-            def _flush() -> None:
-                self.flush()
-                logger.debug("flush audio emitter due to slow audio generation")
+            if not flush_if_delayed:
+                flush_deadline = None
+                return
 
-            if flush_if_delayed:
-                # force flush the buffer if the audio comes slower than realtime
-                delay = sent_duration - (event_loop.time() - sent_start) - 0.02
-                flush_timer = event_loop.call_later(delay, _flush)
+            # force flush the buffer if the audio comes slower than realtime
+            flush_deadline = sent_start + sent_duration - 0.02
+            if flush_timer is not None and flush_timer.when() > flush_deadline:
+                # the deadline moved earlier (sent_start is reset by a flush)
+                flush_timer.cancel()
+                flush_timer = None
+            if flush_timer is None:
+                flush_timer = event_loop.call_at(flush_deadline, _on_flush_timer)
+
+        def _attach_transcripts(frame: rtc.AudioFrame) -> None:
+            nonlocal timed_transcripts
+            # most TTS don't push timed transcripts, the consumers default to an empty list
+            if timed_transcripts:
+                frame.userdata[USERDATA_TIMED_TRANSCRIPT] = timed_transcripts
+                timed_transcripts = []
 
         def _emit_frame(frame: rtc.AudioFrame | None = None, *, is_final: bool = False) -> None:
-            nonlocal last_frame, segment_ctx, timed_transcripts
+            nonlocal last_frame, segment_ctx
             assert segment_ctx is not None
 
             if last_frame is None:
@@ -828,7 +869,7 @@ class AudioEmitter:
                         if lk_dump_tts:
                             debug_frames.append(frame)
 
-                    frame.userdata[USERDATA_TIMED_TRANSCRIPT] = timed_transcripts
+                    _attach_transcripts(frame)
                     _send_audio(
                         SynthesizedAudio(
                             frame=frame,
@@ -838,11 +879,10 @@ class AudioEmitter:
                         ),
                         flush_if_delayed=False,
                     )
-                    timed_transcripts = []
                     return
 
             if last_frame is not None:
-                last_frame.userdata[USERDATA_TIMED_TRANSCRIPT] = timed_transcripts
+                _attach_transcripts(last_frame)
                 _send_audio(
                     SynthesizedAudio(
                         frame=last_frame,
@@ -852,7 +892,6 @@ class AudioEmitter:
                     ),
                     flush_if_delayed=not is_final,
                 )
-                timed_transcripts = []
                 segment_ctx.audio_duration += last_frame.duration
                 self._audio_durations[-1] += last_frame.duration
 
@@ -862,14 +901,14 @@ class AudioEmitter:
             last_frame = frame
 
         def _flush_frame() -> None:
-            nonlocal last_frame, segment_ctx, timed_transcripts
-            nonlocal flush_timer, sent_start, sent_duration
+            nonlocal last_frame, segment_ctx
+            nonlocal sent_start, sent_duration
             assert segment_ctx is not None
 
             if last_frame is None:
                 return
 
-            last_frame.userdata[USERDATA_TIMED_TRANSCRIPT] = timed_transcripts
+            _attach_transcripts(last_frame)
             _send_audio(
                 SynthesizedAudio(
                     frame=last_frame,
@@ -879,7 +918,6 @@ class AudioEmitter:
                 ),
                 flush_if_delayed=False,  # don't flush again before new frames are pushed
             )
-            timed_transcripts = []
             segment_ctx.audio_duration += last_frame.duration
             self._audio_durations[-1] += last_frame.duration
 
@@ -890,9 +928,6 @@ class AudioEmitter:
             # reset sent duration after flush
             sent_start = None
             sent_duration = 0.0
-            if flush_timer is not None:
-                flush_timer.cancel()
-                flush_timer = None
 
         def dump_segment() -> None:
             nonlocal segment_ctx
@@ -919,19 +954,19 @@ class AudioEmitter:
             assert audio_decoder is not None
 
             audio_byte_stream: audio.AudioByteStream | None = None
-            async for frame in audio_decoder:
-                if audio_byte_stream is None:
-                    audio_byte_stream = audio.AudioByteStream(
-                        sample_rate=frame.sample_rate,
-                        num_channels=frame.num_channels,
-                        samples_per_channel=int(frame.sample_rate // 1000 * self._frame_size_ms),
-                    )
-                for f in audio_byte_stream.push(frame.data):
-                    _emit_frame(f)
-
-            if audio_byte_stream:
-                for f in audio_byte_stream.flush():
-                    _emit_frame(f)
+            try:
+                async for frame in audio_decoder:
+                    if audio_byte_stream is None:
+                        audio_byte_stream = _rechunker(frame.sample_rate, frame.num_channels)
+                    for f in audio_byte_stream.push(frame.data):
+                        _emit_frame(f)
+
+                if audio_byte_stream:
+                    for f in audio_byte_stream.flush():
+                        _emit_frame(f)
+            finally:
+                if audio_byte_stream:
+                    audio_byte_stream.clear()
 
             await audio_decoder.aclose()
 
@@ -948,6 +983,8 @@ class AudioEmitter:
                             "start_segment() called before the previous segment was ended"
                         )
 
+                    if rechunker:
+                        rechunker.clear()
                     self._audio_durations.append(0.0)
                     segment_ctx = AudioEmitter._SegmentContext(segment_id=data.segment_id)
                     continue
@@ -964,13 +1001,7 @@ class AudioEmitter:
                 if self._is_raw_pcm:
                     if isinstance(data, bytes):
                         if audio_byte_stream is None:
-                            audio_byte_stream = audio.AudioByteStream(
-                                sample_rate=self._sample_rate,
-                                num_channels=self._num_channels,
-                                samples_per_channel=int(
-                                    self._sample_rate // 1000 * self._frame_size_ms
-                                ),
-                            )
+                            audio_byte_stream = _rechunker(self._sample_rate, self._num_channels)
 
                         for f in audio_byte_stream.push(data):
                             _emit_frame(f)
@@ -1,7 +1,10 @@
 from __future__ import annotations
 
 import asyncio
+import collections
+import contextlib
 import ctypes
+import time
 from collections.abc import AsyncGenerator
 from typing import Union
 
@@ -101,20 +104,27 @@ class AudioByteStream:
         """
         self._buf.extend(data)
 
-        frames = []
-        while len(self._buf) >= self._bytes_per_frame:
-            frame_data = self._buf[: self._bytes_per_frame]
-            self._buf = self._buf[self._bytes_per_frame :]
+        n_frames = len(self._buf) // self._bytes_per_frame
+        if n_frames == 0:
+            return []
 
+        # read the frames at an offset and drop the consumed bytes once per push, instead of
+        # reallocating the rest of the buffer for every frame. (AudioFrame copies its data anyway,
+        # and is slower to build from a memoryview than from a small bytearray slice)
+        bpf = self._bytes_per_frame
+        frames = []
+        for offset in range(0, n_frames * bpf, bpf):
             frames.append(
                 rtc.AudioFrame(
-                    data=frame_data,
+                    data=self._buf[offset : offset + bpf],
                     sample_rate=self._sample_rate,
                     num_channels=self._num_channels,
-                    samples_per_channel=len(frame_data) // self._bytes_per_sample,
+                    samples_per_channel=bpf // self._bytes_per_sample,
                 )
             )
 
+        # deleting the front of a bytearray only moves its start, the remainder is < 1 frame
+        del self._buf[: n_frames * bpf]
         return frames
 
     write = push  # Alias for the push method.
@@ -144,10 +154,10 @@ class AudioByteStream:
 
         frames = [
             rtc.AudioFrame(
-                data=self._buf.copy(),
+                data=self._buf,
                 sample_rate=self._sample_rate,
                 num_channels=self._num_channels,
-                samples_per_channel=len(self._buf) // 2,
+                samples_per_channel=len(self._buf) // self._bytes_per_sample,
             )
         ]
         self._buf.clear()
@@ -157,6 +167,210 @@ class AudioByteStream:
         self._buf.clear()
 
 
+class _ResampledStream:
+    # the hub audio resampled to one sample rate, shared by every subscription needing it
+    def __init__(self, sample_rate: int, first_seq: int) -> None:
+        self.sample_rate = sample_rate
+        self.resampler: rtc.AudioResampler | None = None
+        self.input_rate = 0
+        self.first_seq = first_seq  # seq of outputs[0]
+        self.outputs: collections.deque[list[rtc.AudioFrame]] = collections.deque()
+
+
+class AudioHub:
+    """
+    Fan out an audio stream to several consumers, resampling it once per distinct sample rate.
+
+    Each consumer subscribes with the sample rate it needs (or None to receive the frames as they
+    are pushed). The consumers needing the same sample rate share one resampler and receive the
+    same frames, they must not modify them. The frames are resampled when the first consumer
+    reads them, so a consumer can still change its sample rate before reading the frames
+    already queued for it.
+    """
+
+    def __init__(
+        self,
+        *,
+        quality: rtc.AudioResamplerQuality = rtc.AudioResamplerQuality.HIGH,
+        lag_warning_threshold: float = 2.0,
+    ) -> None:
+        """
+        Parameters:
+            quality (rtc.AudioResamplerQuality): The quality of the shared resamplers.
+            lag_warning_threshold (float): Log a warning when a consumer hasn't read the frames
+                pushed more than this many seconds ago.
+        """
+        self._quality = quality
+        self._lag_warning_threshold = lag_warning_threshold
+        # (frame, monotonic time it was pushed at), frames[0] is at seq _first_seq
+        self._frames: collections.deque[tuple[rtc.AudioFrame, float]] = collections.deque()
+        self._first_seq = 0
+        self._next_seq = 0
+        self._subscriptions: list[AudioHubSubscription] = []
+        self._resampled: dict[int, _ResampledStream] = {}
+
+    def subscribe(self, name: str, *, sample_rate: int | None = None) -> AudioHubSubscription:
+        """
+        Subscribe to the frames pushed from now on.
+
+        Parameters:
+            name (str): Name of the consumer, used to report its lag.
+            sample_rate (int, optional): The sample rate the frames are resampled to.
+                None to receive the pushed frames unchanged.
+        """
+        sub = AudioHubSubscription(self, name, sample_rate, self._next_seq)
+        self._subscriptions.append(sub)
+        return sub
+
+    def push(self, frame: rtc.AudioFrame) -> None:
+        if not self._subscriptions:
+            return
+
+        now = time.monotonic()
+        self._frames.append((frame, now))
+        self._next_seq += 1
+        for sub in self._subscriptions:
+            sub._wake()
+
+            lagging = now - self._frames[sub._cursor - self._first_seq][1] > (
+                self._lag_warning_threshold
+            )
+            if lagging and not sub._lagging:
+                logger.warning(
+                    "audio consumer is lagging behind",
+                    extra={"consumer": sub.name, "lag": round(sub.lag, 3)},
+                )
+            sub._lagging = lagging
+
+    def lag(self) -> dict[str, float]:
+        """The lag of every consumer, in seconds (see AudioHubSubscription.lag)."""
+        return {sub.name: sub.lag for sub in self._subscriptions}
+
+    def close(self) -> None:
+        for sub in list(self._subscriptions):
+            sub.close()
+
+    def _read(self, seq: int, sample_rate: int | None) -> list[rtc.AudioFrame]:
+        frame = self._frames[seq - self._first_seq][0]
+        if sample_rate is None or sample_rate == frame.sample_rate:
+            return [frame]
+
+        stream = self._resampled.get(sample_rate)
+        if stream is None or seq < stream.first_seq:
+            # the first consumer of this sample rate (or one switching to it with frames older
+            # than the ones already resampled): restart the shared resampler at this frame
+            stream = self._resampled[sample_rate] = _ResampledStream(sample_rate, seq)
+
+        next_seq = stream.first_seq + len(stream.outputs)
+        while next_seq <= seq:
+            frame = self._frames[next_seq - self._first_seq][0]
+            if frame.sample_rate == sample_rate:
+                stream.outputs.append([frame])
+            else:
+                if stream.resampler is None or stream.input_rate != frame.sample_rate:
+                    stream.input_rate = frame.sample_rate
+                    stream.resampler = rtc.AudioResampler(
+                        frame.sample_rate, sample_rate, quality=self._quality
+                    )
+                stream.outputs.append(stream.resampler.push(frame))
+            next_seq += 1
+
+        return stream.outputs[seq - stream.first_seq]
+
+    def _release(self) -> None:
+        # drop the frames read by every consumer
+        min_seq = min((sub._cursor for sub in self._subscriptions), default=self._next_seq)
+        while self._first_seq < min_seq:
+            self._frames.popleft()
+            self._first_seq += 1
+
+        for stream in self._resampled.values():
+            while stream.first_seq < min_seq and stream.outputs:
+                stream.outputs.popleft()
+                stream.first_seq += 1
+
+            if not stream.outputs:
+                # nobody read the frames at this sample rate, resume at the oldest frame kept
+                stream.first_seq = max(stream.first_seq, min_seq)
+
+    def _unsubscribe(self, sub: AudioHubSubscription) -> None:
+        with contextlib.suppress(ValueError):
+            self._subscriptions.remove(sub)
+        self._release()
+
+
+class AudioHubSubscription:
+    """The frames of an AudioHub read by one consumer, as an async iterator."""
+
+    def __init__(self, hub: AudioHub, name: str, sample_rate: int | None, seq: int) -> None:
+        self._hub = hub
+        self._name = name
+        self._sample_rate = sample_rate
+        self._cursor = seq  # seq of the next hub frame to read
+        self._ready: collections.deque[rtc.AudioFrame] = collections.deque()
+        self._waiter: asyncio.Future[None] | None = None
+        self._closed = False
+        self._lagging = False
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def sample_rate(self) -> int | None:
+        return self._sample_rate
+
+    def set_sample_rate(self, sample_rate: int | None) -> None:
+        """Change the sample rate of the frames not read yet."""
+        self._sample_rate = sample_rate
+
+    @property
+    def lag(self) -> float:
+        """Time since the oldest frame not read yet was pushed to the hub, in seconds."""
+        hub = self._hub
+        if self._closed or self._cursor >= hub._next_seq:
+            return 0.0
+
+        return time.monotonic() - hub._frames[self._cursor - hub._first_seq][1]
+
+    def close(self) -> None:
+        if self._closed:
+            return
+
+        self._closed = True
+        self._ready.clear()
+        self._hub._unsubscribe(self)
+        self._wake()
+
+    def _wake(self) -> None:
+        if self._waiter is not None and not self._waiter.done():
+            self._waiter.set_result(None)
+
+    def __aiter__(self) -> AudioHubSubscription:
+        return self
+
+    async def __anext__(self) -> rtc.AudioFrame:
+        hub = self._hub
+        while True:
+            if self._ready:
+                return self._ready.popleft()
+
+            if self._closed:
+                raise StopAsyncIteration
+
+            if self._cursor < hub._next_seq:
+                self._ready.extend(hub._read(self._cursor, self._sample_rate))
+                self._cursor += 1
+                hub._release()
+                continue
+
+            self._waiter = asyncio.get_running_loop().create_future()
+            try:
+                await self._waiter
+            finally:
+                self._waiter = None
+
+
 async def audio_frames_from_file(
     file_path: str, sample_rate: int = 48000, num_channels: int = 1
 ) -> AsyncGenerator[rtc.AudioFrame, None]:
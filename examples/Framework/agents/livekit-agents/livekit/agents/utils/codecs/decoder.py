@@ -15,12 +15,11 @@
 from __future__ import annotations
 
 import asyncio
-import io
 import struct
 import threading
+from collections import deque
 from collections.abc import AsyncIterator
-from concurrent.futures import ThreadPoolExecutor
-from typing import cast
+from typing import Callable, cast
 
 import av
 import av.container
@@ -66,46 +65,69 @@ class StreamBuffer:
     """
     A thread-safe buffer that behaves like an IO stream.
     Allows writing from one thread and reading from another.
+
+    The written chunks are kept as-is, a read only copies the bytes it returns.
     """
 
     def __init__(self) -> None:
-        self._buffer = io.BytesIO()
+        self._chunks: deque[bytes] = deque()
+        self._offset = 0  # read position in the first chunk
+        self._size = 0
         self._lock = threading.Lock()
         self._data_available = threading.Condition(self._lock)
         self._eof = False
+        self._closed = False
 
     def write(self, data: bytes) -> None:
         """Write data to the buffer from a writer thread."""
+        if not data:
+            return
+
         with self._data_available:
-            self._buffer.seek(0, io.SEEK_END)
-            self._buffer.write(data)
+            if self._closed:
+                return
+
+            self._chunks.append(bytes(data))
+            self._size += len(data)
             self._data_available.notify_all()
 
     def read(self, size: int = -1) -> bytes:
         """Read data from the buffer in a reader thread."""
-
-        if self._buffer.closed:
-            return b""
-
         with self._data_available:
             while True:
-                if self._buffer.closed:
+                if self._closed:
                     return b""
-                # always read from beginning
-                self._buffer.seek(0)
-                data = self._buffer.read(size)
 
-                if data:
-                    # shrink the buffer to remove already-read data
-                    remaining = self._buffer.read()
-                    self._buffer = io.BytesIO(remaining)
-                    return data
+                if self._size:
+                    return self._read(size)
 
                 if self._eof:
                     return b""
 
                 self._data_available.wait()
 
+    def _read(self, size: int) -> bytes:
+        if size < 0 or size > self._size:
+            size = self._size
+
+        parts = []
+        remaining = size
+        while remaining:
+            chunk = self._chunks[0]
+            available = len(chunk) - self._offset
+            if available > remaining:
+                parts.append(chunk[self._offset : self._offset + remaining])
+                self._offset += remaining
+                break
+
+            parts.append(chunk[self._offset :] if self._offset else chunk)
+            self._chunks.popleft()
+            self._offset = 0
+            remaining -= available
+
+        self._size -= size
+        return parts[0] if len(parts) == 1 else b"".join(parts)
+
     def end_input(self) -> None:
         """Signal that no more data will be written."""
         with self._data_available:
@@ -113,7 +135,57 @@ class StreamBuffer:
             self._data_available.notify_all()
 
     def close(self) -> None:
-        self._buffer.close()
+        with self._data_available:
+            self._closed = True
+            self._chunks.clear()
+            self._size = 0
+            self._data_available.notify_all()
+
+
+class _DecodeThreadPool:
+    """Threads shared by the decoders of the process.
+
+    A decoder keeps its thread while waiting for input, so a new thread is started when none is
+    idle instead of queuing the decoder behind the others. Idle threads exit after idle_timeout.
+    """
+
+    def __init__(self, *, idle_timeout: float = 30.0) -> None:
+        self._idle_timeout = idle_timeout
+        self._cond = threading.Condition(threading.Lock())
+        self._tasks: deque[Callable[[], None]] = deque()
+        self._idle = 0
+
+    def submit(self, fnc: Callable[[], None]) -> None:
+        with self._cond:
+            self._tasks.append(fnc)
+            if self._idle >= len(self._tasks):
+                self._cond.notify()
+                return
+
+        threading.Thread(target=self._worker, name="AudioDecoder", daemon=True).start()
+
+    def _worker(self) -> None:
+        while True:
+            with self._cond:
+                while not self._tasks:
+                    self._idle += 1
+                    try:
+                        notified = self._cond.wait(self._idle_timeout)
+                    finally:
+                        self._idle -= 1
+
+                    if not notified and not self._tasks:
+                        return
+
+                fnc = self._tasks.popleft()
+
+            try:
+                fnc()
+            except Exception:
+                logger.exception("error in audio decoder thread")
+
+
+_decode_pool = _DecodeThreadPool()
 
 
 class AudioStreamDecoder:
@@ -145,14 +217,12 @@ class AudioStreamDecoder:
         self._input_buf = StreamBuffer()
         self._loop = asyncio.get_event_loop()
 
-        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="AudioDecoder")
-
     def push(self, chunk: bytes) -> None:
         self._input_buf.write(chunk)
         if not self._started:
             self._started = True
             target = self._decode_wav_loop if self._av_format == "wav" else self._decode_loop
-            self._loop.run_in_executor(self._executor, target)
+            _decode_pool.submit(target)
 
     def end_input(self) -> None:
         self._input_buf.end_input()
@@ -335,5 +405,3 @@ class AudioStreamDecoder:
 
         async for _ in self._output_ch:
             pass
-
-        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -1,20 +1,53 @@
 import asyncio
+import bisect
 import time
-import weakref
+from collections import deque
 from collections.abc import AsyncGenerator, Awaitable
 from contextlib import asynccontextmanager
-from typing import Callable, Generic, Optional, TypeVar
+from dataclasses import dataclass, field
+from typing import Any, Callable, Generic, Optional, TypeVar
 
+from ..log import logger
 from . import aio
+from .log import log_exceptions
 
 T = TypeVar("T")
 
+CONNECT_LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+@dataclass
+class ConnectionPoolStats:
+    hits: int = 0
+    """get() calls served by an idle or a prewarmed connection"""
+    misses: int = 0
+    """get() calls that had to open a new connection"""
+    expired: int = 0
+    """Idle connections closed because they reached max_session_duration or max_idle_time"""
+    connect_errors: int = 0
+    connect_latency_buckets: tuple[float, ...] = CONNECT_LATENCY_BUCKETS
+    """Upper bounds in seconds of the connect latency histogram"""
+    connect_latency_counts: list[int] = field(
+        default_factory=lambda: [0] * (len(CONNECT_LATENCY_BUCKETS) + 1)
+    )
+    """Connects per bucket, the last one counts the connects above the highest bound"""
+
+    @property
+    def connects(self) -> int:
+        return sum(self.connect_latency_counts)
+
+    def _observe_connect(self, latency: float) -> None:
+        self.connect_latency_counts[bisect.bisect_left(self.connect_latency_buckets, latency)] += 1
+
 
 class ConnectionPool(Generic[T]):
     """Helper class to manage persistent connections like websockets.
 
     Handles connection pooling and reconnection after max duration.
     Can be used as an async context manager to automatically return connections to the pool.
+
+    Idle connections are reused without waiting for the connections being opened, new connections
+    are opened concurrently (up to max_concurrent_connects).
     """
 
     def __init__(
@@ -25,6 +58,9 @@ class ConnectionPool(Generic[T]):
         connect_cb: Optional[Callable[[float], Awaitable[T]]] = None,
         close_cb: Optional[Callable[[T], Awaitable[None]]] = None,
         connect_timeout: float = 10.0,
+        prewarm_target: int = 1,
+        max_concurrent_connects: int = 4,
+        max_idle_time: Optional[float] = None,
     ) -> None:
         """Initialize the connection wrapper.
 
@@ -33,20 +69,42 @@ class ConnectionPool(Generic[T]):
             mark_refreshed_on_get: If True, the session will be marked as fresh when get() is called. only used when max_session_duration is set.
             connect_cb: Optional async callback to create new connections
             close_cb: Optional async callback to close connections
+            connect_timeout: Timeout in seconds of the connections opened by prewarm()
+            prewarm_target: Number of idle connections prewarm() keeps ready
+            max_concurrent_connects: Maximum number of connections being opened at the same time
+            max_idle_time: Idle connections unused for longer are closed in the background
         """  # noqa: E501
+        if max_concurrent_connects < 1:
+            raise ValueError("max_concurrent_connects must be at least 1")
+
         self._max_session_duration = max_session_duration
         self._mark_refreshed_on_get = mark_refreshed_on_get
         self._connect_cb = connect_cb
         self._close_cb = close_cb
         self._connections: dict[T, float] = {}  # conn -> connected_at timestamp
-        self._available: set[T] = set()
+        self._available: dict[T, float] = {}  # conn -> idle since timestamp
         self._connect_timeout = connect_timeout
-        self._connect_lock = asyncio.Lock()
+        self._prewarm_target = prewarm_target
+        self._max_idle_time = max_idle_time
+        self._connect_sem = asyncio.Semaphore(max_concurrent_connects)
+        self._stats = ConnectionPoolStats()
 
         # store connections to be reaped (closed) later.
         self._to_close: set[T] = set()
 
-        self._prewarm_task: Optional[weakref.ref[asyncio.Task[None]]] = None
+        # prewarm connects not claimed by get() yet, their connection is made available once done
+        self._warming: deque[asyncio.Task[T]] = deque()
+        self._warm_tasks: set[asyncio.Task[T]] = set()
+        self._close_tasks: set[asyncio.Task[None]] = set()
+        self._expire_task: Optional[asyncio.Task[None]] = None
+
+    @property
+    def stats(self) -> ConnectionPoolStats:
+        return self._stats
+
+    @property
+    def num_idle(self) -> int:
+        return len(self._available)
 
     async def _connect(self, timeout: float) -> T:
         """Create a new connection.
@@ -59,15 +117,35 @@ class ConnectionPool(Generic[T]):
         """
         if self._connect_cb is None:
             raise NotImplementedError("Must provide connect_cb or implement connect()")
-        connection = await self._connect_cb(timeout)
+
+        async with self._connect_sem:
+            start_time = time.perf_counter()
+            try:
+                connection = await self._connect_cb(timeout)
+            except Exception:
+                self._stats.connect_errors += 1
+                raise
+
+            self._stats._observe_connect(time.perf_counter() - start_time)
+
         self._connections[connection] = time.time()
         return connection
 
     async def _drain_to_close(self) -> None:
         """Drain and close all the connections queued for closing."""
-        for conn in list(self._to_close):
-            await self._maybe_close_connection(conn)
-        self._to_close.clear()
+        while self._to_close:
+            await self._maybe_close_connection(self._to_close.pop())
+
+    def _close_in_background(self) -> None:
+        # closing a websocket waits for the close handshake, get() doesn't wait for it
+        if self._to_close:
+            task = asyncio.create_task(self._close_task())
+            self._close_tasks.add(task)
+            task.add_done_callback(self._close_tasks.discard)
+
+    @log_exceptions(logger=logger)
+    async def _close_task(self) -> None:
+        await self._drain_to_close()
 
     @asynccontextmanager
     async def connection(self, *, timeout: float) -> AsyncGenerator[T, None]:
@@ -91,24 +169,41 @@ class ConnectionPool(Generic[T]):
         Returns:
             An active connection object
         """
-        async with self._connect_lock:
-            await self._drain_to_close()
-            now = time.time()
+        self._close_in_background()
+        now = time.time()
+
+        # try to reuse an available connection that hasn't expired, most recently used first
+        while self._available:
+            conn, _ = self._available.popitem()
+            if not self._is_session_expired(conn, now):
+                if self._mark_refreshed_on_get:
+                    self._connections[conn] = now
+                self._stats.hits += 1
+                return conn
+            # connection expired; mark it for resetting.
+            self._stats.expired += 1
+            self.remove(conn)
 
-            # try to reuse an available connection that hasn't expired
-            while self._available:
-                conn = self._available.pop()
-                if (
-                    self._max_session_duration is None
-                    or now - self._connections[conn] <= self._max_session_duration
-                ):
-                    if self._mark_refreshed_on_get:
-                        self._connections[conn] = now
-                    return conn
-                # connection expired; mark it for resetting.
-                self.remove(conn)
-
-            return await self._connect(timeout)
+        # claim a prewarm connect, it started earlier than a new connect would
+        while self._warming:
+            task = self._warming.popleft()
+            try:
+                conn = await asyncio.shield(task)
+            except asyncio.CancelledError:
+                if task.done():
+                    raise
+                # the caller was cancelled, give the connection back once it's opened
+                task.add_done_callback(self._return_warm_connection)
+                raise
+            except Exception:
+                continue  # already logged by _prewarm_task
+
+            if conn in self._connections:
+                self._stats.hits += 1
+                return conn
+
+        self._stats.misses += 1
+        return await self._connect(timeout)
 
     def put(self, conn: T) -> None:
         """Mark a connection as available for reuse.
@@ -119,7 +214,8 @@ class ConnectionPool(Generic[T]):
             conn: The connection to make available
         """
         if conn in self._connections:
-            self._available.add(conn)
+            self._available[conn] = time.time()
+            self._schedule_expire()
 
     async def _maybe_close_connection(self, conn: T) -> None:
         """Close a connection if close_cb is provided.
@@ -138,7 +234,7 @@ class ConnectionPool(Generic[T]):
         Args:
             conn: The connection to reset
         """
-        self._available.discard(conn)
+        self._available.pop(conn, None)
         if conn in self._connections:
             self._to_close.add(conn)
             self._connections.pop(conn, None)
@@ -153,30 +249,87 @@ class ConnectionPool(Generic[T]):
         self._connections.clear()
         self._available.clear()
 
-    def prewarm(self) -> None:
+    def prewarm(self, target: Optional[int] = None) -> None:
         """Initiate prewarming of the connection pool without blocking.
 
-        This method starts a background task that creates a new connection if none exist.
-        The task automatically cleans itself up when the connection pool is closed.
+        This method starts background tasks opening connections until the pool holds `target`
+        idle connections (prewarm_target by default), counting the ones being opened.
+        The tasks are cancelled when the connection pool is closed.
         """
-        if self._prewarm_task is not None or self._connections:
+        if target is None:
+            target = self._prewarm_target
+
+        for _ in range(target - len(self._available) - len(self._warming)):
+            task = asyncio.create_task(self._prewarm_task())
+            task.add_done_callback(self._on_warm_done)
+            self._warming.append(task)
+            self._warm_tasks.add(task)
+            task.add_done_callback(self._warm_tasks.discard)
+
+    async def _prewarm_task(self) -> T:
+        try:
+            return await self._connect(timeout=self._connect_timeout)
+        except Exception:
+            logger.warning("failed to prewarm a connection", exc_info=True)
+            raise
+
+    def _on_warm_done(self, task: asyncio.Task[T]) -> None:
+        if task in self._warming:
+            # not claimed by get()
+            self._warming.remove(task)
+            self._return_warm_connection(task)
+
+    def _return_warm_connection(self, task: asyncio.Task[T]) -> None:
+        if not task.cancelled() and task.exception() is None:
+            self.put(task.result())
+
+    def _is_session_expired(self, conn: T, now: float) -> bool:
+        return (
+            self._max_session_duration is not None
+            and now - self._connections[conn] > self._max_session_duration
+        )
+
+    def _schedule_expire(self) -> None:
+        if self._max_session_duration is None and self._max_idle_time is None:
             return
 
-        async def _prewarm_impl() -> None:
-            async with self._connect_lock:
-                if not self._connections:
-                    conn = await self._connect(timeout=self._connect_timeout)
-                    self._available.add(conn)
+        if self._expire_task is None or self._expire_task.done():
+            self._expire_task = asyncio.create_task(self._expire_idle_task())
+
+    @log_exceptions(logger=logger)
+    async def _expire_idle_task(self) -> None:
+        while self._available:
+            now = time.time()
+            next_expiry = float("inf")
+            for conn, idle_since in list(self._available.items()):
+                expires_at = float("inf")
+                if self._max_session_duration is not None:
+                    expires_at = self._connections[conn] + self._max_session_duration
+                if self._max_idle_time is not None:
+                    expires_at = min(expires_at, idle_since + self._max_idle_time)
+
+                if expires_at <= now:
+                    self._stats.expired += 1
+                    self.remove(conn)
+                else:
+                    next_expiry = min(next_expiry, expires_at)
+
+            await self._drain_to_close()
+            if next_expiry == float("inf"):
+                break
 
-        task = asyncio.create_task(_prewarm_impl())
-        self._prewarm_task = weakref.ref(task)
+            await asyncio.sleep(next_expiry - now)
 
     async def aclose(self) -> None:
         """Close all connections, draining any pending connection closures."""
-        if self._prewarm_task is not None:
-            task = self._prewarm_task()
-            if task:
-                await aio.gracefully_cancel(task)
+        self._warming.clear()
+        tasks: list[asyncio.Task[Any]] = list(self._warm_tasks)
+        if self._expire_task is not None:
+            tasks.append(self._expire_task)
+            self._expire_task = None
+
+        await aio.cancel_and_wait(*tasks)
+        await asyncio.gather(*self._close_tasks, return_exceptions=True)
 
         self.invalidate()
         await self._drain_to_close()
@@ -1,10 +1,16 @@
 from .cpu import CGroupV2CPUMonitor, CPUMonitor, DefaultCPUMonitor, get_cpu_monitor
+from .load import LoadSampler, LoadSamplerOptions
+from .memory import MemoryMonitor, get_memory_monitor
 
 __all__ = [
     "get_cpu_monitor",
+    "get_memory_monitor",
     "CPUMonitor",
     "CGroupV2CPUMonitor",
     "DefaultCPUMonitor",
+    "MemoryMonitor",
+    "LoadSampler",
+    "LoadSamplerOptions",
 ]
 
 # Cleanup docs of unexported modules
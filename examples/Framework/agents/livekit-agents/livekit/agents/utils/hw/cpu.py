@@ -21,6 +21,18 @@ class CPUMonitor(ABC):
         """CPU usage percentage between 0 and 1"""
         pass
 
+    def cpu_time(self) -> float:
+        """Cumulative CPU time in seconds used by the cgroup (or the host), across all CPUs.
+
+        Unlike cpu_percent, it doesn't block: the usage is the delta between two reads divided by
+        the elapsed time and cpu_count(). Defaults to the busy time of the host."""
+        # same busy time as psutil.cpu_percent, guest time is already counted in user time
+        times = psutil.cpu_times()
+        busy = sum(times) - times.idle
+        for field in ("iowait", "guest", "guest_nice"):
+            busy -= getattr(times, field, 0.0)
+        return busy
+
 
 def _cpu_count_from_env() -> Optional[float]:
     try:
@@ -67,6 +79,9 @@ class CGroupV2CPUMonitor(CPUMonitor):
 
         return min(cpu_usage_percent, 1)
 
+    def cpu_time(self) -> float:
+        return self._read_cpu_usage() / 1_000_000
+
     def _read_cpu_max(self) -> tuple[str, int]:
         try:
             with open("/sys/fs/cgroup/cpu.max") as f:
@@ -111,6 +126,9 @@ class CGroupV1CPUMonitor(CPUMonitor):
         percent = usage_seconds / (interval * num_cpus)
         return max(min(percent, 1.0), 0.0)
 
+    def cpu_time(self) -> float:
+        return self._read_cpuacct_usage() / 1_000_000_000
+
     def _read_cfs_quota_and_period(self) -> tuple[Optional[int], Optional[int]]:
         quota_path_candidates = [
             "/sys/fs/cgroup/cpu/cpu.cfs_quota_us",
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable
+
+from ...log import logger
+from .. import aio
+from ..log import log_exceptions
+from .cpu import CPUMonitor, get_cpu_monitor
+from .memory import MemoryMonitor, get_memory_monitor
+
+
+@dataclass
+class LoadSamplerOptions:
+    sample_interval: float = 0.5
+    """Seconds between two reads of the CPU and memory counters."""
+    window: float = 2.5
+    """Duration in seconds over which the CPU usage is averaged."""
+    cpu_weight: float = 1.0
+    """Multiplier of the CPU usage in the load, 0 ignores the CPU."""
+    memory_weight: float = 0.0
+    """Multiplier of the memory usage in the load, 0 (the default) ignores the memory."""
+    loop_lag_limit: float = 0.0
+    """Event loop lag in seconds (of a job or of the worker) reported as a full load, 0 (the
+    default) ignores the lag."""
+
+
+class LoadSampler:
+    """Samples the load of the worker on a timer, without blocking.
+
+    The CPU usage is the delta of the cumulative CPU time of the cgroup (or the host) over the
+    window, the memory usage is the current working set over the limit. The load is
+    `max(cpu * cpu_weight, memory * memory_weight, loop_lag / loop_lag_limit)` clamped to [0, 1],
+    the worker is as loaded as its most saturated resource. By default only the CPU is scored,
+    the memory and the event loop lag are opt-in.
+    """
+
+    def __init__(
+        self,
+        opts: LoadSamplerOptions | None = None,
+        *,
+        loop_lag_fnc: Callable[[], float] | None = None,
+        cpu_monitor: CPUMonitor | None = None,
+        memory_monitor: MemoryMonitor | None = None,
+    ) -> None:
+        """
+        Args:
+            opts: sampling and scoring options.
+            loop_lag_fnc: returns the highest event loop lag in seconds of the running jobs.
+            cpu_monitor: defaults to the monitor of the current cgroup.
+            memory_monitor: defaults to the monitor of the current cgroup.
+        """
+        self._opts = opts or LoadSamplerOptions()
+        if self._opts.sample_interval <= 0:
+            raise ValueError("sample_interval must be positive")
+
+        self._loop_lag_fnc = loop_lag_fnc
+        self._cpu_monitor = cpu_monitor or get_cpu_monitor()
+        self._memory_monitor = memory_monitor or get_memory_monitor()
+        self._cpu_count = self._cpu_monitor.cpu_count()
+
+        n_samples = max(round(self._opts.window / self._opts.sample_interval), 1) + 1
+        self._cpu_times: deque[tuple[float, float]] = deque(maxlen=n_samples)
+        self._worker_lag = 0.0
+        self._cpu = 0.0
+        self._memory = 0.0
+        self._loop_lag = 0.0
+        self._load = 0.0
+        self._task: asyncio.Task[None] | None = None
+
+    @property
+    def cpu(self) -> float:
+        """CPU usage between 0 and 1, averaged over the window"""
+        return self._cpu
+
+    @property
+    def memory(self) -> float:
+        """Memory usage between 0 and 1"""
+        return self._memory
+
+    @property
+    def loop_lag(self) -> float:
+        """Highest event loop lag in seconds of the jobs and the worker"""
+        return self._loop_lag
+
+    @property
+    def load(self) -> float:
+        """Load between 0 and 1, as of the last sample"""
+        return self._load
+
+    def start(self) -> None:
+        if self._task is not None:
+            return
+
+        self.sample()
+        self._task = asyncio.create_task(self._sample_task(), name="load_sampler")
+
+    async def aclose(self) -> None:
+        if self._task is not None:
+            await aio.cancel_and_wait(self._task)
+            self._task = None
+
+    def sample(self, now: float | None = None) -> None:
+        """Read the counters once and update the load"""
+        if now is None:
+            now = time.monotonic()
+
+        self._cpu_times.append((now, self._cpu_monitor.cpu_time()))
+        start_time, start_cpu = self._cpu_times[0]
+        if now > start_time:
+            cpu_time = self._cpu_times[-1][1] - start_cpu
+            self._cpu = max(min(cpu_time / ((now - start_time) * self._cpu_count), 1.0), 0.0)
+
+        self._memory = self._memory_monitor.memory_percent()
+
+        jobs_lag = self._loop_lag_fnc() if self._loop_lag_fnc is not None else 0.0
+        self._loop_lag = max(jobs_lag, self._worker_lag)
+
+        opts = self._opts
+        load = max(self._cpu * opts.cpu_weight, self._memory * opts.memory_weight)
+        if opts.loop_lag_limit > 0:
+            load = max(load, self._loop_lag / opts.loop_lag_limit)
+
+        self._load = max(min(load, 1.0), 0.0)
+
+    @log_exceptions(logger=logger)
+    async def _sample_task(self) -> None:
+        interval = self._opts.sample_interval
+        next_tick = time.monotonic() + interval
+        while True:
+            await asyncio.sleep(max(next_tick - time.monotonic(), 0))
+            now = time.monotonic()
+            # the lateness of the timer is the lag of the worker's own event loop
+            self._worker_lag = now - next_tick
+            next_tick = max(next_tick + interval, now)
+            self.sample(now)
@@ -0,0 +1,94 @@
+import os
+from abc import ABC, abstractmethod
+from typing import Optional
+
+import psutil
+
+
+class MemoryMonitor(ABC):
+    @abstractmethod
+    def memory_used(self) -> int:
+        """Memory in bytes used by the cgroup (or the host), reclaimable page cache excluded"""
+        pass
+
+    @abstractmethod
+    def memory_limit(self) -> int:
+        """Memory in bytes available to the cgroup (or the host)"""
+        pass
+
+    def memory_percent(self) -> float:
+        """Memory usage percentage between 0 and 1"""
+        limit = self.memory_limit()
+        if limit <= 0:
+            return 0.0
+        return max(min(self.memory_used() / limit, 1.0), 0.0)
+
+
+class DefaultMemoryMonitor(MemoryMonitor):
+    def memory_used(self) -> int:
+        mem = psutil.virtual_memory()
+        return int(mem.total - mem.available)
+
+    def memory_limit(self) -> int:
+        return int(psutil.virtual_memory().total)
+
+
+class CGroupV2MemoryMonitor(MemoryMonitor):
+    def __init__(self, root: str = "/sys/fs/cgroup") -> None:
+        self._root = root
+
+    def memory_used(self) -> int:
+        # working set, like the kubelet: the inactive page cache is reclaimed before an OOM kill
+        current = _read_int(os.path.join(self._root, "memory.current")) or 0
+        inactive = _read_stat(os.path.join(self._root, "memory.stat"), "inactive_file") or 0
+        return max(current - inactive, 0)
+
+    def memory_limit(self) -> int:
+        # "max" when the cgroup isn't limited
+        limit = _read_int(os.path.join(self._root, "memory.max"))
+        host_total = int(psutil.virtual_memory().total)
+        return min(limit, host_total) if limit is not None else host_total
+
+
+class CGroupV1MemoryMonitor(MemoryMonitor):
+    def __init__(self, root: str = "/sys/fs/cgroup/memory") -> None:
+        self._root = root
+
+    def memory_used(self) -> int:
+        usage = _read_int(os.path.join(self._root, "memory.usage_in_bytes")) or 0
+        inactive = _read_stat(os.path.join(self._root, "memory.stat"), "total_inactive_file") or 0
+        return max(usage - inactive, 0)
+
+    def memory_limit(self) -> int:
+        # an unlimited cgroup v1 reports a huge page-aligned value
+        limit = _read_int(os.path.join(self._root, "memory.limit_in_bytes"))
+        host_total = int(psutil.virtual_memory().total)
+        return min(limit, host_total) if limit is not None else host_total
+
+
+def _read_int(path: str) -> Optional[int]:
+    try:
+        with open(path) as f:
+            return int(f.read().strip())
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def _read_stat(path: str, key: str) -> Optional[int]:
+    try:
+        with open(path) as f:
+            for line in f:
+                name, _, value = line.partition(" ")
+                if name == key:
+                    return int(value)
+    except (FileNotFoundError, ValueError):
+        pass
+    return None
+
+
+def get_memory_monitor() -> MemoryMonitor:
+    if os.path.exists("/sys/fs/cgroup/memory.current"):
+        return CGroupV2MemoryMonitor()
+    if os.path.exists("/sys/fs/cgroup/memory/memory.usage_in_bytes"):
+        return CGroupV1MemoryMonitor()
+    return DefaultMemoryMonitor()
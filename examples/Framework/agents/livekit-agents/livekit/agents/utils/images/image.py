@@ -90,13 +90,24 @@ def encode(frame: rtc.VideoFrame, options: EncodeOptions) -> bytes:
     return buffer.read()
 
 
+# PIL raw modes unpacking the packed 32-bit formats straight to RGB (dropping the alpha byte)
+_RGB_RAW_MODES = {
+    rtc.VideoBufferType.RGBA: "RGBX",
+    rtc.VideoBufferType.BGRA: "BGRX",
+    rtc.VideoBufferType.ARGB: "XRGB",
+    rtc.VideoBufferType.ABGR: "XBGR",
+    rtc.VideoBufferType.RGB24: "RGB",
+}
+
+
 def _image_from_frame(frame: rtc.VideoFrame) -> "Image.Image":
-    converted = frame
-    if frame.type != rtc.VideoBufferType.RGBA:
-        converted = frame.convert(rtc.VideoBufferType.RGBA)
+    raw_mode = _RGB_RAW_MODES.get(frame.type)
+    if raw_mode is None:
+        # the YUV frames of the video tracks, converted to RGB24 without an intermediate RGBA copy
+        frame = frame.convert(rtc.VideoBufferType.RGB24)
+        raw_mode = "RGB"
 
-    rgb_image = Image.frombytes("RGBA", (frame.width, frame.height), converted.data).convert("RGB")
-    return rgb_image
+    return Image.frombytes("RGB", (frame.width, frame.height), frame.data, "raw", raw_mode)
 
 
 def _resize_image(image: "Image.Image", options: EncodeOptions) -> "Image.Image":
@@ -12,7 +12,8 @@ from livekit import rtc
 from livekit.agents.metrics.base import Metadata
 
 from .metrics import VADMetrics
-from .utils import aio
+from .types import NOT_GIVEN, NotGivenOr
+from .utils import aio, is_given
 
 
 @unique
@@ -99,8 +100,16 @@ class VADStream(ABC):
     class _FlushSentinel:
         pass
 
-    def __init__(self, vad: VAD) -> None:
+    def __init__(self, vad: VAD, *, sample_rate: NotGivenOr[int] = NOT_GIVEN) -> None:
+        """
+        Args:
+        sample_rate : int or None, optional
+            The sample rate the VAD runs its inference at, when the stream resamples its input.
+            Callers sharing the audio with other consumers can feed it frames already at this
+            rate instead.
+        """
         self._vad = vad
+        self._needed_sr = sample_rate if is_given(sample_rate) else None
         self._last_activity_time = time.perf_counter()
         self._input_ch = aio.Chan[Union[rtc.AudioFrame, VADStream._FlushSentinel]]()
         self._event_ch = aio.Chan[VADEvent]()
@@ -113,6 +122,12 @@ class VADStream(ABC):
         self._task = asyncio.create_task(self._main_task())
         self._task.add_done_callback(lambda _: self._event_ch.close())
 
+    @property
+    def sample_rate(self) -> int | None:
+        """The sample rate the stream resamples its input to, None when it uses the native
+        rate of the frames"""
+        return self._needed_sr
+
     @abstractmethod
     async def _main_task(self) -> None: ...
 
@@ -380,6 +380,9 @@ class Agent:
 
             conn_options = activity.session.conn_options.stt_conn_options
             async with wrapped_stt.stream(conn_options=conn_options) as stream:
+                if isinstance(audio, utils.audio.AudioHubSubscription):
+                    # let the hub resample the audio, shared with the vad when it needs the same rate
+                    audio.set_sample_rate(stream.sample_rate)
 
                 @utils.log_exceptions(logger=logger)
                 async def _forward_input() -> None:
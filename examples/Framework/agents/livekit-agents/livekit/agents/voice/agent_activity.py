@@ -1891,6 +1891,9 @@ class AgentActivity(RecognitionHooks):
                 assistant_metrics["e2e_latency"] = (
                     started_speaking_at - user_metrics["stopped_speaking_at"]
                 )
+                current_span.set_attribute(
+                    trace_types.ATTR_E2E_LATENCY, assistant_metrics["e2e_latency"]
+                )
 
         current_span.set_attribute(trace_types.ATTR_SPEECH_INTERRUPTED, speech_handle.interrupted)
         has_speech_message = False
@@ -136,8 +136,10 @@ class AudioRecognition:
         self._audio_preflight_transcript = ""
         self._last_language: str | None = None
 
-        self._stt_ch: aio.Chan[rtc.AudioFrame] | None = None
-        self._vad_ch: aio.Chan[rtc.AudioFrame] | None = None
+        # the stt and vad usually need the same sample rate, the audio is resampled once for both
+        self._audio_hub = utils.audio.AudioHub()
+        self._stt_sub: utils.audio.AudioHubSubscription | None = None
+        self._vad_sub: utils.audio.AudioHubSubscription | None = None
         self._tasks: set[asyncio.Task[Any]] = set()
 
         self._user_turn_span: trace.Span | None = None
@@ -182,11 +184,7 @@ class AudioRecognition:
 
     def push_audio(self, frame: rtc.AudioFrame) -> None:
         self._sample_rate = frame.sample_rate
-        if self._stt_ch is not None:
-            self._stt_ch.send_nowait(frame)
-
-        if self._vad_ch is not None:
-            self._vad_ch.send_nowait(frame)
+        self._audio_hub.push(frame)
 
     async def aclose(self) -> None:
         self._closing.set()
@@ -205,33 +203,41 @@ class AudioRecognition:
         if self._end_of_turn_task is not None:
             await self._end_of_turn_task
 
+        self._audio_hub.close()
+
     def update_stt(self, stt: io.STTNode | None) -> None:
         self._stt = stt
+        if self._stt_sub is not None:
+            self._stt_sub.close()
+            self._stt_sub = None
+
         if stt:
-            self._stt_ch = aio.Chan[rtc.AudioFrame]()
+            self._stt_sub = self._audio_hub.subscribe("stt")
             self._stt_atask = asyncio.create_task(
-                self._stt_task(stt, self._stt_ch, self._stt_atask)
+                self._stt_task(stt, self._stt_sub, self._stt_atask)
             )
         elif self._stt_atask is not None:
             task = asyncio.create_task(aio.cancel_and_wait(self._stt_atask))
             task.add_done_callback(lambda _: self._tasks.discard(task))
             self._tasks.add(task)
             self._stt_atask = None
-            self._stt_ch = None
 
     def update_vad(self, vad: vad.VAD | None) -> None:
         self._vad = vad
+        if self._vad_sub is not None:
+            self._vad_sub.close()
+            self._vad_sub = None
+
         if vad:
-            self._vad_ch = aio.Chan[rtc.AudioFrame]()
+            self._vad_sub = self._audio_hub.subscribe("vad")
             self._vad_atask = asyncio.create_task(
-                self._vad_task(vad, self._vad_ch, self._vad_atask)
+                self._vad_task(vad, self._vad_sub, self._vad_atask)
             )
         elif self._vad_atask is not None:
             task = asyncio.create_task(aio.cancel_and_wait(self._vad_atask))
             task.add_done_callback(lambda _: self._tasks.discard(task))
             self._tasks.add(task)
             self._vad_atask = None
-            self._vad_ch = None
 
     def clear_user_turn(self) -> None:
         self._audio_transcript = ""
@@ -667,13 +673,14 @@ class AudioRecognition:
     async def _vad_task(
         self,
         vad: vad.VAD,
-        audio_input: AsyncIterable[rtc.AudioFrame],
+        audio_input: utils.audio.AudioHubSubscription,
         task: asyncio.Task[None] | None,
     ) -> None:
         if task is not None:
             await aio.cancel_and_wait(task)
 
         stream = vad.stream()
+        audio_input.set_sample_rate(stream.sample_rate)
 
         @utils.log_exceptions(logger=logger)
         async def _forward() -> None:
@@ -4,7 +4,10 @@ import asyncio
 import atexit
 import contextlib
 import enum
+import os
 import random
+import threading
+from collections import OrderedDict
 from collections.abc import AsyncGenerator, AsyncIterator, Generator
 from importlib.resources import as_file, files
 from typing import Any, NamedTuple, Union, cast
@@ -60,6 +63,16 @@ class AudioConfig(NamedTuple):
 # Instead, we remove the sound from the mixer, and it will get removed 400ms later.
 _AUDIO_SOURCE_BUFFER_MS = 400
 
+# process-wide cache of the decoded clips (in bytes of PCM), the ambient and thinking sounds of
+# every session are decoded once instead of on every play and every loop
+AUDIO_CLIP_CACHE_SIZE = 64 * 1024 * 1024
+# the clips are played in 100ms frames, the blocksize of the mixer
+_CLIP_FRAME_SAMPLES = 4800
+
+_clip_cache: OrderedDict[tuple[Any, ...], np.ndarray] = OrderedDict()
+_clip_cache_size = 0
+_clip_cache_lock = threading.Lock()
+
 
 class BackgroundAudioPlayer:
     def __init__(
@@ -335,25 +348,16 @@ class BackgroundAudioPlayer:
             sound = sound.path()
 
         if isinstance(sound, str):
+            # the gain is already applied to the decoded clips
             if loop:
-                sound = _loop_audio_frames(sound)
+                sound = _loop_audio_frames(sound, volume)
             else:
-                sound = audio_frames_from_file(sound)
+                sound = _clip_frames(sound, volume)
+            volume = 1.0
 
         async def _gen_wrapper() -> AsyncGenerator[rtc.AudioFrame, None]:
             async for frame in sound:
-                if volume != 1.0:
-                    data = np.frombuffer(frame.data, dtype=np.int16).astype(np.float32)
-                    data *= 10 ** (np.log10(volume))
-                    np.clip(data, -32768, 32767, out=data)
-                    yield rtc.AudioFrame(
-                        data=data.astype(np.int16).tobytes(),
-                        sample_rate=frame.sample_rate,
-                        num_channels=frame.num_channels,
-                        samples_per_channel=frame.samples_per_channel,
-                    )
-                else:
-                    yield frame
+                yield _apply_gain(frame, volume)
 
             # TODO(theomonnom): the wait_for_playout() may be innaccurate by 400ms
             play_handle._mark_playout_done()
@@ -431,7 +435,96 @@ class PlayHandle:
             self._done_fut.set_result(None)
 
 
-async def _loop_audio_frames(file_path: str) -> AsyncGenerator[rtc.AudioFrame, None]:
+def _apply_gain(frame: rtc.AudioFrame, volume: float, *, in_place: bool = False) -> rtc.AudioFrame:
+    """in_place is only for the frames we own (decoded clips), the frames of the caller's
+    iterators may be reused and are copied"""
+    if volume == 1.0:
+        return frame
+
+    data = np.frombuffer(frame.data, dtype=np.int16)
+    out = data if in_place else np.empty_like(data)
+    if abs(volume) <= 1.0:
+        np.multiply(data, volume, out=out, casting="unsafe")
+    else:
+        out[:] = np.clip(data * volume, -32768, 32767)
+
+    if in_place:
+        return frame
+
+    return rtc.AudioFrame(
+        data=out.tobytes(),
+        sample_rate=frame.sample_rate,
+        num_channels=frame.num_channels,
+        samples_per_channel=frame.samples_per_channel,
+    )
+
+
+def _clip_cache_key(file_path: str, volume: float) -> tuple[Any, ...]:
+    stat = os.stat(file_path)
+    # the mtime invalidates the entries of a file replaced on disk
+    return (os.path.realpath(file_path), stat.st_mtime_ns, stat.st_size, 48000, 1, volume)
+
+
+def _get_clip(key: tuple[Any, ...]) -> np.ndarray | None:
+    with _clip_cache_lock:
+        clip = _clip_cache.get(key)
+        if clip is not None:
+            _clip_cache.move_to_end(key)
+        return clip
+
+
+def _put_clip(key: tuple[Any, ...], clip: np.ndarray) -> None:
+    global _clip_cache_size
+
+    clip.flags.writeable = False
+    with _clip_cache_lock:
+        if key in _clip_cache:
+            return
+
+        _clip_cache[key] = clip
+        _clip_cache_size += clip.nbytes
+        while _clip_cache_size > AUDIO_CLIP_CACHE_SIZE:
+            _, evicted = _clip_cache.popitem(last=False)
+            _clip_cache_size -= evicted.nbytes
+
+
+async def _clip_frames(file_path: str, volume: float) -> AsyncGenerator[rtc.AudioFrame, None]:
+    """Frames of the audio file at 48kHz mono with the gain applied, decoded once per process"""
+    key = _clip_cache_key(file_path, volume)
+    clip = _get_clip(key)
+    if clip is not None:
+        for i in range(0, len(clip), _CLIP_FRAME_SAMPLES):
+            data = clip[i : i + _CLIP_FRAME_SAMPLES]
+            yield rtc.AudioFrame(
+                data=data.data, sample_rate=48000, num_channels=1, samples_per_channel=len(data)
+            )
+        return
+
+    # decode and cache the clip while playing it, the clips bigger than the cache are streamed
+    chunks: list[np.ndarray] | None = []
+    size = 0
+    async for frame in audio_frames_from_file(file_path, sample_rate=48000, num_channels=1):
+        frame = _apply_gain(frame, volume, in_place=True)
+        if chunks is not None:
+            chunks.append(np.frombuffer(frame.data, dtype=np.int16))
+            size += chunks[-1].nbytes
+            if size > AUDIO_CLIP_CACHE_SIZE:
+                chunks = None
+
+        yield frame
+
+    if chunks:
+        _put_clip(key, np.concatenate(chunks))
+
+
+async def _loop_audio_frames(
+    file_path: str, volume: float = 1.0
+) -> AsyncGenerator[rtc.AudioFrame, None]:
     while True:
-        async for frame in audio_frames_from_file(file_path):
+        played = False
+        async for frame in _clip_frames(file_path, volume):
+            played = True
             yield frame
+
+        if not played:
+            return  # empty or undecodable file, don't spin
@@ -1,3 +1,11 @@
+from .encoder_pool import RecorderEncoderPool, RecordingEncoder, get_encoder_pool
 from .recorder_io import RecorderAudioInput, RecorderAudioOutput, RecorderIO
 
-__all__ = ["RecorderIO", "RecorderAudioInput", "RecorderAudioOutput"]
+__all__ = [
+    "RecorderIO",
+    "RecorderAudioInput",
+    "RecorderAudioOutput",
+    "RecorderEncoderPool",
+    "RecordingEncoder",
+    "get_encoder_pool",
+]
@@ -0,0 +1,366 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable
+
+import av
+import numpy as np
+
+from livekit import rtc
+
+from ...log import logger
+from ...telemetry import metrics
+
+DEFAULT_MAX_WORKERS = 2
+DEFAULT_MAX_QUEUE_DEPTH = 8  # ~20s of audio per recording with the default write interval
+
+_GROW_FACTOR = 1.5
+_INV_INT16 = 1.0 / 32768.0
+
+
+class RecorderEncoderPool:
+    """Bounded pool of threads encoding the recordings of every RecorderIO of the process.
+
+    A recording is encoded by at most one thread at a time, in order. The pool runs one chunk per
+    task, so the recordings are interleaved instead of each owning a thread.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        max_queue_depth: int = DEFAULT_MAX_QUEUE_DEPTH,
+    ) -> None:
+        """
+        Args:
+            max_workers: number of encoder threads shared by the recordings.
+            max_queue_depth: chunks a recording can have waiting for a thread, the chunks pushed
+                above it are dropped.
+        """
+        if max_queue_depth < 1:
+            raise ValueError("max_queue_depth must be at least 1")
+
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="recorder_io_encode"
+        )
+        self._max_queue_depth = max_queue_depth
+        self._lock = threading.Lock()
+        self._queue_depth = 0
+        self._dropped_chunks = 0
+
+    @property
+    def queue_depth(self) -> int:
+        """Chunks of every recording waiting for an encoder thread"""
+        return self._queue_depth
+
+    @property
+    def dropped_chunks(self) -> int:
+        """Chunks dropped since the pool was created"""
+        return self._dropped_chunks
+
+    def open(
+        self,
+        *,
+        output_path: Path,
+        sample_rate: int,
+        segment_duration: float | None = None,
+        on_segment: Callable[[Path], None] | None = None,
+        on_closed: Callable[[], None] | None = None,
+    ) -> RecordingEncoder:
+        """Open a stereo Ogg/Opus recording, the callbacks are called from an encoder thread"""
+        return RecordingEncoder(
+            pool=self,
+            output_path=output_path,
+            sample_rate=sample_rate,
+            segment_duration=segment_duration,
+            on_segment=on_segment,
+            on_closed=on_closed,
+        )
+
+    def shutdown(self, *, wait: bool = True) -> None:
+        self._executor.shutdown(wait=wait)
+
+    def _update_queue_depth(self, delta: int) -> None:
+        with self._lock:
+            self._queue_depth += delta
+        metrics.recorder_queue_depth_changed(delta)
+
+    def _on_dropped(self) -> None:
+        with self._lock:
+            self._dropped_chunks += 1
+        metrics.recorder_chunk_dropped()
+
+
+_default_pool: RecorderEncoderPool | None = None
+_default_pool_lock = threading.Lock()
+
+
+def get_encoder_pool() -> RecorderEncoderPool:
+    """The pool shared by the RecorderIOs of the process"""
+    global _default_pool
+    with _default_pool_lock:
+        if _default_pool is None:
+            _default_pool = RecorderEncoderPool()
+        return _default_pool
+
+
+@dataclass
+class _Chunk:
+    input_buf: list[rtc.AudioFrame]
+    output_buf: list[rtc.AudioFrame]
+    queued_at: float
+
+
+class RecordingEncoder:
+    """One recording of a RecorderEncoderPool, the left channel is the input (user) audio and the
+    right channel the output (agent) audio.
+
+    With segment_duration, the recording is split in standalone files named
+    `<stem>_<index><suffix>` next to output_path, each closed once it holds at least
+    segment_duration seconds. The Ogg segments can be concatenated back into a single file.
+    """
+
+    def __init__(
+        self,
+        *,
+        pool: RecorderEncoderPool,
+        output_path: Path,
+        sample_rate: int,
+        segment_duration: float | None,
+        on_segment: Callable[[Path], None] | None,
+        on_closed: Callable[[], None] | None,
+    ) -> None:
+        self._pool = pool
+        self._output_path = output_path
+        self._sample_rate = sample_rate
+        self._segment_samples = (
+            int(segment_duration * sample_rate) if segment_duration is not None else None
+        )
+        self._on_segment = on_segment
+        self._on_closed = on_closed
+
+        self._lock = threading.Lock()
+        self._pending: deque[_Chunk] = deque()
+        self._scheduled = False
+        self._closing = False
+        self._failed = False
+
+        # only touched by the encoder thread running the recording
+        self._container: av.container.OutputContainer | None = None
+        self._stream: av.AudioStream | None = None
+        self._segment_path: Path | None = None
+        self._segment_index = 0
+        self._segment_written = 0
+        self._in_resampler: rtc.AudioResampler | None = None
+        self._out_resampler: rtc.AudioResampler | None = None
+        self._capacity = sample_rate * 6  # 6s, 1ch
+        self._stereo_buf = np.zeros((2, self._capacity), dtype=np.float32)
+
+    @property
+    def segmented(self) -> bool:
+        return self._segment_samples is not None
+
+    def push(self, input_buf: list[rtc.AudioFrame], output_buf: list[rtc.AudioFrame]) -> bool:
+        """Queue the audio recorded since the last push, returns False if it was dropped"""
+        with self._lock:
+            if self._closing:
+                return False
+
+            queue_depth = len(self._pending)
+            if queue_depth < self._pool._max_queue_depth:
+                self._pending.append(_Chunk(input_buf, output_buf, time.monotonic()))
+                self._pool._update_queue_depth(1)
+                self._schedule()
+                return True
+
+        # drop the whole chunk, both channels stay aligned
+        self._pool._on_dropped()
+        logger.warning(
+            "recording encoder is falling behind, dropping audio",
+            extra={"path": str(self._output_path), "queue_depth": queue_depth},
+        )
+        return False
+
+    def close(self) -> None:
+        """Encode the queued chunks and close the file, on_closed is called once done"""
+        with self._lock:
+            if self._closing:
+                return
+
+            self._closing = True
+            self._schedule()
+
+    def _schedule(self) -> None:
+        if not self._scheduled:
+            self._scheduled = True
+            self._pool._executor.submit(self._run)
+
+    def _run(self) -> None:
+        with self._lock:
+            chunk = self._pending.popleft() if self._pending else None
+
+        if chunk is not None:
+            self._pool._update_queue_depth(-1)
+            metrics.recorder_chunk_dequeued(time_elapsed=time.monotonic() - chunk.queued_at)
+            if not self._failed:
+                try:
+                    self._encode(chunk)
+                except Exception:
+                    self._failed = True
+                    logger.exception(
+                        "failed to encode the recording", extra={"path": str(self._output_path)}
+                    )
+
+        with self._lock:
+            if self._pending:
+                # back of the queue, behind the chunks of the other recordings
+                self._pool._executor.submit(self._run)
+                return
+
+            if not self._closing:
+                self._scheduled = False
+                return
+
+        try:
+            if not self._failed:
+                self._finalize()
+        except Exception:
+            logger.exception(
+                "failed to close the recording", extra={"path": str(self._output_path)}
+            )
+        finally:
+            if self._on_closed is not None:
+                self._on_closed()
+
+    def _open_segment(self) -> None:
+        if self._segment_samples is None:
+            path = self._output_path
+        else:
+            stem, suffix = self._output_path.stem, self._output_path.suffix
+            path = self._output_path.with_name(f"{stem}_{self._segment_index:05d}{suffix}")
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._container = av.open(path, mode="w", format="ogg")
+        self._stream = self._container.add_stream("opus", rate=self._sample_rate, layout="stereo")  # type: ignore
+        self._segment_path = path
+        self._segment_written = 0
+
+    def _close_segment(self) -> None:
+        assert self._container is not None and self._stream is not None
+        for packet in self._stream.encode(None):
+            self._container.mux(packet)
+        self._container.close()
+        self._container = self._stream = None
+
+        if self._segment_samples is not None:
+            assert self._segment_path is not None
+            self._segment_index += 1
+            if self._on_segment is not None:
+                self._on_segment(self._segment_path)
+
+    def _finalize(self) -> None:
+        if self._container is None:
+            if self._segment_samples is not None:
+                return  # nothing recorded since the last segment
+
+            self._open_segment()  # always leave a (possibly empty) file
+
+        self._close_segment()
+
+    def _remix(self, frames: list[rtc.AudioFrame], channel_idx: int) -> int:
+        total_samples = sum(f.samples_per_channel * f.num_channels for f in frames)
+        if total_samples > self._capacity:
+            while self._capacity < total_samples:
+                self._capacity = int(self._capacity * _GROW_FACTOR)
+
+            self._stereo_buf.resize((2, self._capacity), refcheck=False)
+
+        pos = 0
+        dest = self._stereo_buf[channel_idx]
+        for f in frames:
+            count = f.samples_per_channel * f.num_channels
+            arr_i16 = np.frombuffer(f.data, dtype=np.int16, count=count).reshape(-1, f.num_channels)
+            slice_ = dest[pos : pos + f.samples_per_channel]
+            np.sum(arr_i16, axis=1, dtype=np.float32, out=slice_)
+            slice_ *= _INV_INT16 / f.num_channels
+            pos += f.samples_per_channel
+
+        return pos
+
+    def _encode(self, chunk: _Chunk) -> None:
+        input_buf, output_buf = chunk.input_buf, chunk.output_buf
+
+        # lazy creation of the resamplers
+        if self._in_resampler is None and len(input_buf):
+            self._in_resampler = rtc.AudioResampler(
+                input_rate=input_buf[0].sample_rate,
+                output_rate=self._sample_rate,
+                num_channels=input_buf[0].num_channels,
+            )
+
+        if self._out_resampler is None and len(output_buf):
+            self._out_resampler = rtc.AudioResampler(
+                input_rate=output_buf[0].sample_rate,
+                output_rate=self._sample_rate,
+                num_channels=output_buf[0].num_channels,
+            )
+
+        input_resampled = []
+        for frame in input_buf:
+            assert self._in_resampler is not None
+            input_resampled.extend(self._in_resampler.push(frame))
+
+        output_resampled = []
+        for frame in output_buf:
+            assert self._out_resampler is not None
+            output_resampled.extend(self._out_resampler.push(frame))
+
+        if output_buf:
+            assert self._out_resampler is not None
+            # the output is sent per-segment. Always flush when the playback is done
+            output_resampled.extend(self._out_resampler.flush())
+
+        len_left = self._remix(input_resampled, 0)
+        len_right = self._remix(output_resampled, 1)
+
+        stereo_buf = self._stereo_buf
+        if len_left != len_right:
+            diff = abs(len_right - len_left)
+            if len_left < len_right:
+                logger.warning(
+                    f"Input is shorter by {diff} samples; silence has been prepended to "
+                    "align the input channel. The resulting recording may not accurately "
+                    "reflect the original audio."
+                )
+                stereo_buf[0, diff : diff + len_left] = stereo_buf[0, :len_left]
+                stereo_buf[0, :diff] = 0.0
+                len_left = len_right
+            else:
+                stereo_buf[1, diff : diff + len_right] = stereo_buf[1, :len_right]
+                stereo_buf[1, :diff] = 0.0
+                len_right = len_left
+
+        max_len = max(len_left, len_right)
+        if max_len <= 0:
+            return
+
+        if self._container is None:
+            self._open_segment()
+
+        assert self._container is not None and self._stream is not None
+        av_frame = av.AudioFrame.from_ndarray(
+            stereo_buf[:, :max_len], format="fltp", layout="stereo"
+        )
+        av_frame.sample_rate = self._sample_rate
+
+        for packet in self._stream.encode(av_frame):
+            self._container.mux(packet)
+
+        self._segment_written += max_len
+        if self._segment_samples is not None and self._segment_written >= self._segment_samples:
+            self._close_segment()
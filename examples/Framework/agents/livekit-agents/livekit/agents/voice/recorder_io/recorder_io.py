@@ -2,20 +2,18 @@ from __future__ import annotations
 
 import asyncio
 import contextlib
-import queue
-import threading
+import inspect
 import time
 from collections.abc import AsyncIterator
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, Callable
 
-import av
-import numpy as np
-
 from livekit import rtc
 
 from ...log import logger
+from ...utils import aio
 from .. import io
+from .encoder_pool import RecorderEncoderPool, RecordingEncoder, get_encoder_pool
 
 if TYPE_CHECKING:
     from ..agent_session import AgentSession
@@ -33,12 +31,11 @@ class RecorderIO:
         agent_session: AgentSession,
         sample_rate: int = 48000,
         loop: asyncio.AbstractEventLoop | None = None,
+        encoder_pool: RecorderEncoderPool | None = None,
     ) -> None:
         self._in_record: RecorderAudioInput | None = None
         self._out_record: RecorderAudioOutput | None = None
 
-        self._in_q: queue.Queue[list[rtc.AudioFrame] | None] = queue.Queue()
-        self._out_q: queue.Queue[list[rtc.AudioFrame] | None] = queue.Queue()
         self._session = agent_session
         self._sample_rate = sample_rate
         self._started = False
@@ -46,8 +43,27 @@ class RecorderIO:
         self._lock = asyncio.Lock()
         self._close_fut: asyncio.Future[None] = self._loop.create_future()
         self._output_path: Path | None = None
+        self._encoder_pool = encoder_pool
+        self._encoder: RecordingEncoder | None = None
+        self._segment_paths: list[Path] = []
+        self._segment_tasks: set[asyncio.Task[Any]] = set()
 
-    async def start(self, *, output_path: str | Path) -> None:
+    async def start(
+        self,
+        *,
+        output_path: str | Path,
+        segment_duration: float | None = None,
+        on_segment: Callable[[Path], Any] | None = None,
+    ) -> None:
+        """Start recording to output_path (stereo Ogg/Opus, input on the left channel).
+
+        Args:
+            output_path: path of the recording, or base path of the segments.
+            segment_duration: split the recording in files of at least this many seconds, so
+                they can be uploaded while the session is running.
+            on_segment: called on the event loop with the path of each finished segment, can
+                return an awaitable. aclose() waits for the returned awaitables.
+        """
         async with self._lock:
             if self._started:
                 return
@@ -61,21 +77,37 @@ class RecorderIO:
             self._output_path = Path(output_path)
             self._started = True
             self._close_fut = self._loop.create_future()
-            self._forward_atask = asyncio.create_task(self._forward_task())
-
-            thread = threading.Thread(
-                target=self._encode_thread, daemon=True, name="recorder_io_encode_thread"
+            self._segment_paths = []
+
+            def _on_segment(path: Path) -> None:
+                with contextlib.suppress(RuntimeError):
+                    self._loop.call_soon_threadsafe(self._segment_finished, path, on_segment)
+
+            def _on_closed() -> None:
+                with contextlib.suppress(RuntimeError):
+                    self._loop.call_soon_threadsafe(_set_result_if_pending, self._close_fut)
+
+            pool = self._encoder_pool or get_encoder_pool()
+            self._encoder = pool.open(
+                output_path=self._output_path,
+                sample_rate=self._sample_rate,
+                segment_duration=segment_duration,
+                on_segment=_on_segment,
+                on_closed=_on_closed,
             )
-            thread.start()
+            self._forward_atask = asyncio.create_task(self._forward_task())
 
     async def aclose(self) -> None:
         async with self._lock:
             if not self._started:
                 return
 
-            self._in_q.put_nowait(None)
-            self._out_q.put_nowait(None)
+            await aio.cancel_and_wait(self._forward_atask)
+            assert self._encoder is not None
+            self._encoder.close()
             await asyncio.shield(self._close_fut)
+            if self._segment_tasks:
+                await asyncio.gather(*self._segment_tasks, return_exceptions=True)
             self._started = False
 
     def record_input(self, audio_input: io.AudioInput) -> RecorderAudioInput:
@@ -94,8 +126,16 @@ class RecorderIO:
 
     @property
     def output_path(self) -> Path | None:
+        """Path of the recording, None when it is segmented (see segment_paths)"""
+        if self._encoder is not None and self._encoder.segmented:
+            return None
         return self._output_path
 
+    @property
+    def segment_paths(self) -> list[Path]:
+        """Finished segments of a segmented recording, in order"""
+        return list(self._segment_paths)
+
     @property
     def recording_started_at(self) -> float | None:
         in_t = self._in_record.started_wall_time if self._in_record else None
@@ -109,18 +149,35 @@ class RecorderIO:
 
         return min(in_t, out_t)
 
+    def _segment_finished(self, path: Path, on_segment: Callable[[Path], Any] | None) -> None:
+        self._segment_paths.append(path)
+        if on_segment is None:
+            return
+
+        try:
+            res = on_segment(path)
+        except Exception:
+            logger.exception("error in the recording on_segment callback")
+            return
+
+        if inspect.isawaitable(res):
+            task = asyncio.ensure_future(res)
+            self._segment_tasks.add(task)
+            task.add_done_callback(self._segment_tasks.discard)
+
     def _write_cb(self, buf: list[rtc.AudioFrame]) -> None:
         assert self._in_record is not None
+        assert self._encoder is not None
 
         input_buf = self._in_record.take_buf()
-        self._in_q.put_nowait(input_buf)
-        self._out_q.put_nowait(buf)
+        self._encoder.push(input_buf, buf)
 
     async def _forward_task(self) -> None:
         assert self._in_record is not None
         assert self._out_record is not None
+        assert self._encoder is not None
 
-        # Forward the input audio to the encoder every 5s.
+        # Forward the input audio to the encoder every WRITE_INTERVAL.
         while True:
             await asyncio.sleep(WRITE_INTERVAL)
             if self._out_record.has_pending_data:
@@ -128,126 +185,12 @@ class RecorderIO:
                 continue  # always wait for the complete output
 
             input_buf = self._in_record.take_buf()
-            self._in_q.put_nowait(input_buf)
-            self._out_q.put_nowait([])
-
-    def _encode_thread(self) -> None:
-        GROW_FACTOR = 1.5
-        INV_INT16 = 1.0 / 32768.0
-
-        assert self._output_path is not None
-        self._output_path.parent.mkdir(parents=True, exist_ok=True)
-
-        container = av.open(self._output_path, mode="w", format="ogg")
-        stream: av.AudioStream = container.add_stream(
-            "opus", rate=self._sample_rate, layout="stereo"
-        )  # type: ignore
+            self._encoder.push(input_buf, [])
 
-        in_resampler: rtc.AudioResampler | None = None
-        out_resampler: rtc.AudioResampler | None = None
 
-        capacity = self._sample_rate * 6  # 6s, 1ch
-        stereo_buf = np.zeros((2, capacity), dtype=np.float32)
-
-        def remix_and_resample(frames: list[rtc.AudioFrame], channel_idx: int) -> int:
-            total_samples = sum(f.samples_per_channel * f.num_channels for f in frames)
-
-            nonlocal capacity, stereo_buf
-            if total_samples > capacity:
-                while capacity < total_samples:
-                    capacity = int(capacity * GROW_FACTOR)
-
-                stereo_buf.resize((2, capacity), refcheck=False)
-
-            pos = 0
-            dest = stereo_buf[channel_idx]
-            for f in frames:
-                count = f.samples_per_channel * f.num_channels
-                arr_i16 = np.frombuffer(f.data, dtype=np.int16, count=count).reshape(
-                    -1, f.num_channels
-                )
-                slice_ = dest[pos : pos + f.samples_per_channel]
-                np.sum(arr_i16, axis=1, dtype=np.float32, out=slice_)
-                slice_ *= INV_INT16 / f.num_channels
-                pos += f.samples_per_channel
-
-            return pos
-
-        with container:
-            while True:
-                input_buf = self._in_q.get()
-                output_buf = self._out_q.get()
-
-                if input_buf is None or output_buf is None:
-                    break
-
-                # lazy creation of the resamplers
-                if in_resampler is None and len(input_buf):
-                    input_rate, num_channels = input_buf[0].sample_rate, input_buf[0].num_channels
-                    in_resampler = rtc.AudioResampler(
-                        input_rate=input_rate,
-                        output_rate=self._sample_rate,
-                        num_channels=num_channels,
-                    )
-
-                if out_resampler is None and len(output_buf):
-                    input_rate, num_channels = output_buf[0].sample_rate, output_buf[0].num_channels
-                    out_resampler = rtc.AudioResampler(
-                        input_rate=input_rate,
-                        output_rate=self._sample_rate,
-                        num_channels=num_channels,
-                    )
-
-                input_resampled = []
-                for frame in input_buf:
-                    assert in_resampler is not None
-                    input_resampled.extend(in_resampler.push(frame))
-
-                output_resampled = []
-                for frame in output_buf:
-                    assert out_resampler is not None
-                    output_resampled.extend(out_resampler.push(frame))
-
-                if output_buf:
-                    assert out_resampler is not None
-                    # the output is sent per-segment. Always flush when the playback is done
-                    output_resampled.extend(out_resampler.flush())
-
-                len_left = remix_and_resample(input_resampled, 0)
-                len_right = remix_and_resample(output_resampled, 1)
-
-                if len_left != len_right:
-                    diff = abs(len_right - len_left)
-                    if len_left < len_right:
-                        logger.warning(
-                            f"Input is shorter by {diff} samples; silence has been prepended to "
-                            "align the input channel. The resulting recording may not accurately "
-                            "reflect the original audio."
-                        )
-                        stereo_buf[0, diff : diff + len_left] = stereo_buf[0, :len_left]
-                        stereo_buf[0, :diff] = 0.0
-                        len_left = len_right
-                    else:
-                        stereo_buf[1, diff : diff + len_right] = stereo_buf[1, :len_right]
-                        stereo_buf[1, :diff] = 0.0
-                        len_right = len_left
-
-                max_len = max(len_left, len_right)
-                if max_len <= 0:
-                    continue
-
-                stereo_slice = stereo_buf[:, :max_len]
-                av_frame = av.AudioFrame.from_ndarray(stereo_slice, format="fltp", layout="stereo")
-                av_frame.sample_rate = self._sample_rate
-
-                for packet in stream.encode(av_frame):
-                    container.mux(packet)
-
-            for packet in stream.encode(None):
-                container.mux(packet)
-
-        with contextlib.suppress(RuntimeError):
-            self._loop.call_soon_threadsafe(self._close_fut.set_result, None)
+def _set_result_if_pending(fut: asyncio.Future[None]) -> None:
+    if not fut.done():
+        fut.set_result(None)
 
 
 class RecorderAudioInput(io.AudioInput):
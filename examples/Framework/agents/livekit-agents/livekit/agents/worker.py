@@ -23,7 +23,6 @@ import math
 import multiprocessing as mp
 import os
 import sys
-import threading
 from collections.abc import Awaitable
 from dataclasses import dataclass, field
 from enum import Enum
@@ -53,7 +52,7 @@ from .log import DEV_LEVEL, logger
 from .plugin import Plugin
 from .types import NOT_GIVEN, NotGivenOr
 from .utils import http_server, is_given
-from .utils.hw import get_cpu_monitor
+from .utils.hw import LoadSampler, LoadSamplerOptions, get_cpu_monitor
 from .version import __version__
 
 ASSIGNMENT_TIMEOUT = 7.5
@@ -79,33 +78,21 @@ WorkerType = ServerType
 
 
 class _DefaultLoadCalc:
-    _instance = None
-
-    def __init__(self) -> None:
-        self._m_avg = utils.MovingAverage(5)  # avg over 2.5
-        self._cpu_monitor = get_cpu_monitor()
-        self._thread = threading.Thread(
-            target=self._calc_load, daemon=True, name="worker_cpu_load_monitor"
-        )
-        self._lock = threading.Lock()
-        self._thread.start()
-
-    def _calc_load(self) -> None:
-        while True:
-            cpu_p = self._cpu_monitor.cpu_percent(interval=0.5)
-            with self._lock:
-                self._m_avg.add_sample(cpu_p)
-
-    def _get_avg(self) -> float:
-        with self._lock:
-            return self._m_avg.get_avg()
+    _cpu_sampler: LoadSampler | None = None
 
     @classmethod
     def get_load(cls, worker: AgentServer) -> float:
-        if cls._instance is None:
-            cls._instance = _DefaultLoadCalc()
+        if worker._load_sampler is not None:
+            return worker._load_sampler.load
+
+        # the server isn't running yet, sample the CPU on demand
+        if cls._cpu_sampler is None:
+            cls._cpu_sampler = LoadSampler(
+                LoadSamplerOptions(memory_weight=0.0, loop_lag_limit=0.0)
+            )
 
-        return cls._instance._m_avg.get_avg()
+        cls._cpu_sampler.sample()
+        return cls._cpu_sampler.load
 
 
 @dataclass
@@ -157,8 +144,14 @@ class ServerOptions:
     """A function to perform any necessary initialization before the job starts."""
     load_fnc: Callable[[AgentServer], float] | Callable[[], float] = _DefaultLoadCalc.get_load
     """Called to determine the current load of the worker. Should return a value between 0 and 1."""
+    load_sampler_options: LoadSamplerOptions = field(default_factory=LoadSamplerOptions)
+    """How the default load_fnc samples and combines the CPU usage, the memory usage and the
+    event loop lag of the jobs. The samples are also available from AgentServer.load_sampler."""
     job_executor_type: JobExecutorType = _default_job_executor_type
-    """Which executor to use to run jobs. (currently thread or process are supported)"""
+    """Which executor to use to run jobs. (currently thread, process or fork are supported)
+
+    With fork, prewarm_fnc runs once in a template process and each job process is forked from
+    it, sharing the loaded models copy-on-write. prewarm_fnc must not leave threads running."""
     load_threshold: float | ServerEnvOption[float] = _default_load_threshold
     """When the load exceeds this threshold, the worker will be marked as unavailable.
 
@@ -178,6 +171,16 @@ class ServerOptions:
         dev_default=0, prod_default=min(math.ceil(get_cpu_monitor().cpu_count()), 4)
     )
     """Number of idle processes to keep warm."""
+    idle_process_policy: ipc.idle_policy.IdleProcessPolicy | None = None
+    """Decides how many idle processes are kept warm, based on num_idle_processes.
+
+    Defaults to a static policy, use ipc.idle_policy.PredictiveIdlePolicy to scale the idle pool
+    with the job arrival rate and the process launch time."""
+    job_log_options: ipc.log_queue.LogTransportOptions = field(
+        default_factory=ipc.log_queue.LogTransportOptions
+    )
+    """How the job processes send their logs to the worker: the flush interval, the batch size,
+    and how many records are kept (the oldest are dropped) when the worker falls behind."""
     shutdown_process_timeout: float = 10.0
     """Maximum amount of time to wait for a job to shut down gracefully"""
     initialize_process_timeout: float = 10.0
@@ -265,6 +268,8 @@ class AgentServer(utils.EventEmitter[EventTypes]):
         job_memory_limit_mb: float = 0,
         drain_timeout: int = 1800,
         num_idle_processes: int | ServerEnvOption[int] = _default_num_idle_processes,
+        idle_process_policy: ipc.idle_policy.IdleProcessPolicy | None = None,
+        job_log_options: ipc.log_queue.LogTransportOptions | None = None,
         shutdown_process_timeout: float = 10.0,
         initialize_process_timeout: float = 10.0,
         permissions: WorkerPermissions = _default_permissions,
@@ -280,6 +285,7 @@ class AgentServer(utils.EventEmitter[EventTypes]):
         ),
         setup_fnc: Callable[[JobProcess], Any] | None = None,
         load_fnc: Callable[[AgentServer], float] | Callable[[], float] | None = None,
+        load_sampler_options: LoadSamplerOptions | None = None,
         prometheus_port: int | None = None,
     ) -> None:
         super().__init__()
@@ -296,6 +302,8 @@ class AgentServer(utils.EventEmitter[EventTypes]):
         self._job_memory_limit_mb = job_memory_limit_mb
         self._drain_timeout = drain_timeout
         self._num_idle_processes = num_idle_processes
+        self._idle_process_policy = idle_process_policy
+        self._job_log_options = job_log_options or ipc.log_queue.LogTransportOptions()
         self._shutdown_process_timeout = shutdown_process_timeout
         self._initialize_process_timeout = initialize_process_timeout
         self._permissions = permissions
@@ -320,6 +328,8 @@ class AgentServer(utils.EventEmitter[EventTypes]):
         # worker cb
         self._setup_fnc: Callable[[JobProcess], Any] | None = setup_fnc
         self._load_fnc: Callable[[AgentServer], float] | Callable[[], float] | None = load_fnc
+        self._load_sampler_options = load_sampler_options or LoadSamplerOptions()
+        self._load_sampler: LoadSampler | None = None
 
         self._closed, self._draining, self._connecting = True, False, False
         self._http_server: http_server.HttpServer | None = None
@@ -361,6 +371,13 @@ class AgentServer(utils.EventEmitter[EventTypes]):
             raise TypeError("load_fnc must be a callable or None")
         self._load_fnc = value
 
+    @property
+    def load_sampler(self) -> LoadSampler:
+        """CPU, memory and event loop lag samples of the running server"""
+        if self._load_sampler is None:
+            raise RuntimeError("the server isn't running")
+        return self._load_sampler
+
     @classmethod
     def from_server_options(cls, options: ServerOptions) -> AgentServer:
         server = cls(
@@ -370,6 +387,8 @@ class AgentServer(utils.EventEmitter[EventTypes]):
             job_memory_warn_mb=options.job_memory_warn_mb,
             drain_timeout=options.drain_timeout,
             num_idle_processes=options.num_idle_processes,
+            idle_process_policy=options.idle_process_policy,
+            job_log_options=options.job_log_options,
             shutdown_process_timeout=options.shutdown_process_timeout,
             initialize_process_timeout=options.initialize_process_timeout,
             permissions=options.permissions,
@@ -383,6 +402,7 @@ class AgentServer(utils.EventEmitter[EventTypes]):
             prometheus_port=options.prometheus_port if is_given(options.prometheus_port) else None,
             setup_fnc=options.prewarm_fnc,
             load_fnc=options.load_fnc,
+            load_sampler_options=options.load_sampler_options,
         )
         server.rtc_session(
             options.entrypoint_fnc,
@@ -559,6 +579,8 @@ class AgentServer(utils.EventEmitter[EventTypes]):
                 memory_warn_mb=self._job_memory_warn_mb,
                 memory_limit_mb=self._job_memory_limit_mb,
                 http_proxy=self._http_proxy or None,
+                idle_policy=self._idle_process_policy,
+                log_options=self._job_log_options,
             )
 
             self._previous_status = agent.WorkerStatus.WS_AVAILABLE
@@ -674,9 +696,7 @@ class AgentServer(utils.EventEmitter[EventTypes]):
                     telemetry.metrics._update_worker_load(self._worker_load)
 
                     load_threshold = ServerEnvOption.getvalue(self._load_threshold, devmode)
-                    default_num_idle_processes = ServerEnvOption.getvalue(
-                        self._num_idle_processes, devmode
-                    )
+                    max_idle_processes = self._proc_pool.max_idle_processes
 
                     if not math.isinf(load_threshold):
                         active_jobs = len(self.active_jobs)
@@ -685,11 +705,16 @@ class AgentServer(utils.EventEmitter[EventTypes]):
                             if job_load > 0.0:
                                 available_load = max(load_threshold - self._worker_load, 0.0)
                                 available_job = min(
-                                    math.ceil(available_load / job_load), default_num_idle_processes
+                                    math.ceil(available_load / job_load), max_idle_processes
                                 )
                                 self._proc_pool.set_target_idle_processes(available_job)
                         else:
-                            self._proc_pool.set_target_idle_processes(default_num_idle_processes)
+                            self._proc_pool.set_target_idle_processes(max_idle_processes)
+
+            self._load_sampler = LoadSampler(
+                self._load_sampler_options, loop_lag_fnc=self._jobs_loop_lag
+            )
+            self._load_sampler.start()
 
             tasks = []
             self._load_task = asyncio.create_task(_load_task(), name="load_task")
@@ -718,6 +743,9 @@ class AgentServer(utils.EventEmitter[EventTypes]):
         job_memory_limit_mb: NotGivenOr[float] = NOT_GIVEN,
         drain_timeout: NotGivenOr[int] = NOT_GIVEN,
         num_idle_processes: NotGivenOr[int] = NOT_GIVEN,
+        idle_process_policy: NotGivenOr[ipc.idle_policy.IdleProcessPolicy | None] = NOT_GIVEN,
+        load_sampler_options: NotGivenOr[LoadSamplerOptions] = NOT_GIVEN,
+        job_log_options: NotGivenOr[ipc.log_queue.LogTransportOptions] = NOT_GIVEN,
         shutdown_process_timeout: float = 10.0,
         initialize_process_timeout: float = 10.0,
     ) -> None:
@@ -754,6 +782,15 @@ class AgentServer(utils.EventEmitter[EventTypes]):
         if is_given(num_idle_processes):
             self._num_idle_processes = num_idle_processes
 
+        if is_given(idle_process_policy):
+            self._idle_process_policy = idle_process_policy
+
+        if is_given(load_sampler_options):
+            self._load_sampler_options = load_sampler_options
+
+        if is_given(job_log_options):
+            self._job_log_options = job_log_options
+
         if is_given(shutdown_process_timeout):
             self._shutdown_process_timeout = shutdown_process_timeout
 
@@ -765,6 +802,12 @@ class AgentServer(utils.EventEmitter[EventTypes]):
     def active_jobs(self) -> list[RunningJobInfo]:
         return [proc.running_job for proc in self._proc_pool.processes if proc.running_job]
 
+    def _jobs_loop_lag(self) -> float:
+        return max(
+            (proc.ping_delay for proc in self._proc_pool.processes if proc.running_job),
+            default=0.0,
+        )
+
     async def drain(self, timeout: NotGivenOr[int | None] = NOT_GIVEN) -> None:
         """When timeout isn't None, it will raise asyncio.TimeoutError if the processes didn't finish in time."""  # noqa: E501
 
@@ -871,6 +914,9 @@ class AgentServer(utils.EventEmitter[EventTypes]):
             if self._load_task is not None:
                 await utils.aio.cancel_and_wait(self._load_task)
 
+            if self._load_sampler is not None:
+                await self._load_sampler.aclose()
+
             await self._proc_pool.aclose()
 
             if self._inference_executor is not None:
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 import asyncio
-import base64
+import binascii
 import contextlib
 import copy
 import json
@@ -48,7 +48,6 @@ from openai.types.realtime import (
     ConversationItemInputAudioTranscriptionCompletedEvent,
     ConversationItemInputAudioTranscriptionFailedEvent,
     ConversationItemTruncateEvent,
-    InputAudioBufferAppendEvent,
     InputAudioBufferClearEvent,
     InputAudioBufferCommitEvent,
     InputAudioBufferSpeechStartedEvent,
@@ -64,7 +63,6 @@ from openai.types.realtime import (
     RealtimeFunctionTool,
     RealtimeResponseCreateParams,
     RealtimeSessionCreateRequest,
-    ResponseAudioDeltaEvent,
     ResponseAudioDoneEvent,
     ResponseAudioTranscriptDoneEvent,
     ResponseCancelEvent,
@@ -120,6 +118,21 @@ DEFAULT_VOICE = "marin"
 
 lk_oai_debug = int(os.getenv("LK_OPENAI_DEBUG", 0))
 
+# input_audio_buffer.append is sent every 100ms, it is written from a template instead of
+# going through a pydantic model and json.dumps
+_INPUT_AUDIO_APPEND_PREFIX = '{"type":"input_audio_buffer.append","audio":"'
+_INPUT_AUDIO_APPEND_SUFFIX = '"}'
+
+
+class _InputAudioAppend:
+    __slots__ = ("audio",)
+
+    def __init__(self, audio: str) -> None:
+        self.audio = audio  # base64 encoded pcm16
+
+    def to_dict(self) -> dict[str, Any]:
+        return {"type": "input_audio_buffer.append", "audio": self.audio}
+
 
 @dataclass
 class _RealtimeOptions:
@@ -671,7 +684,9 @@ class RealtimeSession(
         super().__init__(realtime_model)
         self._realtime_model: RealtimeModel = realtime_model
         self._tools = llm.ToolContext.empty()
-        self._msg_ch = utils.aio.Chan[Union[RealtimeClientEvent, dict[str, Any]]]()
+        self._msg_ch = utils.aio.Chan[
+            Union[RealtimeClientEvent, dict[str, Any], _InputAudioAppend]
+        ]()
         self._input_resampler: rtc.AudioResampler | None = None
 
         self._instructions: str | None = None
@@ -698,6 +713,11 @@ class RealtimeSession(
         with contextlib.suppress(utils.aio.channel.ChanClosed):
             self._msg_ch.send_nowait(event)
 
+    def _has_listeners(
+        self, event: Literal["openai_server_event_received", "openai_client_event_queued"]
+    ) -> bool:
+        return bool(self._events.get(event))
+
     @utils.log_exceptions(logger=logger)
     async def _main_task(self) -> None:
         num_retries: int = 0
@@ -825,6 +845,20 @@ class RealtimeSession(
             nonlocal closing
             async for msg in self._msg_ch:
                 try:
+                    if isinstance(msg, _InputAudioAppend):
+                        if self._has_listeners("openai_client_event_queued"):
+                            self.emit("openai_client_event_queued", msg.to_dict())
+
+                        await ws_conn.send_str(
+                            _INPUT_AUDIO_APPEND_PREFIX + msg.audio + _INPUT_AUDIO_APPEND_SUFFIX
+                        )
+
+                        if lk_oai_debug:
+                            logger.debug(
+                                ">>> {'type': 'input_audio_buffer.append', 'audio': '...'}"
+                            )
+                        continue
+
                     if isinstance(msg, BaseModel):
                         msg = msg.model_dump(
                             by_alias=True, exclude_unset=True, exclude_defaults=False
@@ -864,84 +898,34 @@ class RealtimeSession(
                     continue
 
                 event = json.loads(msg.data)
+                event_type = event["type"]
 
                 # emit the raw json dictionary instead of the BaseModel because different
                 # providers can have different event types that are not part of the OpenAI Realtime API  # noqa: E501
-                self.emit("openai_server_event_received", event)
+                if self._has_listeners("openai_server_event_received"):
+                    self.emit("openai_server_event_received", event)
 
                 try:
                     if lk_oai_debug:
                         event_copy = event.copy()
-                        if event_copy["type"] == "response.output_audio.delta":
+                        if event_type == "response.output_audio.delta":
                             event_copy = {**event_copy, "delta": "..."}
 
                         logger.debug(f"<<< {event_copy}")
 
-                    if event["type"] == "input_audio_buffer.speech_started":
-                        self._handle_input_audio_buffer_speech_started(
-                            InputAudioBufferSpeechStartedEvent.construct(**event)
-                        )
-                    elif event["type"] == "input_audio_buffer.speech_stopped":
-                        self._handle_input_audio_buffer_speech_stopped(
-                            InputAudioBufferSpeechStoppedEvent.construct(**event)
-                        )
-                    elif event["type"] == "response.created":
-                        self._handle_response_created(ResponseCreatedEvent.construct(**event))
-                    elif event["type"] == "response.output_item.added":
-                        self._handle_response_output_item_added(
-                            ResponseOutputItemAddedEvent.construct(**event)
-                        )
-                    elif event["type"] == "response.content_part.added":
-                        self._handle_response_content_part_added(
-                            ResponseContentPartAddedEvent.construct(**event)
-                        )
-                    elif event["type"] == "conversation.item.added":
-                        self._handle_conversion_item_added(ConversationItemAdded.construct(**event))
-                    elif event["type"] == "conversation.item.deleted":
-                        self._handle_conversion_item_deleted(
-                            ConversationItemDeletedEvent.construct(**event)
-                        )
-                    elif event["type"] == "conversation.item.input_audio_transcription.delta":
-                        # currently incoming transcripts are transcribed only after the user stops speaking
-                        # it's not very useful to emit these as the transcribe process takes place within ~100ms
-                        # when they handle streaming transcriptions, we'll handle it then.
-                        pass
-                    elif event["type"] == "conversation.item.input_audio_transcription.completed":
-                        self._handle_conversion_item_input_audio_transcription_completed(
-                            ConversationItemInputAudioTranscriptionCompletedEvent.construct(**event)
-                        )
-                    elif event["type"] == "conversation.item.input_audio_transcription.failed":
-                        self._handle_conversion_item_input_audio_transcription_failed(
-                            ConversationItemInputAudioTranscriptionFailedEvent.construct(**event)
-                        )
-                    elif event["type"] == "response.output_text.delta":
-                        self._handle_response_text_delta(ResponseTextDeltaEvent.construct(**event))
-                    elif event["type"] == "response.output_text.done":
-                        self._handle_response_text_done(ResponseTextDoneEvent.construct(**event))
-                    elif event["type"] == "response.output_audio_transcript.delta":
-                        self._handle_response_audio_transcript_delta(event)
-                    elif event["type"] == "response.output_audio.delta":
-                        self._handle_response_audio_delta(
-                            ResponseAudioDeltaEvent.construct(**event)
-                        )
-                    elif event["type"] == "response.output_audio_transcript.done":
-                        self._handle_response_audio_transcript_done(
-                            ResponseAudioTranscriptDoneEvent.construct(**event)
-                        )
-                    elif event["type"] == "response.output_audio.done":
-                        self._handle_response_audio_done(ResponseAudioDoneEvent.construct(**event))
-                    elif event["type"] == "response.output_item.done":
-                        self._handle_response_output_item_done(
-                            ResponseOutputItemDoneEvent.construct(**event)
-                        )
-                    elif event["type"] == "response.done":
-                        self._handle_response_done(ResponseDoneEvent.construct(**event))
-                    elif event["type"] == "error":
-                        self._handle_error(RealtimeErrorEvent.construct(**event))
+                    handler = _SERVER_EVENT_HANDLERS.get(event_type)
+                    if handler is not None:
+                        event_type_cls, handler_name = handler
+                        if handler_name is not None:
+                            getattr(self, handler_name)(
+                                event
+                                if event_type_cls is None
+                                else event_type_cls.construct(**event)
+                            )
                     elif lk_oai_debug:
-                        logger.debug(f"unhandled event: {event['type']}", extra={"event": event})
+                        logger.debug(f"unhandled event: {event_type}", extra={"event": event})
                 except Exception:
-                    if event["type"] == "response.output_audio.delta":
+                    if event_type == "response.output_audio.delta":
                         event["delta"] = event["delta"][:10] + "..."
                     logger.exception("failed to handle event", extra={"event": event})
 
@@ -1262,12 +1246,9 @@ class RealtimeSession(
         for f in self._resample_audio(frame):
             data = f.data.tobytes()
             for nf in self._bstream.write(data):
-                self.send_event(
-                    InputAudioBufferAppendEvent(
-                        type="input_audio_buffer.append",
-                        audio=base64.b64encode(nf.data).decode("utf-8"),
-                    )
-                )
+                audio = binascii.b2a_base64(nf.data, newline=False).decode("ascii")
+                with contextlib.suppress(utils.aio.channel.ChanClosed):
+                    self._msg_ch.send_nowait(_InputAudioAppend(audio))
                 self._pushed_duration_s += nf.duration
 
     def push_video(self, frame: rtc.VideoFrame) -> None:
@@ -1543,16 +1524,17 @@ class RealtimeSession(
         item_generation.text_ch.send_nowait(delta)
         item_generation.audio_transcript += delta
 
-    def _handle_response_audio_delta(self, event: ResponseAudioDeltaEvent) -> None:
+    def _handle_response_audio_delta(self, event: dict[str, Any]) -> None:
+        # the raw event, constructing a ResponseAudioDeltaEvent for every chunk is too expensive
         assert self._current_generation is not None, "current_generation is None"
-        item_generation = self._current_generation.messages[event.item_id]
+        item_generation = self._current_generation.messages[event["item_id"]]
         if self._current_generation._first_token_timestamp is None:
             self._current_generation._first_token_timestamp = time.time()
 
         if not item_generation.modalities.done():
             item_generation.modalities.set_result(["audio", "text"])
 
-        data = base64.b64decode(event.delta)
+        data = binascii.a2b_base64(event["delta"])
         item_generation.audio_ch.send_nowait(
             rtc.AudioFrame(
                 data=data,
@@ -1748,3 +1730,73 @@ class RealtimeSession(
                 recoverable=recoverable,
             ),
         )
+
+
+# server event type -> (the model constructed from the raw event or None, handler method name),
+# the handlers are looked up on the session so that subclasses can override them
+_SERVER_EVENT_HANDLERS: dict[str, tuple[type[BaseModel] | None, str | None]] = {
+    "input_audio_buffer.speech_started": (
+        InputAudioBufferSpeechStartedEvent,
+        "_handle_input_audio_buffer_speech_started",
+    ),
+    "input_audio_buffer.speech_stopped": (
+        InputAudioBufferSpeechStoppedEvent,
+        "_handle_input_audio_buffer_speech_stopped",
+    ),
+    "response.created": (ResponseCreatedEvent, "_handle_response_created"),
+    "response.output_item.added": (
+        ResponseOutputItemAddedEvent,
+        "_handle_response_output_item_added",
+    ),
+    "response.content_part.added": (
+        ResponseContentPartAddedEvent,
+        "_handle_response_content_part_added",
+    ),
+    "conversation.item.added": (
+        ConversationItemAdded,
+        "_handle_conversion_item_added",
+    ),
+    "conversation.item.deleted": (
+        ConversationItemDeletedEvent,
+        "_handle_conversion_item_deleted",
+    ),
+    # currently incoming transcripts are transcribed only after the user stops speaking
+    # it's not very useful to emit these as the transcribe process takes place within ~100ms
+    # when they handle streaming transcriptions, we'll handle it then.
+    "conversation.item.input_audio_transcription.delta": (None, None),
+    "conversation.item.input_audio_transcription.completed": (
+        ConversationItemInputAudioTranscriptionCompletedEvent,
+        "_handle_conversion_item_input_audio_transcription_completed",
+    ),
+    "conversation.item.input_audio_transcription.failed": (
+        ConversationItemInputAudioTranscriptionFailedEvent,
+        "_handle_conversion_item_input_audio_transcription_failed",
+    ),
+    "response.output_text.delta": (
+        ResponseTextDeltaEvent,
+        "_handle_response_text_delta",
+    ),
+    "response.output_text.done": (
+        ResponseTextDoneEvent,
+        "_handle_response_text_done",
+    ),
+    "response.output_audio_transcript.delta": (
+        None,
+        "_handle_response_audio_transcript_delta",
+    ),
+    "response.output_audio.delta": (None, "_handle_response_audio_delta"),
+    "response.output_audio_transcript.done": (
+        ResponseAudioTranscriptDoneEvent,
+        "_handle_response_audio_transcript_done",
+    ),
+    "response.output_audio.done": (
+        ResponseAudioDoneEvent,
+        "_handle_response_audio_done",
+    ),
+    "response.output_item.done": (
+        ResponseOutputItemDoneEvent,
+        "_handle_response_output_item_done",
+    ),
+    "response.done": (ResponseDoneEvent, "_handle_response_done"),
+    "error": (RealtimeErrorEvent, "_handle_error"),
+}
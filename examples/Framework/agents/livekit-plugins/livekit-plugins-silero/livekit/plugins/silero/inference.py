@@ -0,0 +1,24 @@
+"""Runs the VAD of every job in the inference process shared by the jobs of the worker.
+
+Importing this module registers the silero runner of the inference process, it must be
+imported by the main module of the worker (before the worker starts). The VAD then uses it
+when loaded with `inference_process=True`:
+
+    ```python
+    from livekit.plugins import silero
+    from livekit.plugins.silero import inference  # noqa: F401
+
+
+    def prewarm(proc: JobProcess):
+        # no onnx session is loaded in the job processes
+        proc.userdata["vad"] = silero.VAD.load(inference_process=True)
+    ```
+"""
+
+from __future__ import annotations
+
+from livekit.agents.inference_runner import _InferenceRunner
+
+from .onnx_model import _VADRunner
+
+_InferenceRunner.register_runner(_VADRunner)
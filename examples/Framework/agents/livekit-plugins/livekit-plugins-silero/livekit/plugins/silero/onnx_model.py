@@ -4,18 +4,31 @@ from __future__ import annotations
 
 import atexit
 import importlib.resources
+import struct
+import threading
+from concurrent.futures import Future
 from contextlib import ExitStack, nullcontext
 from pathlib import Path
 
 import numpy as np
 import onnxruntime  # type: ignore
 
+from livekit.agents.inference_runner import _InferenceRunner
+from livekit.agents.ipc import shm_audio
+from livekit.agents.ipc.inference_executor import InferenceExecutor
+
 _resource_files = ExitStack()
 atexit.register(_resource_files.close)
 
 
 SUPPORTED_SAMPLE_RATES = [8000, 16000]
 
+VAD_INFERENCE_METHOD = "lk_silero_vad"
+# the windows sent to the inference process include the audio context:
+# context + window samples -> sample rate
+_REMOTE_WINDOW_SAMPLE_RATES = {32 + 256: 8000, 64 + 512: 16000}
+_PROBABILITY = struct.Struct("<d")
+
 
 def new_inference_session(
     force_cpu: bool, onnx_file_path: Path | str | None = None
@@ -96,3 +109,282 @@ class OnnxModel:
         out, self._state = self._sess.run(None, ort_inputs)
         self._context = self._input_buffer[:, -self._context_size :]  # type: ignore
         return out.item()  # type: ignore
+
+
+class BatchedOnnxModel:
+    """Runs the windows of many streams sharing the same session in a single batched inference.
+
+    Each registered stream owns a slot (a row) in stacked numpy arrays holding its audio
+    context and pending window. A dedicated thread runs one inference over every slot that has
+    a window ready; windows submitted while a batch is running are grouped into the next one,
+    so batches grow with the load without adding latency when idle.
+    """
+
+    def __init__(
+        self,
+        *,
+        onnx_session: onnxruntime.InferenceSession,
+        sample_rate: int,
+        max_batch_size: int = 64,
+    ) -> None:
+        if sample_rate not in SUPPORTED_SAMPLE_RATES:
+            raise ValueError("Silero VAD only supports 8KHz and 16KHz sample rates")
+
+        self._sess = onnx_session
+        self._sample_rate = sample_rate
+        self._max_batch_size = max_batch_size
+
+        if sample_rate == 8000:
+            self._window_size_samples = 256
+            self._context_size = 32
+        elif sample_rate == 16000:
+            self._window_size_samples = 512
+            self._context_size = 64
+
+        self._sample_rate_nd = np.array(sample_rate, dtype=np.int64)
+
+        self._cond = threading.Condition()
+        self._contexts = np.zeros((0, self._context_size), dtype=np.float32)
+        self._windows = np.zeros((0, self._window_size_samples), dtype=np.float32)
+        self._generations: list[int] = []  # bumped when a slot is released
+        self._free_slots: list[int] = []
+        self._pending: dict[int, Future[float]] = {}
+        self._thread: threading.Thread | None = None
+        self._closed = False
+
+    @property
+    def sample_rate(self) -> int:
+        return self._sample_rate
+
+    @property
+    def window_size_samples(self) -> int:
+        return self._window_size_samples
+
+    @property
+    def context_size(self) -> int:
+        return self._context_size
+
+    def register(self) -> int:
+        """Allocate a slot for a new stream"""
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("BatchedOnnxModel is closed")
+
+            if not self._free_slots:
+                capacity = len(self._generations)
+                new_capacity = max(8, capacity * 2)
+                self._contexts = np.concatenate(
+                    [self._contexts, np.zeros((new_capacity - capacity, self._context_size))]
+                ).astype(np.float32, copy=False)
+                self._windows = np.concatenate(
+                    [self._windows, np.zeros((new_capacity - capacity, self._window_size_samples))]
+                ).astype(np.float32, copy=False)
+                self._generations.extend([0] * (new_capacity - capacity))
+                self._free_slots.extend(reversed(range(capacity, new_capacity)))
+
+            slot = self._free_slots.pop()
+            self._contexts[slot] = 0.0
+
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="silero_batched_vad", daemon=True
+                )
+                self._thread.start()
+
+            return slot
+
+    def unregister(self, slot: int) -> None:
+        with self._cond:
+            self._generations[slot] += 1
+            self._free_slots.append(slot)
+            fut = self._pending.pop(slot, None)
+
+        if fut is not None:
+            fut.cancel()
+
+    def submit(self, slot: int, x: np.ndarray) -> Future[float]:
+        """Queue a window for the next batch, the result is the speech probability"""
+        fut = Future[float]()
+        with self._cond:
+            if slot in self._pending:
+                raise RuntimeError("a window is already pending for this slot")
+
+            self._windows[slot] = x
+            self._pending[slot] = fut
+            self._cond.notify()
+
+        return fut
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            pending, self._pending = self._pending, {}
+            self._cond.notify()
+
+        for fut in pending.values():
+            fut.cancel()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+
+                if self._closed:
+                    return
+
+                slots = sorted(self._pending)[: self._max_batch_size]
+                futures = [self._pending.pop(slot) for slot in slots]
+                generations = [self._generations[slot] for slot in slots]
+
+                idx = np.array(slots)
+                input_buffer = np.concatenate([self._contexts[idx], self._windows[idx]], axis=1)
+
+            # like OnnxModel, only the audio context is carried across windows
+            ort_inputs = {
+                "input": input_buffer,
+                "state": np.zeros((2, len(slots), 128), dtype=np.float32),
+                "sr": self._sample_rate_nd,
+            }
+            try:
+                out, _ = self._sess.run(None, ort_inputs)
+            except Exception as e:
+                for fut in futures:
+                    if fut.set_running_or_notify_cancel():
+                        fut.set_exception(e)
+                continue
+
+            with self._cond:
+                for i, slot in enumerate(slots):
+                    # the slot may have been released (and reused) while the batch was running
+                    if self._generations[slot] == generations[i]:
+                        self._contexts[slot] = input_buffer[i, -self._context_size :]
+
+            for i, fut in enumerate(futures):
+                if fut.set_running_or_notify_cancel():
+                    fut.set_result(float(out[i, 0]))
+
+
+class RemoteOnnxModel:
+    """Runs the windows of a stream in the inference process shared by the jobs of the worker.
+
+    The samples (audio context + window) are written to a shared memory ring owned by the
+    stream, only the sequence number of the window goes through the IPC channel. The
+    inference process batches the windows of every job (see _VADRunner).
+    """
+
+    def __init__(self, *, executor: InferenceExecutor, sample_rate: int) -> None:
+        if sample_rate not in SUPPORTED_SAMPLE_RATES:
+            raise ValueError("Silero VAD only supports 8KHz and 16KHz sample rates")
+
+        self._executor = executor
+        self._sample_rate = sample_rate
+
+        if sample_rate == 8000:
+            self._window_size_samples = 256
+            self._context_size = 32
+        elif sample_rate == 16000:
+            self._window_size_samples = 512
+            self._context_size = 64
+
+        # a single window is in flight per stream, a few slots are enough
+        self._ring = shm_audio.SharedAudioRing.create(
+            window_size=self._context_size + self._window_size_samples, capacity=4
+        )
+        self._input_buffer = np.zeros(
+            self._context_size + self._window_size_samples, dtype=np.float32
+        )
+        self._registered = False
+
+    @property
+    def sample_rate(self) -> int:
+        return self._sample_rate
+
+    @property
+    def window_size_samples(self) -> int:
+        return self._window_size_samples
+
+    @property
+    def context_size(self) -> int:
+        return self._context_size
+
+    async def __call__(self, x: np.ndarray) -> float:
+        if not self._registered:
+            await self._ring.register(self._executor)
+            self._registered = True
+
+        self._input_buffer[self._context_size :] = x
+        window = self._ring.write(self._input_buffer)
+        self._input_buffer[: self._context_size] = self._input_buffer[-self._context_size :]
+
+        result = await self._executor.do_inference(VAD_INFERENCE_METHOD, window.encode())
+        assert result is not None
+        return float(_PROBABILITY.unpack(result)[0])
+
+    async def aclose(self) -> None:
+        if self._registered:
+            await self._ring.aclose(self._executor)
+        else:
+            self._ring.close()
+
+
+class _VADRunner(_InferenceRunner):
+    """Silero VAD in the inference process, registered by importing
+    livekit.plugins.silero.inference"""
+
+    INFERENCE_METHOD = VAD_INFERENCE_METHOD
+    # concurrent streams send a window every 32ms, batch the ones arriving together
+    MAX_BATCH_SIZE = 64
+    MAX_BATCH_WAIT = 0.002
+
+    def initialize(self) -> None:
+        self._sess = new_inference_session(force_cpu=True)
+
+    def run(self, data: bytes) -> bytes | None:
+        result = self.run_batch([data])[0]
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    def run_batch(self, data: list[bytes]) -> list[bytes | None | Exception]:
+        results: list[bytes | None | Exception] = [None] * len(data)
+        registry = shm_audio.registry()
+
+        # windows of different sample rates can't be stacked together
+        groups: dict[int, list[tuple[int, shm_audio.SharedAudioRing, int]]] = {}
+        for i, d in enumerate(data):
+            try:
+                window = shm_audio.SharedAudioWindow.decode(d)
+                ring = registry.get(window.ring_name)
+                if ring.window_size not in _REMOTE_WINDOW_SAMPLE_RATES:
+                    raise ValueError(f"unexpected window of {ring.window_size} samples")
+
+                groups.setdefault(ring.window_size, []).append((i, ring, window.seq))
+            except Exception as e:
+                results[i] = e
+
+        for window_size, windows in groups.items():
+            # the samples are copied from the rings straight into the batched input
+            input_buffer = np.empty((len(windows), window_size), dtype=np.float32)
+            indices: list[int] = []
+            for i, ring, seq in windows:
+                try:
+                    ring.read(seq, out=input_buffer[len(indices)])
+                    indices.append(i)
+                except Exception as e:
+                    results[i] = e
+
+            if not indices:
+                continue
+
+            # like OnnxModel, only the audio context is carried across windows
+            ort_inputs = {
+                "input": input_buffer[: len(indices)],
+                "state": np.zeros((2, len(indices), 128), dtype=np.float32),
+                "sr": np.array(_REMOTE_WINDOW_SAMPLE_RATES[window_size], dtype=np.int64),
+            }
+            out, _ = self._sess.run(None, ort_inputs)
+            for row, i in enumerate(indices):
+                results[i] = _PROBABILITY.pack(float(out[row, 0]))
+
+        return results
@@ -26,6 +26,7 @@ import onnxruntime  # type: ignore
 
 from livekit import agents, rtc
 from livekit.agents import utils
+from livekit.agents.job import get_job_context
 from livekit.agents.types import (
     NOT_GIVEN,
     NotGivenOr,
@@ -38,6 +39,47 @@ from .log import logger
 SLOW_INFERENCE_THRESHOLD = 0.2  # late by 200ms
 
 
+class _SampleBuffer:
+    """Preallocated int16 FIFO exposing its unread samples as a contiguous numpy view.
+
+    Consumed samples only advance a read cursor, the unread tail is moved back to the start of
+    the buffer when a push wouldn't fit, so pushing and consuming don't allocate.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        self._buf = np.empty(capacity, dtype=np.int16)
+        self._start = 0
+        self._end = 0
+
+    @property
+    def size(self) -> int:
+        return self._end - self._start
+
+    def push(self, data: memoryview) -> None:
+        samples = np.frombuffer(data, dtype=np.int16)
+        if self._end + len(samples) > len(self._buf):
+            size = self.size
+            if size + len(samples) > len(self._buf):
+                new_buf = np.empty(max(len(self._buf) * 2, size + len(samples)), dtype=np.int16)
+                new_buf[:size] = self._buf[self._start : self._end]
+                self._buf = new_buf
+            else:
+                self._buf[:size] = self._buf[self._start : self._end]
+
+            self._start, self._end = 0, size
+
+        self._buf[self._end : self._end + len(samples)] = samples
+        self._end += len(samples)
+
+    def view(self, n: int) -> np.ndarray:
+        return self._buf[self._start : self._start + min(n, self.size)]
+
+    def consume(self, n: int) -> None:
+        self._start += min(n, self.size)
+        if self._start == self._end:
+            self._start = self._end = 0
+
+
 @dataclass
 class _VADOptions:
     min_speech_duration: float
@@ -46,6 +88,9 @@ class _VADOptions:
     max_buffered_speech: float
     activation_threshold: float
     sample_rate: int
+    batch_inference: bool = False
+    include_inference_frames: bool = True
+    inference_process: bool = False
 
 
 class VAD(agents.vad.VAD):
@@ -67,6 +112,9 @@ class VAD(agents.vad.VAD):
         sample_rate: Literal[8000, 16000] = 16000,
         force_cpu: bool = True,
         onnx_file_path: NotGivenOr[Path | str] = NOT_GIVEN,
+        batch_inference: bool = False,
+        include_inference_frames: bool = True,
+        inference_process: bool = False,
         # deprecated
         padding_duration: NotGivenOr[float] = NOT_GIVEN,
     ) -> VAD:
@@ -105,6 +153,9 @@ class VAD(agents.vad.VAD):
             sample_rate (Literal[8000, 16000]): Sample rate for the inference (only 8KHz and 16KHz are supported).
             onnx_file_path (Path | str | None): Path to the ONNX model file. If not provided, the default model will be loaded. This can be helpful if you want to use a previous version of the silero model.
             force_cpu (bool): Force the use of CPU for inference.
+            batch_inference (bool): Run the windows of all the streams created from this instance in shared batched inferences instead of one inference per stream and window. Recommended when a process handles many concurrent streams (e.g. with the thread job executor).
+            include_inference_frames (bool): Attach the analyzed audio to `INFERENCE_DONE` events. Disable it when nothing consumes these frames to save a copy per window.
+            inference_process (bool): Run the inference in the inference process shared by the jobs of the worker, the audio windows are passed through shared memory and no model is loaded in the job process. `livekit.plugins.silero.inference` must be imported by the main module of the worker. The streams must be created from a job.
             padding_duration (float | None): **Deprecated**. Use `prefix_padding_duration` instead.
 
         Returns:
@@ -122,7 +173,12 @@ class VAD(agents.vad.VAD):
             )
             prefix_padding_duration = padding_duration
 
-        session = onnx_model.new_inference_session(force_cpu, onnx_file_path=onnx_file_path or None)
+        session: onnxruntime.InferenceSession | None = None
+        if not inference_process:
+            session = onnx_model.new_inference_session(
+                force_cpu, onnx_file_path=onnx_file_path or None
+            )
+
         opts = _VADOptions(
             min_speech_duration=min_speech_duration,
             min_silence_duration=min_silence_duration,
@@ -130,19 +186,30 @@ class VAD(agents.vad.VAD):
             max_buffered_speech=max_buffered_speech,
             activation_threshold=activation_threshold,
             sample_rate=sample_rate,
+            batch_inference=batch_inference,
+            include_inference_frames=include_inference_frames,
+            inference_process=inference_process,
         )
         return cls(session=session, opts=opts)
 
     def __init__(
         self,
         *,
-        session: onnxruntime.InferenceSession,
+        session: onnxruntime.InferenceSession | None,
         opts: _VADOptions,
     ) -> None:
         super().__init__(capabilities=agents.vad.VADCapabilities(update_interval=0.032))
         self._onnx_session = session
         self._opts = opts
         self._streams = weakref.WeakSet[VADStream]()
+        self._batched_model: onnx_model.BatchedOnnxModel | None = None
+        self._close_batched_model: weakref.finalize | None = None
+        if opts.batch_inference and session is not None:
+            self._batched_model = onnx_model.BatchedOnnxModel(
+                onnx_session=session, sample_rate=opts.sample_rate
+            )
+            # stops the inference thread when the VAD is closed or garbage collected
+            self._close_batched_model = weakref.finalize(self, self._batched_model.close)
 
     @property
     def model(self) -> str:
@@ -152,6 +219,11 @@ class VAD(agents.vad.VAD):
     def provider(self) -> str:
         return "ONNX"
 
+    async def aclose(self) -> None:
+        """Stop the batched inference thread, the streams can't be used after the VAD is closed"""
+        if self._close_batched_model is not None:
+            self._close_batched_model()
+
     def stream(self) -> VADStream:
         """
         Create a new VADStream for processing audio data.
@@ -159,13 +231,20 @@ class VAD(agents.vad.VAD):
         Returns:
             VADStream: A stream object for processing audio input and detecting speech.
         """
-        stream = VADStream(
-            self,
-            self._opts,
-            onnx_model.OnnxModel(
+        model: onnx_model.OnnxModel | onnx_model.BatchedOnnxModel | onnx_model.RemoteOnnxModel
+        if self._opts.inference_process:
+            model = onnx_model.RemoteOnnxModel(
+                executor=get_job_context().inference_executor, sample_rate=self._opts.sample_rate
+            )
+        elif self._batched_model is not None:
+            model = self._batched_model
+        else:
+            assert self._onnx_session is not None
+            model = onnx_model.OnnxModel(
                 onnx_session=self._onnx_session, sample_rate=self._opts.sample_rate
-            ),
-        )
+            )
+
+        stream = VADStream(self, self._opts, model)
         self._streams.add(stream)
         return stream
 
@@ -212,9 +291,19 @@ class VAD(agents.vad.VAD):
 
 
 class VADStream(agents.vad.VADStream):
-    def __init__(self, vad: VAD, opts: _VADOptions, model: onnx_model.OnnxModel) -> None:
-        super().__init__(vad)
+    def __init__(
+        self,
+        vad: VAD,
+        opts: _VADOptions,
+        model: onnx_model.OnnxModel | onnx_model.BatchedOnnxModel | onnx_model.RemoteOnnxModel,
+    ) -> None:
+        super().__init__(vad, sample_rate=opts.sample_rate)
         self._opts, self._model = opts, model
+
+        if isinstance(model, onnx_model.BatchedOnnxModel):
+            self._batch_slot = model.register()
+            slot = self._batch_slot
+            self._task.add_done_callback(lambda _: model.unregister(slot))
         self._loop = asyncio.get_event_loop()
         self._exp_filter = utils.ExpFilter(alpha=0.35)
 
@@ -274,6 +363,16 @@ class VADStream(agents.vad.VADStream):
 
     @agents.utils.log_exceptions(logger=logger)
     async def _main_task(self) -> None:
+        if not isinstance(self._model, onnx_model.RemoteOnnxModel):
+            return await self._run_inference()
+
+        try:
+            await self._run_inference()
+        finally:
+            # detach the inference process from the ring of this stream
+            await self._model.aclose()
+
+    async def _run_inference(self) -> None:
         inference_f32_data = np.empty(self._model.window_size_samples, dtype=np.float32)
         speech_buffer_index: int = 0
 
@@ -287,8 +386,8 @@ class VADStream(agents.vad.VADStream):
         speech_threshold_duration = 0.0
         silence_threshold_duration = 0.0
 
-        input_frames: list[rtc.AudioFrame] = []
-        inference_frames: list[rtc.AudioFrame] = []
+        input_buffer: _SampleBuffer | None = None
+        inference_buffer = _SampleBuffer(self._model.window_size_samples * 4)
         resampler: rtc.AudioResampler | None = None
 
         # used to avoid drift when the sample_rate ratio is not an integer
@@ -313,6 +412,8 @@ class VADStream(agents.vad.VADStream):
                     + self._prefix_padding_samples,
                     dtype=np.int16,
                 )
+                # sized for 100ms of input, grows if bigger frames are pushed
+                input_buffer = _SampleBuffer(self._input_sample_rate // 10)
 
                 if self._input_sample_rate != self._opts.sample_rate:
                     # resampling needed: the input sample rate isn't the same as the model's
@@ -328,37 +429,37 @@ class VADStream(agents.vad.VADStream):
                 continue
 
             assert self._speech_buffer is not None
+            assert input_buffer is not None
 
-            input_frames.append(input_frame)
+            input_buffer.push(input_frame.data)
             if resampler is not None:
                 # the resampler may have a bit of latency, but it is OK to ignore since it should be
                 # negligible
-                inference_frames.extend(resampler.push(input_frame))
+                for resampled_frame in resampler.push(input_frame):
+                    inference_buffer.push(resampled_frame.data)
             else:
-                inference_frames.append(input_frame)
+                inference_buffer.push(input_frame.data)
 
-            while True:
+            while inference_buffer.size >= self._model.window_size_samples:
                 start_time = time.perf_counter()
 
-                available_inference_samples = sum(
-                    [frame.samples_per_channel for frame in inference_frames]
-                )
-                if available_inference_samples < self._model.window_size_samples:
-                    break  # not enough samples to run inference
-
-                input_frame = utils.combine_frames(input_frames)
-                inference_frame = utils.combine_frames(inference_frames)
-
                 # convert data to f32
                 np.divide(
-                    inference_frame.data[: self._model.window_size_samples],
+                    inference_buffer.view(self._model.window_size_samples),
                     np.iinfo(np.int16).max,
                     out=inference_f32_data,
                     dtype=np.float32,
                 )
 
                 # run the inference
-                p = await self._loop.run_in_executor(None, self._model, inference_f32_data)
+                if isinstance(self._model, onnx_model.BatchedOnnxModel):
+                    p = await asyncio.wrap_future(
+                        self._model.submit(self._batch_slot, inference_f32_data)
+                    )
+                elif isinstance(self._model, onnx_model.RemoteOnnxModel):
+                    p = await self._model(inference_f32_data)
+                else:
+                    p = await self._loop.run_in_executor(None, self._model, inference_f32_data)
                 p = self._exp_filter.apply(exp=1.0, sample=p)
 
                 window_duration = self._model.window_size_samples / self._opts.sample_rate
@@ -372,14 +473,15 @@ class VADStream(agents.vad.VADStream):
                 )
                 to_copy_int = int(to_copy)
                 input_copy_remaining_fract = to_copy - to_copy_int
+                input_window = input_buffer.view(to_copy_int)
 
                 # copy the inference window to the speech buffer
                 available_space = len(self._speech_buffer) - speech_buffer_index
-                to_copy_buffer = min(to_copy_int, available_space)
+                to_copy_buffer = min(len(input_window), available_space)
                 if to_copy_buffer > 0:
                     self._speech_buffer[
                         speech_buffer_index : speech_buffer_index + to_copy_buffer
-                    ] = input_frame.data[:to_copy_buffer]
+                    ] = input_window[:to_copy_buffer]
                     speech_buffer_index += to_copy_buffer
                 elif not self._speech_buffer_max_reached:
                     # reached self._opts.max_buffered_speech (padding is included)
@@ -417,7 +519,7 @@ class VADStream(agents.vad.VADStream):
                 def _copy_speech_buffer() -> rtc.AudioFrame:
                     # copy the data from speech_buffer
                     assert self._speech_buffer is not None
-                    speech_data = self._speech_buffer[:speech_buffer_index].tobytes()  # noqa: B023
+                    speech_data = self._speech_buffer[:speech_buffer_index].data  # noqa: B023
 
                     return rtc.AudioFrame(
                         sample_rate=self._input_sample_rate,
@@ -442,12 +544,14 @@ class VADStream(agents.vad.VADStream):
                         inference_duration=inference_duration,
                         frames=[
                             rtc.AudioFrame(
-                                data=input_frame.data[:to_copy_int].tobytes(),
+                                data=input_window.data,
                                 sample_rate=self._input_sample_rate,
                                 num_channels=1,
-                                samples_per_channel=to_copy_int,
+                                samples_per_channel=len(input_window),
                             )
-                        ],
+                        ]
+                        if self._opts.include_inference_frames
+                        else [],
                         speaking=pub_speaking,
                         raw_accumulated_silence=silence_threshold_duration,
                         raw_accumulated_speech=speech_threshold_duration,
@@ -506,29 +610,6 @@ class VADStream(agents.vad.VADStream):
 
                         _reset_write_cursor()
 
-                # remove the frames that were used for inference from the input and inference frames
-                input_frames = []
-                inference_frames = []
-
-                # add the remaining data
-                if len(input_frame.data) - to_copy_int > 0:
-                    data = input_frame.data[to_copy_int:].tobytes()
-                    input_frames.append(
-                        rtc.AudioFrame(
-                            data=data,
-                            sample_rate=self._input_sample_rate,
-                            num_channels=1,
-                            samples_per_channel=len(data) // 2,
-                        )
-                    )
-
-                if len(inference_frame.data) - self._model.window_size_samples > 0:
-                    data = inference_frame.data[self._model.window_size_samples :].tobytes()
-                    inference_frames.append(
-                        rtc.AudioFrame(
-                            data=data,
-                            sample_rate=self._opts.sample_rate,
-                            num_channels=1,
-                            samples_per_channel=len(data) // 2,
-                        )
-                    )
+                # remove the samples that were used for inference
+                input_buffer.consume(to_copy_int)
+                inference_buffer.consume(self._model.window_size_samples)
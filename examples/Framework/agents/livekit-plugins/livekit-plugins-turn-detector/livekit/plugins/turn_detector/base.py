@@ -8,12 +8,15 @@ import re
 import time
 import unicodedata
 from abc import ABC, abstractmethod
+from dataclasses import asdict, dataclass
 from typing import Any
 
+import numpy as np
 from huggingface_hub import errors
 
 from livekit.agents import Plugin, llm
 from livekit.agents.inference_runner import _InferenceRunner
+from livekit.agents.ipc.inference_codec import BinaryReader, BinaryWriter, Buffer
 from livekit.agents.ipc.inference_executor import InferenceExecutor
 from livekit.agents.job import get_job_context
 from livekit.agents.utils import hw
@@ -25,6 +28,58 @@ from .version import __version__
 MAX_HISTORY_TOKENS = 128
 MAX_HISTORY_TURNS = 6
 
+_ROLES = ("user", "assistant")
+
+
+@dataclass
+class _EOUResult:
+    eou_probability: float
+    duration: float
+    batch_size: int
+    input: str
+
+
+class _EOUCodec:
+    """Binary payloads for the EOU runners (implements ipc.inference_codec.InferenceCodec)
+
+    request: u32 message count, then per message a u8 role index and the utf-8 content
+    response: f64 eou_probability, f64 duration, u32 batch_size, utf-8 input
+    """
+
+    def encode_request(self, req: list[dict[str, Any]]) -> memoryview:
+        w = BinaryWriter()
+        w.write_u32(len(req))
+        for msg in req:
+            w.write_u8(_ROLES.index(msg["role"]))
+            w.write_string(msg["content"])
+        return w.getbuffer()
+
+    def decode_request(self, data: Buffer) -> list[dict[str, Any]]:
+        r = BinaryReader(data)
+        return [
+            {"role": _ROLES[r.read_u8()], "content": r.read_string()} for _ in range(r.read_u32())
+        ]
+
+    def encode_response(self, resp: _EOUResult) -> memoryview:
+        w = BinaryWriter(capacity=64 + len(resp.input))
+        w.write_f64(resp.eou_probability)
+        w.write_f64(resp.duration)
+        w.write_u32(resp.batch_size)
+        w.write_string(resp.input)
+        return w.getbuffer()
+
+    def decode_response(self, data: Buffer) -> _EOUResult:
+        r = BinaryReader(data)
+        return _EOUResult(
+            eou_probability=r.read_f64(),
+            duration=r.read_f64(),
+            batch_size=r.read_u32(),
+            input=r.read_string(),
+        )
+
+
+_codec = _EOUCodec()
+
 
 def _download_from_hf_hub(repo_id: str, filename: str, **kwargs: Any) -> str:
     from huggingface_hub import hf_hub_download
@@ -45,6 +100,12 @@ def _download_from_hf_hub(repo_id: str, filename: str, **kwargs: Any) -> str:
 
 
 class _EUORunnerBase(_InferenceRunner):
+    # concurrent sessions on a worker share the inference process, batch their predictions
+    MAX_BATCH_SIZE = 16
+    MAX_BATCH_WAIT = 0.005
+    # cleared if the model can't run padded batches
+    _batched_inference = True
+
     @classmethod
     @abstractmethod
     def model_type(cls) -> EOUModelType: ...
@@ -149,32 +210,89 @@ class _EUORunnerBase(_InferenceRunner):
             ) from None
 
     def run(self, data: bytes) -> bytes | None:
-        data_json = json.loads(data)
-        chat_ctx = data_json.get("chat_ctx", None)
-
-        if not chat_ctx:
-            raise ValueError("chat_ctx is required on the inference input data")
-
+        result = self.run_batch([data])[0]
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    def run_batch(self, data: list[bytes]) -> list[bytes | None | Exception]:
+        # each request is validated on its own, a bad one doesn't fail the rest of the batch
+        results: list[bytes | None | Exception] = [None] * len(data)
+        texts: dict[int, str] = {}
+        token_ids: dict[int, np.ndarray] = {}
         start_time = time.perf_counter()
-        text = self._format_chat_ctx(chat_ctx)
-        inputs = self._tokenizer(
-            text,
-            add_special_tokens=False,
-            return_tensors="np",
-            max_length=MAX_HISTORY_TOKENS,
-            truncation=True,
-        )
-        # run inference
-        outputs = self._session.run(None, {"input_ids": inputs["input_ids"].astype("int64")})
-        eou_probability = outputs[0].flatten()[-1]
+        for i, d in enumerate(data):
+            try:
+                chat_ctx = _codec.decode_request(d)
+                if not chat_ctx:
+                    raise ValueError("chat_ctx is required on the inference input data")
+
+                texts[i] = self._format_chat_ctx(chat_ctx)
+                token_ids[i] = self._tokenizer(
+                    texts[i],
+                    add_special_tokens=False,
+                    return_tensors="np",
+                    max_length=MAX_HISTORY_TOKENS,
+                    truncation=True,
+                )["input_ids"][0]
+            except Exception as e:
+                results[i] = e
+
+        if not token_ids:
+            return results
+
+        probs = self._eou_probabilities(list(token_ids.values()))
         end_time = time.perf_counter()
 
-        result: dict[str, Any] = {
-            "eou_probability": float(eou_probability),
-            "duration": round(end_time - start_time, 3),
-            "input": text,
-        }
-        return json.dumps(result).encode()
+        for i, prob in zip(token_ids, probs):
+            results[i] = bytes(
+                _codec.encode_response(
+                    _EOUResult(
+                        eou_probability=prob,
+                        duration=round(end_time - start_time, 3),
+                        batch_size=len(token_ids),
+                        input=texts[i],
+                    )
+                )
+            )
+        return results
+
+    def _eou_probabilities(self, token_ids: list[np.ndarray]) -> list[float]:
+        if len(token_ids) > 1 and self._batched_inference:
+            # right-pad to the longest sequence, the model is causal so the probability at the
+            # last real token of each row isn't affected by the padding that follows it
+            lengths = [len(ids) for ids in token_ids]
+            input_ids = np.full(
+                (len(token_ids), max(lengths)), self._tokenizer.pad_token_id or 0, dtype=np.int64
+            )
+            for i, ids in enumerate(token_ids):
+                input_ids[i, : len(ids)] = ids
+
+            try:
+                output = np.asarray(self._session.run(None, {"input_ids": input_ids})[0])
+            except Exception:
+                output = None
+
+            # only usable if the model returns a probability per token of each row
+            if output is not None and output.size == input_ids.size:
+                probs = output.reshape(input_ids.shape)
+                return [float(probs[i, n - 1]) for i, n in enumerate(lengths)]
+
+            logger.warning(
+                "the turn detector model doesn't support batched inputs, running one at a time",
+                extra={"output_shape": None if output is None else output.shape},
+            )
+            self._batched_inference = False
+
+        # one run per sample, the probability of the last token
+        return [
+            float(
+                np.asarray(
+                    self._session.run(None, {"input_ids": ids[np.newaxis, :].astype(np.int64)})[0]
+                ).flatten()[-1]
+            )
+            for ids in token_ids
+        ]
 
     @classmethod
     def _download_files(cls) -> None:
@@ -270,7 +388,7 @@ class EOUModelBase(ABC):
             if item.type != "message":
                 continue
 
-            if item.role not in ("user", "assistant"):
+            if item.role not in _ROLES:
                 continue
 
             text_content = item.text_content
@@ -283,13 +401,13 @@ class EOUModelBase(ABC):
                 )
 
         messages = messages[-MAX_HISTORY_TURNS:]
-        json_data = json.dumps({"chat_ctx": messages}).encode()
 
         result = await asyncio.wait_for(
-            self._executor.do_inference(self._inference_method(), json_data), timeout=timeout
+            self._executor.do_inference(self._inference_method(), _codec.encode_request(messages)),
+            timeout=timeout,
         )
         assert result is not None, "end_of_utterance prediction should always returns a result"
 
-        result_json: dict[str, Any] = json.loads(result.decode())
-        logger.debug("eou prediction", extra=result_json)
-        return result_json["eou_probability"]  # type: ignore
+        eou_result = _codec.decode_response(result)
+        logger.debug("eou prediction", extra=asdict(eou_result))
+        return eou_result.eou_probability
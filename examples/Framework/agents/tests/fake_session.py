@@ -30,6 +30,8 @@ def create_session(
     *,
     speed_factor: float = 1.0,
     extra_kwargs: dict[str, Any] | None = None,
+    audio_output: FakeAudioOutput | None = None,
+    transcription_output: FakeTextOutput | None = None,
 ) -> AgentSession:
     user_speeches = actions.get_user_speeches(speed_factor=speed_factor)
     llm_responses = actions.get_llm_responses(speed_factor=speed_factor)
@@ -54,8 +56,8 @@ def create_session(
 
     # setup io with transcription sync
     audio_input = FakeAudioInput()
-    audio_output = FakeAudioOutput()
-    transcription_output = FakeTextOutput()
+    audio_output = audio_output or FakeAudioOutput()
+    transcription_output = transcription_output or FakeTextOutput()
 
     transcript_sync = TranscriptSynchronizer(
         next_in_chain_audio=audio_output,
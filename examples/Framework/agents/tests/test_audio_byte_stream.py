@@ -0,0 +1,28 @@
+import os
+
+import pytest
+
+from livekit.agents.utils.audio import AudioByteStream
+
+
+@pytest.mark.parametrize("num_channels", [1, 2])
+@pytest.mark.parametrize("chunk_size", [2, 960, 48000, 240000])
+def test_audio_byte_stream_chunking(num_channels: int, chunk_size: int):
+    samples_per_channel = 480
+    frame_size = samples_per_channel * num_channels * 2
+    pcm = os.urandom(240000 * num_channels + 4 * num_channels)
+
+    bstream = AudioByteStream(24000, num_channels, samples_per_channel=samples_per_channel)
+    frames = []
+    for i in range(0, len(pcm), chunk_size * num_channels):
+        frames.extend(bstream.push(pcm[i : i + chunk_size * num_channels]))
+
+    assert len(frames) == len(pcm) // frame_size
+    assert all(f.samples_per_channel == samples_per_channel for f in frames)
+
+    tail = bstream.flush()
+    assert len(tail) == 1
+    assert tail[0].num_channels == num_channels
+    assert tail[0].samples_per_channel == (len(pcm) % frame_size) // (2 * num_channels)
+    assert b"".join(bytes(f.data) for f in frames + tail) == pcm
+    assert bstream.flush() == []
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import asyncio
+
+import numpy as np
+
+from livekit import rtc
+from livekit.agents.utils.audio import AudioHub, AudioHubSubscription
+
+
+def _frames(n: int, sample_rate: int = 48000) -> list[rtc.AudioFrame]:
+    samples = sample_rate // 100
+    t = np.arange(n * samples) / sample_rate
+    pcm = (np.sin(2 * np.pi * 440 * t) * 8000).astype(np.int16)
+    return [
+        rtc.AudioFrame(
+            data=pcm[i * samples : (i + 1) * samples].tobytes(),
+            sample_rate=sample_rate,
+            num_channels=1,
+            samples_per_channel=samples,
+        )
+        for i in range(n)
+    ]
+
+
+async def _read(sub: AudioHubSubscription) -> list[rtc.AudioFrame]:
+    frames = []
+    while True:
+        try:
+            frames.append(await asyncio.wait_for(sub.__anext__(), 0.05))
+        except asyncio.TimeoutError:
+            return frames
+
+
+async def test_audio_hub_resample_once() -> None:
+    hub = AudioHub()
+    stt = hub.subscribe("stt")
+    vad = hub.subscribe("vad", sample_rate=16000)
+    raw = hub.subscribe("raw")
+
+    frames = _frames(50)
+    for frame in frames:
+        hub.push(frame)
+
+    # the stt sets its sample rate once its stream is created, before reading the queued frames
+    stt.set_sample_rate(16000)
+    stt_frames, vad_frames, raw_frames = await _read(stt), await _read(vad), await _read(raw)
+
+    assert raw_frames == frames
+    assert len(hub._resampled) == 1
+    assert len(stt_frames) == len(vad_frames) > 0
+    assert all(a is b for a, b in zip(stt_frames, vad_frames))
+
+    resampler = rtc.AudioResampler(48000, 16000, quality=rtc.AudioResamplerQuality.HIGH)
+    expected = [f for frame in frames for f in resampler.push(frame)]
+    # same as resampling the stream on its own (up to the dithering of the resampler)
+    pcm = np.concatenate([np.frombuffer(f.data, dtype=np.int16) for f in stt_frames])
+    expected_pcm = np.concatenate([np.frombuffer(f.data, dtype=np.int16) for f in expected])
+    assert len(pcm) == len(expected_pcm)
+    assert np.abs(pcm.astype(np.int32) - expected_pcm).max() <= 2
+
+    # every frame was read, nothing is kept
+    assert not hub._frames
+    assert all(not stream.outputs for stream in hub._resampled.values())
+
+
+async def test_audio_hub_lag() -> None:
+    hub = AudioHub(lag_warning_threshold=10.0)
+    fast = hub.subscribe("fast", sample_rate=16000)
+    slow = hub.subscribe("slow", sample_rate=16000)
+
+    for frame in _frames(10):
+        hub.push(frame)
+
+    await asyncio.sleep(0.1)
+    await _read(fast)
+    lag = hub.lag()
+    assert lag["fast"] == 0.0
+    assert lag["slow"] >= 0.1
+    assert len(hub._frames) == 10  # kept until the slow subscriber reads them
+
+    slow.close()
+    assert "slow" not in hub.lag()
+    assert not hub._frames
+
+    # a closed subscription ends its iteration
+    hub.push(_frames(1)[0])
+    hub.close()
+    assert [f async for f in fast] == []
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import wave
+from pathlib import Path
+
+import numpy as np
+
+from livekit import rtc
+from livekit.agents.voice import background_audio
+from livekit.agents.voice.background_audio import _apply_gain, _clip_frames
+
+
+def _write_clip(path: Path) -> str:
+    t = np.arange(24000) / 24000
+    with wave.open(str(path), "wb") as f:
+        f.setnchannels(2)
+        f.setsampwidth(2)
+        f.setframerate(24000)
+        f.writeframes(np.repeat(np.sin(2 * np.pi * 440 * t) * 8000, 2).astype(np.int16).tobytes())
+    return str(path)
+
+
+def _pcm(frames: list[rtc.AudioFrame]) -> np.ndarray:
+    return np.concatenate([np.frombuffer(f.data, dtype=np.int16) for f in frames])
+
+
+async def test_clip_cache(monkeypatch, tmp_path: Path) -> None:
+    clip_path = _write_clip(tmp_path / "clip.wav")
+    background_audio._clip_cache.clear()
+    monkeypatch.setattr(background_audio, "_clip_cache_size", 0)
+
+    decoded = [f async for f in _clip_frames(clip_path, 0.5)]
+    assert len(background_audio._clip_cache) == 1
+
+    def _no_decode(*args: object, **kwargs: object) -> None:
+        raise AssertionError("the clip is decoded again")
+
+    monkeypatch.setattr(background_audio, "audio_frames_from_file", _no_decode)
+    cached = [f async for f in _clip_frames(clip_path, 0.5)]
+    assert np.array_equal(_pcm(cached), _pcm(decoded))
+    assert all(f.sample_rate == 48000 and f.num_channels == 1 for f in cached)
+    assert all(f.samples_per_channel == 4800 for f in cached[:-1])
+
+    # the cache is bounded, the least recently used clips are evicted
+    monkeypatch.setattr(
+        background_audio, "AUDIO_CLIP_CACHE_SIZE", background_audio._clip_cache_size
+    )
+    background_audio._put_clip(("other",), np.zeros(1, dtype=np.int16))
+    assert list(background_audio._clip_cache) == [("other",)]
+    assert background_audio._clip_cache_size == 2
+    background_audio._clip_cache.clear()
+
+
+def test_apply_gain() -> None:
+    data = np.array([1000, -1000, 32767, -32768], dtype=np.int16)
+    frame = rtc.AudioFrame(data=data, sample_rate=48000, num_channels=1, samples_per_channel=4)
+
+    # the frames of the caller are left untouched, a reused frame doesn't fade out
+    for _ in range(2):
+        scaled = _apply_gain(frame, 0.5)
+        assert scaled is not frame
+        assert np.frombuffer(scaled.data, dtype=np.int16).tolist() == [500, -500, 16383, -16384]
+    assert np.frombuffer(frame.data, dtype=np.int16).tolist() == data.tolist()
+
+    assert _apply_gain(frame, 0.5, in_place=True) is frame
+    assert np.frombuffer(frame.data, dtype=np.int16).tolist() == [500, -500, 16383, -16384]
+
+    # clipped above unity gain
+    _apply_gain(frame, 4.0, in_place=True)
+    assert np.frombuffer(frame.data, dtype=np.int16).tolist() == [2000, -2000, 32767, -32768]
@@ -217,3 +217,185 @@ async def test_summarize():
         summary = await chat_ctx.summarize(llm, keep_last_turns=1)
         print("\n=== Summary ===\n")
         print(json.dumps(summary.to_dict(), indent=2))
+
+
+def _ctx(*ids: str):
+    from livekit.agents.llm import ChatContext, ChatMessage
+
+    return ChatContext([ChatMessage(id=i, role="user", content=[i]) for i in ids])
+
+
+def test_chat_ctx_diff():
+    old = _ctx("a", "b", "c", "d", "e")
+    new = _ctx("a", "c", "x", "b", "e", "y")
+
+    diff = utils.compute_chat_ctx_diff(old, new)
+    # one of "b" and "c" is moved, "d" is removed
+    assert sorted(diff.to_remove) in (["b", "d"], ["c", "d"])
+    assert diff.to_update == []
+
+    # applying the diff gives the new order
+    ids = [i for i in ["a", "b", "c", "d", "e"] if i not in diff.to_remove]
+    for prev_id, item_id in diff.to_create:
+        ids.insert(ids.index(prev_id) + 1 if prev_id else 0, item_id)
+    assert ids == ["a", "c", "x", "b", "e", "y"]
+
+    assert utils._compute_lcs(["a", "b", "c"], ["a", "b", "c", "d"]) == ["a", "b", "c"]
+    assert utils._compute_lcs(["c", "b", "a"], ["a", "b", "c"]) in (["a"], ["b"], ["c"])
+    assert utils._compute_lcs([], ["a"]) == []
+
+
+def test_chat_ctx_diff_updates():
+    from livekit import rtc
+    from livekit.agents.llm import ChatContext, ChatMessage, ImageContent
+
+    frame = rtc.VideoFrame(4, 4, rtc.VideoBufferType.RGB24, b"0" * 4 * 4 * 3)
+    image = ImageContent(id="img", image=frame)
+    old = ChatContext(
+        [
+            ChatMessage(id="msg", role="user", content=["look", image]),
+            FunctionCall(id="call", call_id="c1", name="f", arguments="{}"),
+            FunctionCallOutput(id="out", call_id="c1", name="f", output="1", is_error=False),
+        ]
+    )
+    assert utils.compute_chat_ctx_diff(old, old.copy()).to_update == []
+
+    # a provider echo of the image can't be compared, only its presence is
+    echoed = ChatContext(
+        [
+            ChatMessage(id="msg", role="user", content=["look", ImageContent(image="https://x")]),
+            *old.items[1:],
+        ]
+    )
+    assert utils.compute_chat_ctx_diff(echoed, old).to_update == []
+
+    new = ChatContext(
+        [
+            ChatMessage(
+                id="msg",
+                role="user",
+                content=["look", ImageContent(id="img", image=frame, inference_detail="low")],
+            ),
+            FunctionCall(id="call", call_id="c1", name="f", arguments='{"a": 1}'),
+            FunctionCallOutput(id="out", call_id="c1", output="2", is_error=False),
+        ]
+    )
+    diff = utils.compute_chat_ctx_diff(old, new)
+    assert diff.to_update == [(None, "msg"), ("msg", "call"), ("call", "out")]
+    assert diff.to_create == [] and diff.to_remove == []
+
+    no_image = ChatContext([ChatMessage(id="msg", role="user", content=["look"]), *old.items[1:]])
+    assert utils.compute_chat_ctx_diff(old, no_image).to_update == [(None, "msg")]
+
+
+async def test_serialize_image_cache():
+    import numpy as np
+
+    from livekit import rtc
+    from livekit.agents.llm import ChatContext, ImageContent
+
+    pixels = np.random.randint(0, 255, (64, 96, 4), dtype=np.uint8)
+    frame = rtc.VideoFrame(96, 64, rtc.VideoBufferType.RGBA, pixels.tobytes())
+    i420 = frame.convert(rtc.VideoBufferType.I420)
+
+    chat_ctx = ChatContext.empty()
+    chat_ctx.add_message(role="user", content=[ImageContent(image=i420)])
+    await utils.serialize_chat_ctx_images(chat_ctx)
+    image = chat_ctx.items[0].content[0]
+    assert "serialized_image" in image._cache
+
+    # the same frame pushed again reuses the encoding
+    copy = rtc.VideoFrame(96, 64, rtc.VideoBufferType.I420, bytes(i420.data))
+    serialized = utils.serialize_image(ImageContent(image=copy))
+    assert serialized.data_bytes is image._cache["serialized_image"].data_bytes
+    assert serialized.mime_type == "image/jpeg"
+
+    # but not with other encoding options or another frame
+    resized = utils.serialize_image(
+        ImageContent(image=copy, inference_width=48, inference_height=32)
+    )
+    assert resized.data_bytes != serialized.data_bytes
+
+    other = rtc.VideoFrame(96, 64, rtc.VideoBufferType.RGBA, (255 - pixels).tobytes())
+    assert utils.serialize_image(ImageContent(image=other)).data_bytes != serialized.data_bytes
+
+
+def test_provider_format_cache():
+    from livekit.agents.llm import ChatContext, FunctionCallOutput
+
+    chat_ctx = ChatContext.empty()
+    chat_ctx.add_message(role="user", content="what's the weather?")
+    chat_ctx.insert(
+        FunctionCall(id="item_call/fnc_0", call_id="call_1", name="weather", arguments="{}")
+    )
+    chat_ctx.insert(
+        FunctionCallOutput(call_id="call_1", name="weather", output="sunny", is_error=False)
+    )
+    msg = chat_ctx.add_message(role="assistant", content="it's sunny")
+
+    messages, _ = chat_ctx.to_provider_format("anthropic")
+    assert messages[-1]["content"][-1] == {"text": "it's sunny", "type": "text"}
+
+    # the returned blocks aren't shared with the cache
+    messages[-1]["content"][-1]["cache_control"] = {"type": "ephemeral"}
+    messages, _ = chat_ctx.to_provider_format("anthropic")
+    assert "cache_control" not in messages[-1]["content"][-1]
+
+    # mutating an item invalidates its cached format
+    msg.content[0] = "it's raining"
+    messages, _ = chat_ctx.to_provider_format("anthropic")
+    assert messages[-1]["content"][-1]["text"] == "it's raining"
+
+    messages, _ = chat_ctx.to_provider_format("openai")
+    assert messages[-1] == {"role": "assistant", "content": "it's raining"}
+    assert messages[1]["tool_calls"][0]["id"] == "call_1"
+    messages, _ = chat_ctx.to_provider_format("openai")
+    assert messages[1]["tool_calls"][0]["id"] == "call_1"
+
+
+def test_chat_ctx_index():
+    from livekit.agents.llm import ChatContext, ChatMessage
+
+    def _msg(i: int) -> ChatMessage:
+        return ChatMessage(id=f"item_{i}", role="user", content=[str(i)], created_at=float(i))
+
+    def _check(chat_ctx: ChatContext) -> None:
+        for i, item in enumerate(chat_ctx.items):
+            assert chat_ctx.index_by_id(item.id) == i
+            assert chat_ctx.get_by_id(item.id) is item
+        assert chat_ctx.get_by_id("missing") is None
+
+    chat_ctx = ChatContext([_msg(i) for i in range(0, 20, 2)])
+    _check(chat_ctx)
+
+    # inserted by created_at, at the end and in the middle
+    chat_ctx.insert(_msg(30))
+    chat_ctx.insert([_msg(5), _msg(1)])
+    assert [item.created_at for item in chat_ctx.items] == sorted(
+        item.created_at for item in chat_ctx.items
+    )
+    _check(chat_ctx)
+
+    # same created_at, inserted after the existing items
+    chat_ctx.insert(ChatMessage(id="item_dup", role="user", content=["dup"], created_at=4.0))
+    assert chat_ctx.index_by_id("item_dup") == chat_ctx.index_by_id("item_4") + 1
+
+    # direct mutations of the items list
+    chat_ctx.items.append(_msg(40))
+    chat_ctx.items[0] = _msg(-1)
+    chat_ctx.items.remove(chat_ctx.items[3])
+    chat_ctx.items.pop()
+    _check(chat_ctx)
+
+    other = ChatContext([_msg(i) for i in range(0, 40, 3)])
+    chat_ctx.merge(other)
+    _check(chat_ctx)
+
+    chat_ctx.truncate(max_items=5)
+    assert len(chat_ctx.items) == 5
+    _check(chat_ctx)
+
+    chat_ctx.items = [_msg(i) for i in range(3)]
+    _check(chat_ctx)
+    assert chat_ctx.find_insertion_index(created_at=1.5) == 2
+    assert chat_ctx.find_insertion_index(created_at=-1.0) == 0
@@ -1,3 +1,4 @@
+import asyncio
 import time
 
 import pytest
@@ -81,3 +82,109 @@ async def test_get_expired():
 
     conn2 = await pool.get()
     assert conn2 is not conn, "Expected a new connection to be returned."
+
+
+class _SlowConnector:
+    def __init__(self):
+        self.counter = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.release = asyncio.Event()
+        self.closed = []
+
+    async def connect(self, timeout):
+        self.counter += 1
+        conn = DummyConnection(self.counter)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await self.release.wait()
+        finally:
+            self.in_flight -= 1
+        return conn
+
+    async def close(self, conn):
+        self.closed.append(conn)
+
+
+async def test_reuse_does_not_wait_for_connect():
+    connector = _SlowConnector()
+    pool = ConnectionPool(
+        connect_cb=connector.connect, close_cb=connector.close, max_concurrent_connects=2
+    )
+
+    connector.release.set()
+    idle = await pool.get(timeout=1)
+    connector.release.clear()
+
+    # two connects run concurrently, the third waits for a slot
+    connects = [asyncio.create_task(pool.get(timeout=1)) for _ in range(3)]
+    await asyncio.sleep(0.01)
+    assert connector.in_flight == 2
+
+    # an idle connection is reused while the connects are in flight
+    pool.put(idle)
+    assert await asyncio.wait_for(pool.get(timeout=1), 0.1) is idle
+
+    connector.release.set()
+    assert len({conn.id for conn in await asyncio.gather(*connects)}) == 3
+    assert connector.max_in_flight == 2
+    assert pool.stats.hits == 1 and pool.stats.misses == 4
+    assert pool.stats.connects == 4
+
+    await pool.aclose()
+    assert len(connector.closed) == 4
+
+
+async def test_prewarm_target():
+    connector = _SlowConnector()
+    pool = ConnectionPool(connect_cb=connector.connect, prewarm_target=3)
+
+    pool.prewarm()
+    pool.prewarm()
+    await asyncio.sleep(0.01)
+    assert connector.in_flight == 3
+
+    # a get() waits for a prewarm connect instead of opening another connection
+    get_task = asyncio.create_task(pool.get(timeout=1))
+    await asyncio.sleep(0.01)
+    connector.release.set()
+    conn = await get_task
+    await asyncio.sleep(0)
+    assert connector.counter == 3
+    assert pool.num_idle == 2
+    assert pool.stats.hits == 1 and pool.stats.misses == 0
+
+    # topped up once the connection is in use
+    pool.prewarm()
+    await asyncio.sleep(0.01)
+    assert connector.counter == 4 and pool.num_idle == 3
+    pool.put(conn)
+    assert pool.num_idle == 4
+
+    await pool.aclose()
+
+
+async def test_expire_idle_connections():
+    connector = _SlowConnector()
+    connector.release.set()
+    pool = ConnectionPool(
+        connect_cb=connector.connect, close_cb=connector.close, max_idle_time=0.05
+    )
+
+    conn1 = await pool.get(timeout=1)
+    conn2 = await pool.get(timeout=1)
+    pool.put(conn1)
+    await asyncio.sleep(0.03)
+    pool.put(conn2)
+
+    await asyncio.sleep(0.04)
+    assert connector.closed == [conn1]
+    assert pool.num_idle == 1
+
+    await asyncio.sleep(0.04)
+    assert connector.closed == [conn1, conn2]
+    assert pool.stats.expired == 2
+    assert pool.num_idle == 0
+
+    await pool.aclose()
@@ -3,8 +3,11 @@ from __future__ import annotations
 import asyncio
 import ctypes
 import io
+import logging
 import multiprocessing as mp
+import os
 import socket
+import threading
 import time
 import uuid
 from dataclasses import dataclass
@@ -12,8 +15,9 @@ from multiprocessing.context import BaseContext
 from typing import ClassVar
 
 import psutil
+import pytest
 
-from livekit.agents import JobContext, JobProcess, ipc, job, utils
+from livekit.agents import JobContext, JobProcess, inference_runner, ipc, job, utils
 from livekit.protocol import agent
 
 
@@ -107,6 +111,174 @@ def test_sync_channel():
     pch.close()
 
 
+def test_inference_codec_roundtrip():
+    import array
+
+    w = ipc.inference_codec.BinaryWriter(capacity=4)
+    w.write_u8(7)
+    w.write_u32(123456)
+    w.write_f64(0.25)
+    w.write_string("héllo")
+    w.write_int32_array(array.array("i", [1, -2, 3]))
+
+    # the payload is sent as a memoryview, it must survive the channel encoding
+    msg = ipc.proto.InferenceRequest(method="m", request_id="r", data=w.getbuffer())
+    decoded = ipc.channel._read_message(ipc.channel._write_message(msg), ipc.proto.IPC_MESSAGES)
+    assert isinstance(decoded, ipc.proto.InferenceRequest)
+
+    r = ipc.inference_codec.BinaryReader(decoded.data)
+    assert r.read_u8() == 7
+    assert r.read_u32() == 123456
+    assert r.read_f64() == 0.25
+    assert r.read_string() == "héllo"
+    assert r.read_int32_array().tolist() == [1, -2, 3]
+
+
+def _read_shared_window(ring_name: str, payload: bytes, result: mp.Queue) -> None:
+    window = ipc.shm_audio.SharedAudioWindow.decode(payload)
+    ring = ipc.shm_audio.registry().get(window.ring_name)
+    result.put(ring.read(window.seq).tolist())
+    ipc.shm_audio.registry().close()
+
+
+def test_shared_audio_ring():
+    import numpy as np
+
+    ring = ipc.shm_audio.SharedAudioRing.create(window_size=4, capacity=2)
+    try:
+        # the slots start empty, not as holding window 0
+        assert not ring.is_valid(0)
+        with pytest.raises(ValueError):
+            ring.read(0)
+
+        first = ring.write(np.arange(4, dtype=np.float32))
+        second = ring.write(np.full(4, 0.5, dtype=np.float32))
+
+        # only the notification goes through the channel, the samples are read in place
+        mp_ctx = mp.get_context("spawn")
+        result = mp_ctx.Queue()
+        proc = mp_ctx.Process(
+            target=_read_shared_window, args=(ring.name, bytes(second.encode()), result)
+        )
+        proc.start()
+        assert result.get(timeout=10) == [0.5] * 4
+        proc.join()
+
+        # the windows are copied out, overwriting the slot doesn't change what was read
+        window = ring.read(first.seq)
+        out = np.empty(4, dtype=np.float32)
+        assert ring.read(first.seq, out=out) is out
+        ring.write(np.zeros(4, dtype=np.float32))
+        assert not ring.is_valid(first.seq), "the writer lapped the first window"
+        assert window.tolist() == out.tolist() == [0.0, 1.0, 2.0, 3.0]
+        with pytest.raises(ValueError):
+            ring.read(first.seq)
+    finally:
+        ring.close()
+
+
+def test_predictive_idle_policy():
+    policy = ipc.idle_policy.PredictiveIdlePolicy(max_idle_processes=8, window=10.0)
+    assert policy.target_idle_processes(2, now=0.0) == 2, "bounded by num_idle_processes"
+
+    policy.on_process_ready(launch_time=3.0)
+    policy.on_process_ready(launch_time=1.0)
+    assert 2.0 < policy.launch_time < 3.0
+
+    # burst of 10 jobs in 2s: ~1 job/s * ~2.4s launch time * 2 headroom
+    for i in range(10):
+        policy.on_job_requested(now=10.0 + i * 0.2)
+    assert policy.target_idle_processes(2, now=12.0) == 5
+
+    for i in range(40):
+        policy.on_job_requested(now=12.0 + i * 0.05)
+    assert policy.target_idle_processes(2, now=14.0) == 8, "bounded by max_idle_processes"
+    assert policy.max_idle_processes(2) == 8
+
+    # the window forgets the burst
+    assert policy.target_idle_processes(2, now=30.0) == 2
+
+
+def test_log_transport():
+    class _Capture(logging.Handler):
+        def __init__(self) -> None:
+            super().__init__()
+            self.records: list[logging.LogRecord] = []
+
+        def emit(self, record: logging.LogRecord) -> None:
+            self.records.append(record)
+
+    capture = _Capture()
+    lger = logging.getLogger("lk_test_log_transport")
+    lger.addHandler(capture)
+    lger.setLevel(logging.DEBUG)
+
+    def _record(msg: str, level: int = logging.INFO, **extra) -> logging.LogRecord:
+        return lger.makeRecord(lger.name, level, __file__, 0, msg, (), None, extra=extra)
+
+    pch, cch = socket.socketpair()
+    listener = ipc.log_queue.LogQueueListener(
+        utils.aio.duplex_unix._Duplex.open(pch), lambda r: setattr(r, "pid_tag", "job")
+    )
+    listener.start()
+
+    # nothing is sent before close(), the oldest records are dropped above max_queued_records
+    handler = ipc.log_queue.LogQueueHandler(
+        utils.aio.duplex_unix._Duplex.open(cch),
+        ipc.log_queue.LogTransportOptions(flush_interval=60, max_queued_records=3),
+    )
+    handler.handle(_record("hello", room="room_1", websocket=object()))
+    handler.handle(_record("debug", logging.DEBUG))
+    for i in range(4):
+        handler.handle(_record(f"record {i}", logging.WARNING))
+
+    assert handler.dropped_records == 3
+    handler.close()
+    listener.stop()
+    lger.removeHandler(capture)
+
+    assert [r.getMessage() for r in capture.records] == ["record 1", "record 2", "record 3"]
+    assert listener.dropped_records == 3
+    record = capture.records[0]
+    assert record.levelno == logging.WARNING and record.levelname == "WARNING"
+    assert record.pid_tag == "job" and record.process == os.getpid()
+
+    # extras are kept, the batch is sent once full
+    pch, cch = socket.socketpair()
+    listener = ipc.log_queue.LogQueueListener(
+        utils.aio.duplex_unix._Duplex.open(pch), lambda r: None
+    )
+    listener.start()
+    handler = ipc.log_queue.LogQueueHandler(
+        utils.aio.duplex_unix._Duplex.open(cch),
+        ipc.log_queue.LogTransportOptions(flush_interval=60, max_batch_size=2),
+    )
+    lger.addHandler(capture)
+    capture.records.clear()
+    handler.handle(_record("hello", room="room_1", websocket=object()))
+    job_record = _record("world")
+    job_record.__dict__.update(
+        thread=1, threadName="job_thread", processName="job_proc", relativeCreated=42.0
+    )
+    handler.handle(job_record)
+    deadline = time.monotonic() + 5
+    while len(capture.records) < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert [r.getMessage() for r in capture.records] == ["hello", "world"]
+    assert capture.records[0].room == "room_1"
+    assert capture.records[0].websocket.startswith("<object")
+    # the attributes of the job's record are forwarded, not the ones of the listener
+    record = capture.records[1]
+    assert (record.thread, record.threadName, record.processName) == (1, "job_thread", "job_proc")
+    assert record.relativeCreated == 42.0 and record.pathname == __file__
+    assert record.filename == os.path.basename(__file__) and record.module == "test_ipc"
+    assert capture.records[0].threadName == threading.current_thread().name
+    handler.close()
+    listener.stop()
+    lger.removeHandler(capture)
+
+
 def _generate_fake_job() -> job.RunningJobInfo:
     return job.RunningJobInfo(
         job=agent.Job(id="fake_job_" + str(uuid.uuid4().hex), type=agent.JobType.JT_ROOM),
@@ -392,3 +564,131 @@ async def test_job_graceful_shutdown():
     assert proc.exitcode == 0, "process should have exited cleanly"
     assert not proc.killed
     assert start_args.shutdown_counter.value == 1
+
+
+def _initialize_fork_proc(proc: JobProcess) -> None:
+    # user_arguments aren't forwarded to the fork server, the test dir is passed by env
+    out_dir = os.environ["LK_TEST_FORK_DIR"]
+    with open(os.path.join(out_dir, "prewarm"), "a") as f:
+        f.write(f"{os.getpid()}\n")
+
+    proc.userdata["prewarm_pid"] = os.getpid()
+
+
+async def _fork_job_entrypoint(job_ctx: JobContext) -> None:
+    out_dir = os.environ["LK_TEST_FORK_DIR"]
+    with open(os.path.join(out_dir, f"job_{os.getpid()}"), "w") as f:
+        f.write(f"{job_ctx.proc.userdata['prewarm_pid']} {os.getppid()}")
+
+    job_ctx.shutdown("test done")
+
+
+async def test_fork_proc_pool(tmp_path, monkeypatch):
+    monkeypatch.setenv("LK_TEST_FORK_DIR", str(tmp_path))
+    num_idle_processes = 2
+    pool = ipc.proc_pool.ProcPool(
+        initialize_process_fnc=_initialize_fork_proc,
+        job_entrypoint_fnc=_fork_job_entrypoint,
+        session_end_fnc=None,
+        num_idle_processes=num_idle_processes,
+        job_executor_type=job.JobExecutorType.FORK,
+        initialize_timeout=20.0,
+        close_timeout=20.0,
+        inference_executor=None,
+        memory_warn_mb=0,
+        memory_limit_mb=0,
+        http_proxy=None,
+        mp_ctx=mp.get_context("spawn"),
+        loop=asyncio.get_running_loop(),
+    )
+
+    ready_q = asyncio.Queue()
+    closed: list[ipc.job_fork_executor.ForkJobExecutor] = []
+    pool.on("process_ready", lambda proc: ready_q.put_nowait(proc))
+    pool.on("process_closed", lambda proc: closed.append(proc))
+
+    await pool.start()
+    await _wait_for_elements(ready_q, num_idle_processes)
+
+    jobs_to_start = 2
+    for _ in range(jobs_to_start):
+        await pool.launch_job(_generate_fake_job())
+
+    await _wait_for_elements(ready_q, jobs_to_start)
+    for _ in range(100):
+        if len(list(tmp_path.glob("job_*"))) == jobs_to_start:
+            break
+        await asyncio.sleep(0.1)
+
+    await pool.aclose()
+
+    # the prewarm function only ran once, in the template every job process was forked from
+    prewarm_pids = (tmp_path / "prewarm").read_text().split()
+    assert len(prewarm_pids) == 1
+
+    job_files = list(tmp_path.glob("job_*"))
+    assert len(job_files) == jobs_to_start
+    for job_file in job_files:
+        assert job_file.read_text().split() == [prewarm_pids[0], prewarm_pids[0]]
+
+    assert len(closed) == num_idle_processes + jobs_to_start
+    for proc in closed:
+        assert proc.exitcode == 0, f"process did not exit cleanly: {proc.exitcode}"
+        assert not psutil.pid_exists(proc.pid)
+
+
+class _BatchEchoRunner(inference_runner._InferenceRunner):
+    INFERENCE_METHOD = "test_batch_echo"
+    MAX_BATCH_SIZE = 8
+    MAX_BATCH_WAIT = 0.1
+
+    def initialize(self) -> None:
+        pass
+
+    def run(self, data: bytes) -> bytes | None:
+        return data
+
+    def run_batch(self, data: list[bytes]) -> list[bytes | None | Exception]:
+        return [
+            ValueError("bad request") if d == b"bad" else f"{len(data)}:".encode() + d for d in data
+        ]
+
+
+async def test_inference_batching():
+    loop = asyncio.get_running_loop()
+    executor = ipc.inference_proc_executor.InferenceProcExecutor(
+        runners={_BatchEchoRunner.INFERENCE_METHOD: _BatchEchoRunner},
+        initialize_timeout=20.0,
+        close_timeout=10.0,
+        memory_warn_mb=0,
+        memory_limit_mb=0,
+        ping_interval=2.5,
+        ping_timeout=10.0,
+        high_ping_threshold=1.0,
+        mp_ctx=mp.get_context("spawn"),
+        loop=loop,
+        http_proxy=None,
+    )
+    await executor.start()
+    await executor.initialize()
+
+    inputs = [f"req_{i}".encode() for i in range(12)]
+    results = await asyncio.gather(
+        *(executor.do_inference(_BatchEchoRunner.INFERENCE_METHOD, d) for d in [b"bad", *inputs]),
+        return_exceptions=True,
+    )
+    await executor.aclose()
+
+    # a failed request doesn't fail the rest of its batch
+    assert isinstance(results[0], RuntimeError)
+    results = results[1:]
+
+    batch_sizes = []
+    for data, result in zip(inputs, results):
+        assert isinstance(result, bytes)
+        batch_size, echoed = result.split(b":", 1)
+        assert echoed == data, "responses must be routed back to the right request"
+        batch_sizes.append(int(batch_size))
+
+    assert max(batch_sizes) > 1, "concurrent requests should have been batched"
+    assert max(batch_sizes) <= _BatchEchoRunner.MAX_BATCH_SIZE
@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from livekit.agents.ipc.job_executor import _PingDelay
+from livekit.agents.utils.hw import CPUMonitor, LoadSampler, LoadSamplerOptions, MemoryMonitor
+from livekit.agents.utils.hw.memory import CGroupV1MemoryMonitor, CGroupV2MemoryMonitor
+
+
+class _FakeCPU(CPUMonitor):
+    def __init__(self, count: float) -> None:
+        self.count = count
+        self.time = 0.0
+
+    def cpu_count(self) -> float:
+        return self.count
+
+    def cpu_percent(self, interval: float = 0.5) -> float:
+        raise AssertionError("the sampler must not block")
+
+    def cpu_time(self) -> float:
+        return self.time
+
+
+class _FakeMemory(MemoryMonitor):
+    def __init__(self) -> None:
+        self.used = 0
+
+    def memory_used(self) -> int:
+        return self.used
+
+    def memory_limit(self) -> int:
+        return 1000
+
+
+def test_cpu_usage_over_window():
+    cpu = _FakeCPU(count=4)
+    sampler = LoadSampler(
+        LoadSamplerOptions(sample_interval=0.5, window=2.0),
+        cpu_monitor=cpu,
+        memory_monitor=_FakeMemory(),
+    )
+
+    # 2 of the 4 CPUs busy
+    for i in range(5):
+        cpu.time = i * 0.5 * 2
+        sampler.sample(now=i * 0.5)
+    assert sampler.cpu == pytest.approx(0.5)
+    assert sampler.load == pytest.approx(0.5)
+
+    # the window forgets the busy period
+    for i in range(5, 9):
+        sampler.sample(now=i * 0.5)
+    assert sampler.cpu == pytest.approx(0.0)
+
+    # the usage is clamped when the cgroup bursts above its quota
+    for i in range(9, 13):
+        cpu.time += 0.5 * 8
+        sampler.sample(now=i * 0.5)
+    assert sampler.cpu == 1.0
+
+
+def test_load_score():
+    cpu = _FakeCPU(count=1)
+    memory = _FakeMemory()
+    lag = 0.0
+    sampler = LoadSampler(
+        LoadSamplerOptions(sample_interval=1.0, window=1.0, memory_weight=0.5, loop_lag_limit=2.0),
+        loop_lag_fnc=lambda: lag,
+        cpu_monitor=cpu,
+        memory_monitor=memory,
+    )
+
+    cpu.time = 0.2
+    sampler.sample(now=0.0)
+    sampler.sample(now=1.0)
+    assert sampler.load == pytest.approx(0.0)
+
+    cpu.time = 0.45
+    sampler.sample(now=2.0)
+    assert sampler.cpu == pytest.approx(0.25)
+    assert sampler.load == pytest.approx(0.25)
+
+    memory.used = 800
+    sampler.sample(now=3.0)
+    assert sampler.memory == pytest.approx(0.8)
+    assert sampler.load == pytest.approx(0.4)
+
+    lag = 1.5
+    sampler.sample(now=4.0)
+    assert sampler.loop_lag == pytest.approx(1.5)
+    assert sampler.load == pytest.approx(0.75)
+
+    lag = 10.0
+    sampler.sample(now=5.0)
+    assert sampler.load == 1.0
+
+
+def test_cpu_time_default():
+    # monitors written before cpu_time existed still work, with the busy time of the host
+    class _LegacyCPU(CPUMonitor):
+        def cpu_count(self) -> float:
+            return 1.0
+
+        def cpu_percent(self, interval: float = 0.5) -> float:
+            return 0.0
+
+    assert _LegacyCPU().cpu_time() > 0.0
+
+
+def test_default_load_is_cpu_only():
+    cpu = _FakeCPU(count=1)
+    memory = _FakeMemory()
+    sampler = LoadSampler(loop_lag_fnc=lambda: 10.0, cpu_monitor=cpu, memory_monitor=memory)
+
+    memory.used = 900
+    cpu.time = 0.0
+    sampler.sample(now=0.0)
+    cpu.time = 0.5
+    sampler.sample(now=1.0)
+    assert sampler.memory == pytest.approx(0.9)
+    assert sampler.loop_lag == pytest.approx(10.0)
+    assert sampler.load == pytest.approx(0.5)
+
+
+async def test_sampler_task():
+    cpu = _FakeCPU(count=1)
+    sampler = LoadSampler(
+        LoadSamplerOptions(sample_interval=0.01, window=0.05),
+        cpu_monitor=cpu,
+        memory_monitor=_FakeMemory(),
+    )
+    sampler.start()
+    try:
+        for _ in range(10):
+            cpu.time += 0.01
+            await asyncio.sleep(0.01)
+        assert sampler.cpu > 0.0
+    finally:
+        await sampler.aclose()
+
+
+def test_cgroup_memory(tmp_path):
+    v2 = tmp_path / "v2"
+    v2.mkdir()
+    (v2 / "memory.current").write_text("3000\n")
+    (v2 / "memory.max").write_text("4000\n")
+    (v2 / "memory.stat").write_text("anon 2000\nfile 1000\ninactive_file 1000\n")
+    monitor = CGroupV2MemoryMonitor(root=str(v2))
+    assert monitor.memory_used() == 2000
+    assert monitor.memory_limit() == 4000
+    assert monitor.memory_percent() == pytest.approx(0.5)
+
+    # not limited, bounded by the memory of the host
+    (v2 / "memory.max").write_text("max\n")
+    assert monitor.memory_limit() > 4000
+
+    v1 = tmp_path / "v1"
+    v1.mkdir()
+    (v1 / "memory.usage_in_bytes").write_text("3000\n")
+    (v1 / "memory.limit_in_bytes").write_text("6000\n")
+    (v1 / "memory.stat").write_text("inactive_file 10\ntotal_inactive_file 1500\n")
+    monitor = CGroupV1MemoryMonitor(root=str(v1))
+    assert monitor.memory_used() == 1500
+    assert monitor.memory_percent() == pytest.approx(0.25)
+
+
+def test_ping_delay():
+    ping = _PingDelay()
+    assert ping.delay(now=0) == 0.0
+
+    ping.on_ping(1000)
+    assert ping.delay(now=1010) == pytest.approx(0.01)
+    assert ping.on_pong(1000, now=1020) == 20
+    assert ping.delay(now=5000) == pytest.approx(0.02)
+
+    # an unanswered ping counts as a growing delay
+    ping.on_ping(6000)
+    ping.on_ping(8500)
+    assert ping.delay(now=9000) == pytest.approx(3.0)
+    ping.on_pong(6000, now=9100)
+    assert ping.delay(now=9100) == pytest.approx(3.1)
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import threading
+from pathlib import Path
+
+import av
+import numpy as np
+import pytest
+
+from livekit import rtc
+from livekit.agents.voice.recorder_io import RecorderEncoderPool
+
+SAMPLE_RATE = 24000
+
+
+def _frames(duration: float, *, num_channels: int = 1) -> list[rtc.AudioFrame]:
+    samples_per_frame = SAMPLE_RATE // 100
+    t = np.arange(int(duration * SAMPLE_RATE)) / SAMPLE_RATE
+    pcm = (np.sin(2 * np.pi * 440 * t) * 10000).astype(np.int16)
+    pcm = np.repeat(pcm, num_channels)
+    frames = []
+    for i in range(0, len(t), samples_per_frame):
+        data = pcm[i * num_channels : (i + samples_per_frame) * num_channels]
+        frames.append(
+            rtc.AudioFrame(
+                data=data.tobytes(),
+                sample_rate=SAMPLE_RATE,
+                num_channels=num_channels,
+                samples_per_channel=len(data) // num_channels,
+            )
+        )
+    return frames
+
+
+def _duration(path: Path) -> float:
+    with av.open(str(path)) as container:
+        n_samples = 0
+        sample_rate = 0
+        for frame in container.decode(audio=0):
+            n_samples += frame.samples
+            sample_rate = frame.sample_rate
+            assert frame.layout.name == "stereo"
+    return n_samples / sample_rate
+
+
+def test_shared_pool_encodes_recordings(tmp_path):
+    pool = RecorderEncoderPool(max_workers=2)
+    closed = threading.Semaphore(0)
+    n_recordings = 6
+
+    encoders = [
+        pool.open(
+            output_path=tmp_path / f"rec_{i}" / "audio.ogg",
+            sample_rate=48000,
+            on_closed=closed.release,
+        )
+        for i in range(n_recordings)
+    ]
+    for _ in range(3):
+        for i, encoder in enumerate(encoders):
+            assert encoder.push(_frames(1.0), _frames(1.0, num_channels=i % 2 + 1))
+
+    for encoder in encoders:
+        encoder.close()
+
+    for _ in range(n_recordings):
+        assert closed.acquire(timeout=30)
+
+    assert pool.queue_depth == 0
+    for i in range(n_recordings):
+        assert _duration(tmp_path / f"rec_{i}" / "audio.ogg") == pytest.approx(3.0, abs=0.05)
+
+    pool.shutdown()
+
+
+def test_segmented_recording(tmp_path):
+    pool = RecorderEncoderPool(max_workers=1)
+    closed = threading.Event()
+    segments: list[Path] = []
+
+    encoder = pool.open(
+        output_path=tmp_path / "audio.ogg",
+        sample_rate=48000,
+        segment_duration=1.5,
+        on_segment=segments.append,
+        on_closed=closed.set,
+    )
+    assert encoder.segmented
+    for _ in range(5):
+        encoder.push(_frames(1.0), [])
+    encoder.close()
+    assert closed.wait(timeout=30)
+
+    assert [p.name for p in segments] == ["audio_00000.ogg", "audio_00001.ogg", "audio_00002.ogg"]
+    durations = [_duration(p) for p in segments]
+    assert durations == pytest.approx([2.0, 2.0, 1.0], abs=0.05)
+    assert not (tmp_path / "audio.ogg").exists()
+
+    pool.shutdown()
+
+
+def test_queue_depth_limit(tmp_path):
+    pool = RecorderEncoderPool(max_workers=1, max_queue_depth=2)
+    closed = threading.Event()
+
+    # keep the only encoder thread busy
+    release = threading.Event()
+    pool._executor.submit(release.wait)
+
+    encoder = pool.open(output_path=tmp_path / "audio.ogg", sample_rate=48000, on_closed=closed.set)
+    assert encoder.push(_frames(1.0), [])
+    assert encoder.push(_frames(1.0), [])
+    assert not encoder.push(_frames(1.0), [])
+    assert pool.queue_depth == 2
+    assert pool.dropped_chunks == 1
+
+    release.set()
+    encoder.close()
+    assert closed.wait(timeout=30)
+    assert pool.queue_depth == 0
+    assert _duration(tmp_path / "audio.ogg") == pytest.approx(2.0, abs=0.05)
+
+    pool.shutdown()
@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import asyncio
+
+import numpy as np
+
+from livekit import rtc
+from livekit.agents.stt import (
+    STT,
+    IncrementalRecognition,
+    SpeechData,
+    SpeechEvent,
+    SpeechEventType,
+    StreamAdapter,
+    STTCapabilities,
+)
+from livekit.agents.types import APIConnectOptions
+from livekit.agents.utils import AudioBuffer, merge_frames
+from livekit.agents.vad import VAD, VADCapabilities, VADEvent, VADEventType, VADStream
+
+SAMPLE_RATE = 16000
+WORDS = {1: "one", 2: "two", 3: "three"}
+
+
+def _frame(value: int, duration: float = 0.1) -> rtc.AudioFrame:
+    samples = int(SAMPLE_RATE * duration)
+    return rtc.AudioFrame(
+        data=np.full(samples, value, dtype=np.int16).tobytes(),
+        sample_rate=SAMPLE_RATE,
+        num_channels=1,
+        samples_per_channel=samples,
+    )
+
+
+class _WordsSTT(STT):
+    # "recognizes" the words encoded as the sample values of the audio
+    def __init__(self) -> None:
+        super().__init__(capabilities=STTCapabilities(streaming=False, interim_results=False))
+        self.requests: list[str] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def _recognize_impl(
+        self, buffer: AudioBuffer, *, language: object, conn_options: APIConnectOptions
+    ) -> SpeechEvent:
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.05)
+        finally:
+            self.in_flight -= 1
+
+        words: list[str] = []
+        for value in np.frombuffer(merge_frames(buffer).data, dtype=np.int16):
+            if value and (not words or words[-1] != WORDS[value]):
+                words.append(WORDS[value])
+
+        text = " ".join(words)
+        self.requests.append(text)
+        return SpeechEvent(
+            type=SpeechEventType.FINAL_TRANSCRIPT,
+            alternatives=[SpeechData(language="en", text=text)],
+        )
+
+
+class _ScriptedVAD(VAD):
+    def __init__(self, events: list[VADEvent]) -> None:
+        super().__init__(capabilities=VADCapabilities(update_interval=0.1))
+        self._events = events
+
+    def stream(self) -> VADStream:
+        return _ScriptedVADStream(self)
+
+
+class _ScriptedVADStream(VADStream):
+    async def _main_task(self) -> None:
+        assert isinstance(self._vad, _ScriptedVAD)
+        async for _ in self._input_ch:
+            break
+
+        for event in self._vad._events:
+            await asyncio.sleep(0.01)
+            self._event_ch.send_nowait(event)
+
+        async for _ in self._input_ch:
+            pass
+
+
+def _speech(segments: list[tuple[int, float]], min_silence: float = 0.5) -> list[VADEvent]:
+    """VAD events of an utterance made of (word, duration) segments, 0 being a pause"""
+    events: list[VADEvent] = []
+    speech: list[rtc.AudioFrame] = []
+    silence = 0.0
+    for value, duration in segments:
+        for _ in range(round(duration * 10)):
+            frame = _frame(value)
+            speech.append(frame)
+            silence = silence + 0.1 if value == 0 else 0.0
+            event_type = VADEventType.START_OF_SPEECH if not events else VADEventType.INFERENCE_DONE
+            events.append(
+                VADEvent(
+                    type=event_type,
+                    samples_index=0,
+                    timestamp=0.0,
+                    speech_duration=0.0,
+                    silence_duration=0.0,
+                    frames=[frame],
+                    speaking=True,
+                    raw_accumulated_silence=silence,
+                )
+            )
+
+    assert silence >= min_silence
+    events.append(
+        VADEvent(
+            type=VADEventType.END_OF_SPEECH,
+            samples_index=0,
+            timestamp=0.0,
+            speech_duration=0.0,
+            silence_duration=silence,
+            frames=[merge_frames(speech)],
+        )
+    )
+    return events
+
+
+async def _transcribe(adapter: StreamAdapter) -> list[SpeechEvent]:
+    stream = adapter.stream()
+    stream.push_frame(_frame(0))
+    stream.end_input()
+    events = [ev async for ev in stream]
+    await stream.aclose()
+    return events
+
+
+async def test_stream_adapter_incremental() -> None:
+    stt = _WordsSTT()
+    vad = _ScriptedVAD(_speech([(1, 2.5), (0, 0.3), (2, 0.5), (0, 0.3), (3, 2.0), (0, 0.6)]))
+    adapter = StreamAdapter(stt=stt, vad=vad, incremental_recognition=IncrementalRecognition())
+    assert adapter.capabilities.interim_results
+
+    events = await _transcribe(adapter)
+    transcripts = [(ev.type, ev.alternatives[0].text) for ev in events if ev.alternatives]
+    # "two" is too short to be cut at its pause, it is recognized with "three"
+    assert transcripts == [
+        (SpeechEventType.INTERIM_TRANSCRIPT, "one"),
+        (SpeechEventType.INTERIM_TRANSCRIPT, "one two three"),
+        (SpeechEventType.FINAL_TRANSCRIPT, "one two three"),
+    ]
+    # the last chunk is cut at the start of the final silence, no request for the rest of it
+    assert stt.requests == ["one", "two three"]
+
+
+async def test_stream_adapter_incremental_max_requests() -> None:
+    stt = _WordsSTT()
+    segments = [(1, 2.0), (0, 0.2), (2, 2.0), (0, 0.2), (3, 2.0), (0, 0.2), (1, 2.0), (0, 0.6)]
+    vad = _ScriptedVAD(_speech(segments))
+    adapter = StreamAdapter(
+        stt=stt, vad=vad, incremental_recognition=IncrementalRecognition(max_concurrent_requests=1)
+    )
+
+    events = await _transcribe(adapter)
+    assert [ev.alternatives[0].text for ev in events if ev.alternatives] == [
+        "one",
+        "one two",
+        "one two three",
+        "one two three one",
+        "one two three one",
+    ]
+    assert events[-1].type == SpeechEventType.FINAL_TRANSCRIPT
+    assert stt.max_in_flight == 1
+    assert len(stt.requests) == 4
+
+
+async def test_stream_adapter_whole_speech() -> None:
+    stt = _WordsSTT()
+    vad = _ScriptedVAD(_speech([(1, 2.5), (0, 0.3), (2, 1.0), (0, 0.6)]))
+    adapter = StreamAdapter(stt=stt, vad=vad)
+    assert not adapter.capabilities.interim_results
+
+    events = await _transcribe(adapter)
+    assert [ev.alternatives[0].text for ev in events if ev.alternatives] == ["one two"]
+    assert stt.requests == ["one two"]
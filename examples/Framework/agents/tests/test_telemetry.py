@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+from livekit.agents.telemetry import SampledBatchSpanProcessor, trace_types
+
+
+def _session(
+    provider: TracerProvider, name: str, turn_latencies: list[float], *, tools: int = 1
+) -> int:
+    tracer = provider.get_tracer("test")
+    with tracer.start_as_current_span(name) as session_span:
+        for latency in turn_latencies:
+            with tracer.start_as_current_span("user_turn"):
+                pass
+            with tracer.start_as_current_span("agent_turn") as turn_span:
+                for _ in range(tools):
+                    with tracer.start_as_current_span("function_tool"):
+                        pass
+                turn_span.set_attribute(trace_types.ATTR_E2E_LATENCY, latency)
+
+    return session_span.get_span_context().trace_id
+
+
+def test_sampled_span_processor() -> None:
+    exporter = InMemorySpanExporter()
+    processor = SampledBatchSpanProcessor(
+        exporter, sample_rate=0.0, latency_threshold=2.0, max_export_batch_size=4
+    )
+    provider = TracerProvider()
+    provider.add_span_processor(processor)
+
+    fast_id = _session(provider, "fast", [0.8, 1.2])
+    slow_id = _session(provider, "slow", [0.8, 2.5, 0.9])
+    assert processor.force_flush()
+
+    exported = exporter.get_finished_spans()
+    assert {span.context.trace_id for span in exported} == {slow_id}
+    # the spans ended before the slow turn are kept too
+    assert len(exported) == 1 + 3 * 3
+    assert fast_id != slow_id
+
+    stats = processor.stats
+    assert stats.spans_ended == 1 + 2 * 3 + 1 + 3 * 3
+    assert stats.spans_exported == 1 + 3 * 3
+    assert stats.spans_sampled_out == 1 + 2 * 3
+    assert stats.spans_dropped == 0
+    assert stats.traces_kept == 1
+    assert stats.export_batches >= 3
+    assert stats.record_time > 0
+
+    provider.shutdown()
+
+
+def test_sampled_span_processor_head_sampling() -> None:
+    exporter = InMemorySpanExporter()
+    processor = SampledBatchSpanProcessor(exporter, sample_rate=1.0, latency_threshold=None)
+    provider = TracerProvider()
+    provider.add_span_processor(processor)
+
+    for i in range(5):
+        _session(provider, f"session_{i}", [0.5])
+
+    provider.shutdown()
+    assert len(exporter.get_finished_spans()) == 5 * 4
+    assert processor.stats.spans_exported == 5 * 4
+
+
+def test_sampled_span_processor_bounded() -> None:
+    exporter = InMemorySpanExporter()
+    processor = SampledBatchSpanProcessor(
+        exporter,
+        sample_rate=1.0,
+        max_queue_size=8,
+        max_export_batch_size=8,
+        schedule_delay=60,
+    )
+    # the queue is full until the next export, the spans ended meanwhile are dropped
+    processor._wakeup.set = lambda: None  # type: ignore[method-assign]
+    provider = TracerProvider()
+    provider.add_span_processor(processor)
+
+    _session(provider, "session", [0.5] * 3)
+    assert processor.stats.spans_dropped == 1 + 3 * 3 - 8
+
+    del processor._wakeup.set
+    provider.shutdown()
+    assert len(exporter.get_finished_spans()) == 8
+
+
+def test_sampled_span_processor_pending_bounded() -> None:
+    exporter = InMemorySpanExporter()
+    processor = SampledBatchSpanProcessor(exporter, sample_rate=0.0, max_pending_spans=4)
+    provider = TracerProvider()
+    provider.add_span_processor(processor)
+
+    _session(provider, "session", [0.5, 0.5, 3.0], tools=2)
+    provider.shutdown()
+
+    # the oldest pending spans are dropped, the slow turn and the root span are exported
+    assert len(exporter.get_finished_spans()) == 4 + 1 + 1
+    assert processor.stats.spans_dropped == 3 * 4 - 1 - 4
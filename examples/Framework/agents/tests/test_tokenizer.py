@@ -1,7 +1,9 @@
+import functools
+
 import pytest
 
 from livekit.agents import tokenize
-from livekit.agents.tokenize import basic, blingfire
+from livekit.agents.tokenize import _basic_sent, basic, blingfire
 from livekit.agents.tokenize._basic_paragraph import split_paragraphs
 from livekit.plugins import nltk
 
@@ -118,6 +120,31 @@ async def test_streamed_sent_tokenizer(tokenizer: tokenize.SentenceTokenizer, ex
         assert ev.token == expected[i]
 
 
+@pytest.mark.parametrize("retain_format", [False, True])
+async def test_streamed_basic_sent_boundary_hint(retain_format: bool):
+    # the basic stream only tokenizes again once a boundary candidate was pushed, it must
+    # still split exactly like a stream tokenizing on every push
+    text = TEXT + " Dr. Who met U.S.A. However, it was 2.54 m.\n\nOk! “Yes.” Fine?  Hello. "
+
+    async def _collect(stream: tokenize.SentenceStream) -> list[str]:
+        for c in text:
+            stream.push_text(c)
+        stream.end_input()
+        return [ev.token async for ev in stream]
+
+    expected = await _collect(
+        tokenize.BufferedSentenceStream(
+            tokenizer=functools.partial(
+                _basic_sent.split_sentences, min_sentence_len=20, retain_format=retain_format
+            ),
+            min_token_len=20,
+            min_ctx_len=10,
+        )
+    )
+    tokenizer = basic.SentenceTokenizer(min_sentence_len=20, retain_format=retain_format)
+    assert await _collect(tokenizer.stream()) == expected
+
+
 WORDS_TEXT = "This is a test. Blabla another test! multiple consecutive spaces:     done"
 WORDS_EXPECTED = [
     "This",
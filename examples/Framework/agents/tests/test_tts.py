@@ -1003,3 +1003,77 @@ async def test_tts_audio_emitter_wav(monkeypatch):
     silence = msgs3[1].frame.data.tobytes()
     assert msgs3[1].is_final is True
     assert silence == b"\x00\x00" * 10
+
+
+async def test_tts_audio_emitter_slow_generation(monkeypatch):
+    from livekit.agents.types import USERDATA_TIMED_TRANSCRIPT
+    from livekit.agents.voice.io import TimedString
+
+    monkeypatch.setattr(tts.tts, "lk_dump_tts", False)
+
+    pcm_chunk = b"\xff\xff" * 100
+    rx = aio.Chan[tts.SynthesizedAudio]()
+    emitter = tts.AudioEmitter(label="slow", dst_ch=rx)
+    emitter.initialize(
+        request_id="req-slow",
+        sample_rate=1000,
+        num_channels=1,
+        mime_type="audio/pcm",
+        frame_size_ms=100,
+        stream=True,
+    )
+
+    emitter.start_segment(segment_id="s1")
+    emitter.push_timed_transcript(TimedString("hello", start_time=0.0, end_time=0.1))
+    emitter.push(pcm_chunk)
+    emitter.push(pcm_chunk)  # the first frame is sent, the second is held
+
+    first = await asyncio.wait_for(rx.recv(), timeout=1.0)
+    assert first.is_final is False
+    assert first.frame.userdata[USERDATA_TIMED_TRANSCRIPT] == ["hello"]
+
+    # no more audio before the first frame is played out, the held frame is flushed
+    second = await asyncio.wait_for(rx.recv(), timeout=1.0)
+    assert second.is_final is False
+    assert second.frame.data.tobytes() == pcm_chunk
+    assert USERDATA_TIMED_TRANSCRIPT not in second.frame.userdata
+
+    emitter.end_segment()
+    emitter.end_input()
+    await emitter.join()
+    rx.close()
+
+    msgs = [msg async for msg in rx]
+    assert len(msgs) == 1 and msgs[0].is_final is True
+    assert emitter.pushed_duration(0) == pytest.approx(0.2)
+
+
+async def test_tts_audio_emitter_segment_leftover(monkeypatch):
+    monkeypatch.setattr(tts.tts, "lk_dump_tts", False)
+
+    pcm_chunk = b"\x01\x00" * 100
+    rx = aio.Chan[tts.SynthesizedAudio]()
+    emitter = tts.AudioEmitter(label="leftover", dst_ch=rx)
+    emitter.initialize(
+        request_id="req-leftover",
+        sample_rate=1000,
+        num_channels=1,
+        mime_type="audio/pcm",
+        frame_size_ms=100,
+        stream=True,
+    )
+
+    # the incomplete sample left by the first segment isn't part of the second one
+    emitter.start_segment(segment_id="s1")
+    emitter.push(b"\xff")
+    emitter.end_segment()
+    emitter.start_segment(segment_id="s2")
+    emitter.push(pcm_chunk)
+    emitter.end_segment()
+    emitter.end_input()
+    await emitter.join()
+    rx.close()
+
+    msgs = [msg async for msg in rx if msg.segment_id == "s2"]
+    assert msgs[0].frame.data.tobytes() == pcm_chunk
+    assert msgs[-1].is_final is True
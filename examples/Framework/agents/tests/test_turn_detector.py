@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+from typing import Any
+
+import numpy as np
+import pytest
+
+from livekit.plugins.turn_detector.base import _codec
+from livekit.plugins.turn_detector.english import _EUORunnerEn
+
+
+class _FakeTokenizer:
+    pad_token_id = 0
+
+    def apply_chat_template(self, chat_ctx: list[dict[str, Any]], **kwargs: Any) -> str:
+        return " ".join(msg["content"] for msg in chat_ctx) + "<|im_end|>"
+
+    def __call__(self, text: str, **kwargs: Any) -> dict[str, np.ndarray]:
+        # one token per word, the id being the length of the word
+        return {"input_ids": np.array([[len(word) for word in text.split()]], dtype=np.int64)}
+
+
+class _FakeSession:
+    """returns the id of each token divided by 10 as its probability"""
+
+    def __init__(self, *, per_token: bool = True, max_batch_size: int = 16) -> None:
+        self.per_token = per_token
+        self.max_batch_size = max_batch_size
+        self.batch_sizes: list[int] = []
+
+    def run(self, output_names: Any, inputs: dict[str, np.ndarray]) -> list[np.ndarray]:
+        input_ids = inputs["input_ids"]
+        if len(input_ids) > self.max_batch_size:
+            raise RuntimeError("invalid batch dimension")
+
+        self.batch_sizes.append(len(input_ids))
+        probs = input_ids.astype(np.float32) / 10
+        return [probs if self.per_token else probs[:, -1:]]
+
+
+def _runner(session: _FakeSession) -> _EUORunnerEn:
+    runner = _EUORunnerEn()
+    runner._session = session
+    runner._tokenizer = _FakeTokenizer()
+    return runner
+
+
+def _request(*contents: str) -> bytes:
+    return bytes(_codec.encode_request([{"role": "user", "content": c} for c in contents]))
+
+
+REQUESTS = [_request("a bb"), _request(), _request("a bb ccc dddd", "e"), _request("eee")]
+EXPECTED = [0.2, 0.1, 0.3]
+
+
+def _probabilities(results: list[bytes | None | Exception]) -> list[float]:
+    assert isinstance(results[1], ValueError)
+    probs = []
+    for result in results[:1] + results[2:]:
+        assert isinstance(result, bytes)
+        eou_result = _codec.decode_response(result)
+        assert eou_result.batch_size == 3
+        probs.append(eou_result.eou_probability)
+    return probs
+
+
+def test_run_batch() -> None:
+    session = _FakeSession()
+    results = _runner(session).run_batch(REQUESTS)
+    assert _probabilities(results) == pytest.approx(EXPECTED)
+    assert session.batch_sizes == [3]
+
+
+@pytest.mark.parametrize(
+    "session",
+    [_FakeSession(per_token=False), _FakeSession(max_batch_size=1)],
+    ids=["last_token_output", "no_batch_dimension"],
+)
+def test_run_batch_per_sample_fallback(session: _FakeSession) -> None:
+    runner = _runner(session)
+    results = runner.run_batch(REQUESTS)
+    assert _probabilities(results) == pytest.approx(EXPECTED)
+
+    # the batched run isn't tried again
+    session.batch_sizes.clear()
+    runner.run_batch(REQUESTS)
+    assert session.batch_sizes == [1, 1, 1]
+
+
+def test_run_empty_chat_ctx() -> None:
+    with pytest.raises(ValueError):
+        _runner(_FakeSession()).run(_request())
@@ -83,3 +83,125 @@ async def test_file_vad(sample_rate):
 
     assert start_of_speech_i > 0, "no start of speech detected"
     assert start_of_speech_i == end_of_speech_i, "start and end of speech mismatch"
+
+
+def test_batched_model_matches_single_stream() -> None:
+    import numpy as np
+
+    from livekit.plugins.silero import onnx_model
+
+    session = onnx_model.new_inference_session(force_cpu=True)
+    batched = onnx_model.BatchedOnnxModel(onnx_session=session, sample_rate=16000)
+    window = batched.window_size_samples
+
+    rng = np.random.default_rng(0)
+    audio = [rng.uniform(-0.5, 0.5, window * 6).astype(np.float32) for _ in range(3)]
+    singles = [onnx_model.OnnxModel(onnx_session=session, sample_rate=16000) for _ in audio]
+    slots = [batched.register() for _ in audio]
+
+    try:
+        for i in range(6):
+            futures = [
+                batched.submit(slot, a[i * window : (i + 1) * window])
+                for slot, a in zip(slots, audio)
+            ]
+            for fut, single, a in zip(futures, singles, audio):
+                expected = single(a[i * window : (i + 1) * window])
+                assert abs(fut.result(timeout=5) - expected) < 1e-5
+
+        # a reused slot starts over with an empty audio context
+        batched.unregister(slots[0])
+        slot = batched.register()
+        fresh = onnx_model.OnnxModel(onnx_session=session, sample_rate=16000)
+        for i in range(2):
+            expected = fresh(audio[0][i * window : (i + 1) * window])
+            result = batched.submit(slot, audio[0][i * window : (i + 1) * window]).result(5)
+            assert abs(result - expected) < 1e-5
+    finally:
+        batched.close()
+
+
+async def test_batched_vad_aclose() -> None:
+    vad = silero.VAD.load(batch_inference=True)
+    stream = vad.stream()
+    stream.end_input()
+    async for _ in stream:
+        pass
+    await stream.aclose()
+
+    assert vad._batched_model is not None
+    thread = vad._batched_model._thread
+    assert thread is not None and thread.is_alive()
+
+    await vad.aclose()
+    thread.join(timeout=5)
+    assert not thread.is_alive()
+
+
+async def test_inference_process_model() -> None:
+    import asyncio
+    import multiprocessing as mp
+
+    import numpy as np
+
+    from livekit.agents import ipc
+    from livekit.plugins.silero import onnx_model
+
+    executor = ipc.inference_proc_executor.InferenceProcExecutor(
+        runners={onnx_model.VAD_INFERENCE_METHOD: onnx_model._VADRunner},
+        initialize_timeout=20.0,
+        close_timeout=10.0,
+        memory_warn_mb=0,
+        memory_limit_mb=0,
+        ping_interval=2.5,
+        ping_timeout=10.0,
+        high_ping_threshold=1.0,
+        mp_ctx=mp.get_context("spawn"),
+        loop=asyncio.get_running_loop(),
+        http_proxy=None,
+    )
+    await executor.start()
+    await executor.initialize()
+
+    session = onnx_model.new_inference_session(force_cpu=True)
+    rng = np.random.default_rng(0)
+
+    async def _compare(sample_rate: int) -> None:
+        remote = onnx_model.RemoteOnnxModel(executor=executor, sample_rate=sample_rate)
+        local = onnx_model.OnnxModel(onnx_session=session, sample_rate=sample_rate)
+        window = remote.window_size_samples
+        audio = rng.uniform(-0.5, 0.5, window * 6).astype(np.float32)
+        try:
+            for i in range(6):
+                x = audio[i * window : (i + 1) * window]
+                assert abs(await remote(x) - local(x)) < 1e-5
+        finally:
+            await remote.aclose()
+
+    try:
+        # the windows of concurrent streams are batched by the inference process, grouped by
+        # sample rate
+        await asyncio.gather(_compare(16000), _compare(16000), _compare(8000))
+    finally:
+        await executor.aclose()
+
+
+def test_sample_buffer_compaction() -> None:
+    import numpy as np
+
+    from livekit.plugins.silero.vad import _SampleBuffer
+
+    buf = _SampleBuffer(8)
+    expected = np.arange(0, dtype=np.int16)
+    for i in range(20):
+        chunk = np.arange(i * 5, i * 5 + 5, dtype=np.int16)
+        buf.push(memoryview(chunk))
+        expected = np.concatenate([expected, chunk])
+
+        view = buf.view(3)
+        assert view.tolist() == expected[:3].tolist()
+        buf.consume(3)
+        expected = expected[3:]
+        assert buf.size == len(expected)
+
+    assert buf.view(1000).tolist() == expected.tolist()